@@ -0,0 +1,67 @@
+"""
+Micro-benchmark: single-pass emoji engine vs. the original per-character path.
+
+Usage:
+    python benchmarks/bench_emoji.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import emoji
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+from src.utils.emoji_engine import analyze_emojis, analyze_emoji_series
+
+
+def legacy_emoji_pass(text: str) -> dict:
+    """The original extract_emoji_info followed by the replace_emoji clean-up."""
+    emoji_chars = [c for c in text if c in emoji.EMOJI_DATA]
+    return {
+        'emojis': emoji_chars,
+        'count': len(emoji_chars),
+        'descriptions': [emoji.demojize(e) for e in emoji_chars],
+        'clean_text': emoji.replace_emoji(text, replace='').strip()
+    }
+
+
+def load_reviews() -> pd.Series:
+    files = sorted((project_root / 'data').glob('bank_reviews_*.csv'))
+    return pd.concat([pd.read_csv(f)['review'] for f in files], ignore_index=True).astype(str)
+
+
+def time_it(func, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    reviews = load_reviews()
+    texts = reviews.tolist()
+    print(f"Benchmarking on {len(texts)} reviews")
+
+    timings = {
+        'legacy per-character': time_it(lambda: [legacy_emoji_pass(t) for t in texts]),
+        'single pass': time_it(lambda: [analyze_emojis(t) for t in texts]),
+        'vectorized series': time_it(lambda: analyze_emoji_series(reviews)),
+    }
+    baseline = timings['legacy per-character']
+    for name, seconds in timings.items():
+        print(f"  {name:<22} {seconds * 1000:8.1f} ms  {len(texts) / seconds:10.0f} reviews/s  "
+              f"x{baseline / seconds:.1f}")
+
+    legacy_count = sum(legacy_emoji_pass(t)['count'] for t in texts)
+    engine_count = sum(analyze_emojis(t)['count'] for t in texts)
+    print(f"Emojis found: legacy={legacy_count}, engine={engine_count} "
+          "(the engine counts multi-codepoint sequences once)")
+
+
+if __name__ == '__main__':
+    main()
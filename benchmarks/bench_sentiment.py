@@ -0,0 +1,54 @@
+"""
+Benchmark: batched multi-process sentiment scoring vs. the row-by-row `apply` path.
+
+Usage:
+    python benchmarks/bench_sentiment.py [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+from src.analysis.sentiment import analyze_sentiment, score_texts
+
+
+def apply_path(df: pd.DataFrame) -> None:
+    """The original adding_sentiment_score&label.py implementation."""
+    sentiment_results = df['review'].apply(analyze_sentiment)
+    df['sentiment_label'] = [result[0] for result in sentiment_results]
+    df['sentiment_score'] = [result[1] for result in sentiment_results]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    df = pd.read_csv(project_root / 'data' / 'processed' / 'cleaned_bank_reviews_cbe.csv')
+    print(f"Benchmarking on {len(df)} CBE reviews, {args.workers} worker(s)")
+
+    start = time.perf_counter()
+    apply_path(df.copy())
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    labels, scores = score_texts(df['review'], workers=args.workers)
+    engine_seconds = time.perf_counter() - start
+
+    expected = df['review'].apply(analyze_sentiment)
+    agree = sum(label == e[0] for label, e in zip(labels, expected))
+
+    print(f"  apply path     {apply_seconds:6.2f} s  {len(df) / apply_seconds:8.0f} rows/s")
+    print(f"  batched engine {engine_seconds:6.2f} s  {len(df) / engine_seconds:8.0f} rows/s  "
+          f"x{apply_seconds / engine_seconds:.1f}")
+    print(f"  identical labels: {agree}/{len(df)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""
+Benchmark suite for the pipeline hot paths on seeded synthetic data.
+
+Each benchmark runs at every requested size and its best and median wall
+time over `--repeat` runs is saved as JSON (one file per commit by default),
+so results from two commits can be compared with `--compare`.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 10k,100k,1M] [--only NAME,...]
+                                        [--repeat 3] [--output FILE] [--compare BASELINE.json]
+
+Translation is disabled while benchmarking `process_reviews` (it would call
+the network). The Postgres load measures COPY serialization against a
+stand-in cursor unless DATABASE_URL or DB_HOST is set, in which case rows
+are really COPY'd into a temporary table that is rolled back.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+# Add project root and the database scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root / 'data' / 'database'))
+
+from src.utils.synthetic_reviews import SIZES, generate_reviews, scraped_frame
+from src.analysis.aspects import AspectTagger
+from src.analysis.lexicon_sentiment import LexiconScorer
+from src.analysis.sentiment import analyze_sentiment, score_texts
+from src.analysis.themes import ThemeModel
+from src.data_handler import extract_emoji_info, process_reviews, process_reviews_frame, save_to_csv
+from src.preprocessing.near_duplicates import NearDuplicateIndex
+from src.preprocessing.preprocess import preprocess_data
+from src.utils.review_buffer import ReviewBuffer
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# Slower than this relative to the baseline is reported as a regression
+REGRESSION_THRESHOLD = 0.10
+
+
+class _NullCursor:
+    """Drains the COPY buffer without a database."""
+    def copy_expert(self, sql, file):
+        while file.read(1 << 20):
+            pass
+
+    def close(self):
+        pass
+
+
+class _NullConnection:
+    def __init__(self):
+        self.connection = self
+
+    def cursor(self):
+        return _NullCursor()
+
+
+def _postgres_available() -> bool:
+    return bool(os.getenv('DATABASE_URL') or os.getenv('DB_HOST'))
+
+
+def _load_frame(reviews):
+    """Rows shaped like the reviews table load."""
+    from load_to_postgres import REVIEW_LOAD_COLUMNS
+    df = process_reviews_frame(reviews, 'CBE').rename(columns={'review': 'review_text', 'date': 'review_date'})
+    df['bank_id'] = 1
+    df['sentiment_label'] = 'neutral'
+    df['sentiment_score'] = 0.0
+    df['source'] = 'Google Play Store'
+    return df[REVIEW_LOAD_COLUMNS]
+
+
+def bench_postgres_load(df):
+    from load_to_postgres import REVIEW_LOAD_COLUMNS, copy_dataframe
+    if not _postgres_available():
+        copy_dataframe(_NullConnection(), df, 'reviews', REVIEW_LOAD_COLUMNS)
+        return
+    from sqlalchemy import text
+    from src.database import get_engine
+    with get_engine().connect() as conn:
+        conn.execute(text("""
+            CREATE TEMP TABLE reviews_bench (
+                bank_id INTEGER, review_text TEXT, rating INTEGER, review_date DATE,
+                sentiment_label VARCHAR(20), sentiment_score FLOAT, source VARCHAR(50)
+            )
+        """))
+        copy_dataframe(conn, df, 'reviews_bench', REVIEW_LOAD_COLUMNS)
+        conn.rollback()
+
+
+def _translation_disabled():
+    return mock.patch.dict('src.data_handler.TRANSLATION_CONFIG', {'enabled': False})
+
+
+# name -> (setup(reviews, tmp_dir) -> argument, run(argument))
+BENCHMARKS = {
+    'process_reviews': (
+        lambda reviews, tmp: reviews,
+        lambda reviews: process_reviews(reviews, 'CBE'),
+    ),
+    'process_reviews_frame': (
+        lambda reviews, tmp: reviews,
+        lambda reviews: process_reviews_frame(reviews, 'CBE'),
+    ),
+    'review_buffer': (
+        lambda reviews, tmp: reviews,
+        lambda reviews: ReviewBuffer(reviews).to_frame(),
+    ),
+    'extract_emoji_info': (
+        lambda reviews, tmp: [r['content'] for r in reviews],
+        lambda texts: [extract_emoji_info(t) for t in texts],
+    ),
+    'save_to_csv': (
+        lambda reviews, tmp: (process_reviews_frame(reviews, 'CBE'), os.path.join(tmp, 'reviews.csv')),
+        lambda args: save_to_csv(*args),
+    ),
+    'preprocess_data': (
+        lambda reviews, tmp: scraped_frame(reviews),
+        lambda df: preprocess_data(df.copy(), 'cbe'),
+    ),
+    'near_duplicates': (
+        lambda reviews, tmp: [r['content'] for r in reviews],
+        lambda texts: NearDuplicateIndex(threshold=0.8, num_perm=128, shingle_size=4).add(texts),
+    ),
+    'aspect_tagging': (
+        lambda reviews, tmp: (AspectTagger(), [r['content'] for r in reviews]),
+        lambda args: args[0].tag(args[1]),
+    ),
+    'theme_model': (
+        lambda reviews, tmp: [r['content'] for r in reviews],
+        lambda texts: ThemeModel().partial_fit(texts, 'CBE'),
+    ),
+    'analyze_sentiment': (
+        lambda reviews, tmp: [r['content'] for r in reviews],
+        lambda texts: [analyze_sentiment(t) for t in texts],
+    ),
+    'score_texts': (
+        lambda reviews, tmp: [r['content'] for r in reviews],
+        lambda texts: score_texts(texts),
+    ),
+    'lexicon_sentiment': (
+        lambda reviews, tmp: [r['content'] for r in reviews],
+        lambda texts: LexiconScorer().score(texts),
+    ),
+    'postgres_load': (
+        lambda reviews, tmp: _load_frame(reviews),
+        bench_postgres_load,
+    ),
+}
+
+
+def parse_size(value: str) -> int:
+    return SIZES.get(value) or int(value.replace('_', ''))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmark(name: str, reviews, repeat: int):
+    """Time one benchmark; returns the list of wall times in seconds."""
+    setup, run = BENCHMARKS[name]
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        with _translation_disabled(), contextlib.redirect_stdout(io.StringIO()):
+            argument = setup(reviews, tmp_dir)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run(argument)
+                timings.append(time.perf_counter() - start)
+        return timings
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def compare(results, baseline_path: str) -> None:
+    """Print each benchmark's change against a baseline results file."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(r['benchmark'], r['rows']): r for r in baseline['results']}
+    print(f"\nCompared with {baseline.get('commit', '?')} ({baseline_path}):")
+    for result in results:
+        before = previous.get((result['benchmark'], result['rows']))
+        if before is None:
+            continue
+        change = result['seconds_min'] / before['seconds_min'] - 1
+        flag = '  REGRESSION' if change > REGRESSION_THRESHOLD else ''
+        print(f"  {result['benchmark']:<22} {result['rows']:>9,}  {change:+7.1%}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10k', help="comma-separated sizes: 10k, 100k, 1M or a row count")
+    parser.add_argument('--only', help=f"comma-separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="baseline results file to compare against")
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    commit = git_commit()
+    results = []
+    for rows in [parse_size(size) for size in args.sizes.split(',')]:
+        reviews = generate_reviews(rows, seed=args.seed)
+        print(f"\n{rows:,} synthetic reviews (seed {args.seed})")
+        for name in names:
+            timings = run_benchmark(name, reviews, args.repeat)
+            best = min(timings)
+            results.append({
+                'benchmark': name,
+                'rows': rows,
+                'repeat': args.repeat,
+                'seconds_min': best,
+                'seconds_median': statistics.median(timings),
+                'rows_per_sec': rows / best if best else None,
+            })
+            print(f"  {name:<22} {best:8.3f} s  {rows / best:12,.0f} rows/s")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': args.seed,
+            'postgres': _postgres_available(),
+            'results': results,
+        }, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
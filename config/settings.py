@@ -3,16 +3,19 @@ BANK_APPS = {
     'cbe': {
         'id': 'com.combanketh.mobilebanking',
         'name': 'CBE',
+        'full_name': 'Commercial Bank of Ethiopia',
         'supported_languages': ['en', 'am']  # English and Amharic
     },
     'boa': {
         'id': 'com.boa.boaMobileBanking',
         'name': 'BOA',
+        'full_name': 'Bank of Abyssinia',
         'supported_languages': ['en', 'am']
     },
     'dashen': {
         'id': 'com.dashen.dashensuperapp',
         'name': 'DASHEN',
+        'full_name': 'Dashen Bank',
         'supported_languages': ['en', 'am']
     }
 }
@@ -35,7 +38,12 @@ TRANSLATION_CONFIG = {
     'timeout': 5,  # seconds
     'retries': 3,
     'batch_size': 10,  # Number of texts to translate in a single batch
-    'target_language': 'en'  # Add this line to specify the target language
+    'max_workers': 4,  # Batches translated concurrently
+    'target_language': 'en',  # Add this line to specify the target language
+    'cache': {
+        'enabled': True,  # Reuse translations across runs
+        'path': 'data/.translation_cache.sqlite'
+    }
 }
 
 # Scraping configuration
@@ -44,6 +52,28 @@ SCRAPING_CONFIG = {
     'country': 'et',              # Ethiopia
     'sleep_time': 2,              # Seconds between requests
     'sort_by': 'most_relevant',   # most_relevant, newest, rating
+    'backend': 'google_play',     # 'google_play' or 'fake' (local server, see src/fake_play_store.py)
+    'fake_server': {
+        'url': 'http://127.0.0.1:8765',
+        'reviews_per_app': 5000,      # Reviews served per app and language
+        'latency_ms': 50,             # Added latency per request
+        'latency_jitter_ms': 25,      # Uniform +/- jitter around latency_ms
+        'error_rate': 0.0,            # Fraction of requests answered with HTTP 500
+        'requests_per_second': None,  # Throttle (HTTP 429) above this rate; None = unlimited
+        'seed': 42
+    },
+    'concurrency': {
+        'enabled': False,             # Scrape (app_id, lang) jobs in parallel
+        'max_workers': 4,             # Maximum jobs running at once
+        'requests_per_second': 1.0,   # Token-bucket refill rate per host (all scraping modes)
+        'burst': 2                    # Token-bucket capacity per host
+    },
+    'incremental': {
+        'enabled': False,             # Only fetch reviews newer than the last run
+        'state_file': 'data/.scrape_state.json',
+        'page_size': 100,             # Reviews requested per page
+        'max_seen_ids': 2000          # Recent review ids remembered per app/language
+    },
     'output': {
         'directory': 'data',
         'filename': 'bank_reviews_{bank_name}.csv',  # Will be formatted with bank name
@@ -51,6 +81,143 @@ SCRAPING_CONFIG = {
     }
 }
 
+# Retries and circuit breaking for the Play Store and translation endpoints
+RESILIENCE_CONFIG = {
+    'max_attempts': 5,           # Calls per request before giving up
+    'base_delay': 1.0,           # Backoff ceiling for the first retry (seconds, doubled per retry)
+    'max_delay': 60.0,           # Largest backoff ceiling (seconds)
+    'failure_threshold': 5,      # Consecutive failures that open an endpoint's circuit
+    'reset_timeout': 30.0,       # Seconds an open circuit rejects calls before a trial call
+    'circuit_wait': 90.0         # Seconds a scraped page waits for an open circuit's trial call
+}
+
+# Storage used between pipeline stages
+STORAGE_CONFIG = {
+    'format': 'csv',                 # 'csv' or 'parquet'
+    'parquet_compression': 'zstd'
+}
+
+# Preprocessing configuration
+PREPROCESSING_CONFIG = {
+    'streaming': False,              # Process inputs in chunks with flat memory use
+    'workers': None,                 # Banks processed in parallel (None = CPU count)
+    'chunksize': None,               # Rows per chunk (None = derive from memory budget)
+    'memory_budget_mb': 256,         # Target peak memory for one chunk and its copies
+    'dedup': 'exact',                # 'exact' (hashed seen-set) or 'bloom'
+    'bloom_capacity': 10_000_000,    # Expected number of unique review ids
+    'bloom_error_rate': 0.001,
+    'near_duplicates': {
+        'enabled': False,            # Detect copy-pasted / template reviews per bank
+        'mode': 'flag',              # 'flag' (add a duplicate_of column) or 'collapse' (drop them)
+        'column': 'review',          # Text column compared
+        'threshold': 0.8,            # Estimated Jaccard similarity of character shingles
+        'num_perm': 128,             # MinHash signature length
+        'shingle_size': 4            # Characters per shingle
+    }
+}
+
+# Aspect tagging at the end of preprocess_data (src/analysis/aspects.py).
+# Keywords are case-insensitive. English keywords match whole words (a
+# trailing '*' matches any word starting with it); Amharic keywords also
+# match inside words, since Amharic attaches prepositions and suffixes.
+ASPECTS_CONFIG = {
+    'enabled': False,                # Add aspect columns to the processed reviews
+    'column': 'review',              # Text column tagged
+    'sentiment': True,               # Score the clauses that mention each aspect
+    'keywords': {
+        'login_otp': {
+            'en': ['login', 'log in', 'logging in', 'sign in', 'signin', 'otp', 'verification code',
+                   'sms code', 'activation code', 'password', 'pin', 'activat*', 'authenticat*',
+                   'locked out', 'blocked account', 'register*', 'registration'],
+            'am': ['ኦቲፒ', 'መግባት', 'አያስገባም', 'የይለፍ ቃል', 'ፓስወርድ', 'ፒን', 'ኮድ', 'ምዝገባ'],
+        },
+        'transfer_failure': {
+            'en': ['transfer fail*', 'transaction fail*', 'failed transfer*', 'failed transaction*',
+                   'transfer not', 'not received', 'not reflected', 'not credited', 'not sent',
+                   "didn't go through", 'did not go through', 'pending transaction*', 'reversal',
+                   'reversed', 'money deducted', 'unsuccessful'],
+            'am': ['አልተላከም', 'አልደረሰም', 'ዝውውር', 'ማስተላለፍ', 'ትራንስፈር', 'አልተሳካም'],
+        },
+        'crash_loading': {
+            'en': ['crash*', 'freez*', 'frozen', 'hangs', 'hanging', 'not loading', 'loading',
+                   'keeps closing', 'shuts down', 'slow', 'lag*', 'not opening', "doesn't open",
+                   'does not open', 'white screen', 'black screen', 'bug*', 'glitch*', 'not working',
+                   "doesn't work", 'stopped working'],
+            'am': ['አይከፈትም', 'አይሰራም', 'አልሰራም', 'ይዘጋል', 'ቀርፋፋ', 'ይቆማል', 'ሎዲንግ'],
+        },
+        'fees': {
+            'en': ['fee', 'fees', 'charge*', 'commission', 'deduct*', 'service charge', 'expensive',
+                   'cost*', 'tariff', 'hidden fee*', 'overcharg*'],
+            'am': ['ክፍያ', 'ኮሚሽን', 'ቻርጅ', 'ተቆርጧል', 'ተቀንሷል'],
+        },
+        'customer_service': {
+            'en': ['customer service', 'customer care', 'customer support', 'support', 'call center',
+                   'call centre', 'hotline', 'agent*', 'staff', 'branch', 'help desk', 'no response',
+                   'respond*', 'complain*'],
+            'am': ['ደንበኛ', 'አገልግሎት', 'ቅርንጫፍ', 'ሰራተኛ', 'ኮል ሴንተር', 'መልስ'],
+        },
+    }
+}
+
+# Sentiment scoring
+SENTIMENT_CONFIG = {
+    'positive_threshold': 0.0,       # score > threshold -> positive
+    'negative_threshold': 0.0,       # score < threshold -> negative
+    'workers': None,                 # Scoring processes (None = CPU count)
+    'chunk_size': None,              # Texts per task (None = split evenly across workers)
+    'min_parallel_rows': 2000,       # Smaller inputs are scored in-process
+    'analyzer': 'textblob',          # 'textblob', 'vader' or 'lexicon' (vectorized TextBlob lexicon)
+    'cache': {
+        'enabled': True,             # Only rescore text that is new or changed
+        'path': 'data/.sentiment_cache.sqlite',
+        'max_entries': 500_000       # Least recently used entries are evicted beyond this
+    }
+}
+
+# End-to-end pipeline runner (src/pipeline.py)
+PIPELINE_CONFIG = {
+    'stages': ['scrape', 'preprocess', 'sentiment', 'load'],  # Stages run by default
+    'processed_dir': 'data/processed',   # Final per-bank outputs (read by the DB loader)
+    'cache_dir': 'data/.pipeline',       # Intermediate outputs and the stage manifest
+    'chunksize': None                    # Rows per batch (None = derive from memory budget)
+}
+
+# Local full-text review search (src/analysis/search_index.py)
+SEARCH_CONFIG = {
+    'index_path': 'data/.search/reviews_index.npz',  # Persisted inverted index
+    'chunksize': 50_000,                             # Rows read per batch while indexing
+    'default_limit': 20                              # Results printed by the CLI
+}
+
+# Incremental keyword/theme extraction (src/analysis/themes.py)
+THEMES_CONFIG = {
+    'state_path': 'data/.themes/theme_model.npz',  # Persisted vocabulary and per-bank counts
+    'ngram_range': (1, 2),       # Word n-grams counted (fixed once a model is saved)
+    'min_token_length': 3,       # Shorter words are ignored, as in the EDA notebooks
+    'extra_stop_words': [],      # Added to scikit-learn's English stop words
+    'min_df': 5,                 # Terms in fewer reviews are left out of reports
+    'top_n': 20,                 # Terms reported per bank
+    'chunksize': 50_000          # Rows read per batch while updating
+}
+
+# Instrumentation (src/metrics.py)
+METRICS_CONFIG = {
+    'enabled': True,
+    'textfile': 'data/metrics/pipeline.prom',           # Prometheus textfile written at the end of a run
+    'summary_path': 'data/metrics/run_summary.json',    # Structured JSON run summary
+    'http_port': None                                    # Serve /metrics on this port during pipeline runs
+}
+
+# PostgreSQL access (credentials come from DB_* environment variables / .env)
+DATABASE_CONFIG = {
+    'name': 'bank_reviews',          # Default when DB_NAME is not set
+    'pool_size': 5,                  # Connections kept open per process
+    'max_overflow': 5,               # Extra connections allowed under load
+    'pool_recycle': 1800,            # Seconds before a pooled connection is replaced
+    'pool_pre_ping': True,           # Check connections before handing them out
+    'stream_chunksize': 10_000       # Rows per DataFrame when streaming a query
+}
+
 # Emoji processing
 EMOJI_CONFIG = {
     'extract_emojis': True,
@@ -1,28 +1,20 @@
-import psycopg2
+from pathlib import Path
+import sys
 from tabulate import tabulate
 
-conn = psycopg2.connect(
-    dbname="bank_reviews",
-    user="postgres",
-    password="13579.,ad",
-    host="localhost"
-)
+# Add the project root to Python path
+project_root = str(Path(__file__).resolve().parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
+from src.database import fetch_df
+
+# Reads the pre-aggregated rollups instead of scanning every review
 query = """
-SELECT 
-    b.bank_name,
-    r.sentiment_label,
-    COUNT(*) as count,
-    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY b.bank_name), 1) as percentage
-FROM reviews r
-JOIN banks b ON r.bank_id = b.bank_id
-GROUP BY b.bank_name, r.sentiment_label
-ORDER BY b.bank_name, r.sentiment_label;
+SELECT bank_name, sentiment_label, review_count, percentage
+FROM bank_sentiment_summary
+ORDER BY bank_name, sentiment_label;
 """
 
-with conn.cursor() as cur:
-    cur.execute(query)
-    results = cur.fetchall()
-    print(tabulate(results, headers=['Bank', 'Sentiment', 'Count', 'Percentage%'], tablefmt='grid'))
-
-conn.close()
\ No newline at end of file
+results = fetch_df(query)
+print(tabulate(results.values.tolist(), headers=['Bank', 'Sentiment', 'Count', 'Percentage%'], tablefmt='grid'))
@@ -1,59 +1,61 @@
-import pandas as pd
-from textblob import TextBlob
+import sys
+from pathlib import Path
 
-def analyze_sentiment(text):
-    """Analyze sentiment using TextBlob and return label and score"""
-    if pd.isna(text) or str(text).strip() == '':
-        return 'neutral', 0.0
-    
-    analysis = TextBlob(str(text))
-    score = analysis.sentiment.polarity
-    
-    if score > 0:
-        return 'positive', score
-    elif score < 0:
-        return 'negative', score
-    else:
-        return 'neutral', score
+# Add the project root to Python path
+project_root = str(Path(__file__).resolve().parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
-def process_bank_reviews(input_file, output_file=None):
-    """Process a bank's reviews and add sentiment analysis"""
+from config.settings import BANK_APPS, PIPELINE_CONFIG
+from src.storage import read_reviews, write_reviews
+from src.analysis.sentiment import add_sentiment_columns
+from src.analysis.sentiment_cache import get_sentiment_cache
+from src.metrics import export_metrics, timed
+
+def process_bank_reviews(input_file, output_file=None, analyzer=None):
+    """Process a bank's reviews and add sentiment analysis
+    
+    Scores come from the sentiment cache where possible, so only reviews
+    whose text is new or changed since the last run are actually scored.
+    """
     if output_file is None:
         output_file = input_file
     
     print(f"Processing {input_file}...")
     
-    # Read the CSV file
-    df = pd.read_csv(input_file)
-    
-    # Add sentiment analysis if columns don't exist
-    if 'sentiment_label' not in df.columns or 'sentiment_score' not in df.columns:
-        print("  Adding sentiment analysis...")
-        # Apply sentiment analysis to each review
-        sentiment_results = df['review'].apply(analyze_sentiment)
-        df['sentiment_label'] = [result[0] for result in sentiment_results]
-        df['sentiment_score'] = [result[1] for result in sentiment_results]
-        
-        # Save the updated DataFrame
-        df.to_csv(output_file, index=False)
-        print(f"  ✅ Added sentiment analysis to {output_file}")
-    else:
-        print("  ✅ Sentiment columns already exist")
+    # Read the CSV or Parquet file
+    df = read_reviews(input_file)
+    
+    # Score reviews in batches across a process pool, reusing cached results
+    print("  Adding sentiment analysis...")
+    cache = get_sentiment_cache()
+    with timed('sentiment') as stage:
+        add_sentiment_columns(df, 'review', analyzer=analyzer, cache=cache)
+        stage['rows'] = len(df)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"  ♻️  Sentiment cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.1%} hit rate)")
+    
+    # Save the updated DataFrame
+    write_reviews(df, output_file)
+    print(f"  ✅ Added sentiment analysis to {output_file}")
     
     return df
 
-# Process all three bank review files
-bank_files = [
-    'cleaned_bank_reviews_cbe.csv',
-    'cleaned_bank_reviews_boa.csv',
-    'cleaned_bank_reviews_dashen.csv'
-]
-
-# Directory where your CSV files are located
-data_dir = r"C:/Users/My Device/Desktop/Week-2/data/processed"
-
-for filename in bank_files:
-    input_path = f"{data_dir}/{filename}"
-    process_bank_reviews(input_path)
-
-print("\nAll files processed successfully!")
\ No newline at end of file
+if __name__ == "__main__":
+    # Process every bank's review file
+    bank_files = [f'cleaned_bank_reviews_{key}.csv' for key in BANK_APPS]
+    
+    # Directory where the processed files are located
+    data_dir = Path(project_root) / PIPELINE_CONFIG['processed_dir']
+    
+    # The guard above is required for the process pool on Windows
+    for filename in bank_files:
+        input_path = data_dir / filename
+        if not input_path.exists():
+            input_path = input_path.with_suffix('.parquet')
+        process_bank_reviews(input_path)
+    
+    export_metrics()
+    print("\nAll files processed successfully!")
\ No newline at end of file
@@ -1,82 +1,215 @@
+import argparse
 import os
+import tempfile
+import time
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from dotenv import load_dotenv
 from pathlib import Path
+import sys
 
-# create a database 
-import psycopg2
-from psycopg2 import sql
-from dotenv import load_dotenv
+# Add the project root to Python path
+project_root = str(Path(__file__).resolve().parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
-def create_database():
-    # Load environment variables
-    load_dotenv()
-    
-    # Get database connection parameters
-    db_params = {
-        'user': os.getenv('DB_USER', 'postgres'),
-        'password': os.getenv('DB_PASSWORD', '13579.,ad'),
-        'host': os.getenv('DB_HOST', 'localhost'),
-        'port': os.getenv('DB_PORT', '5432'),
-        'database': 'postgres'  # Connect to default 'postgres' database first
-    }
+from config.settings import BANK_APPS, PIPELINE_CONFIG
+from src.database import ensure_database, get_engine
+from src.metrics import DB_LOAD_ROWS_PER_SECOND, export_metrics, record_stage
+from src.storage import read_reviews
+from schema_manager import (
+    create_schema, drop_schema, ensure_partitions, is_partitioned, refresh_rollups, review_conflict_target
+)
+
+# Review columns loaded into the reviews table, in COPY order
+REVIEW_LOAD_COLUMNS = ['bank_id', 'review_text', 'rating', 'review_date', 'sentiment_label', 'sentiment_score', 'source']
+
+# Incremental loads stage rows keyed by the Play Store reviewId
+STAGING_COLUMNS = ['play_review_id'] + REVIEW_LOAD_COLUMNS
+
+STAGING_SQL = """
+CREATE TEMP TABLE reviews_staging (
+    play_review_id TEXT,
+    bank_id INTEGER,
+    review_text TEXT,
+    rating INTEGER,
+    review_date DATE,
+    sentiment_label VARCHAR(20),
+    sentiment_score FLOAT,
+    source VARCHAR(50)
+) ON COMMIT DROP
+"""
+
+# Rows loaded before play_review_id existed have it NULL and would never
+# match ON CONFLICT, so they are given the id of the staged review with the
+# same date, rating and text first. Duplicate reviews are paired in id order
+# and ids already in the table are skipped.
+LEGACY_REVIEWS_SQL = """
+SELECT EXISTS (SELECT 1 FROM reviews WHERE bank_id = :bank_id AND play_review_id IS NULL)
+"""
+
+BACKFILL_REVIEW_IDS_SQL = """
+UPDATE reviews
+SET play_review_id = matched.play_review_id
+FROM (
+    SELECT legacy.review_id, staged.play_review_id
+    FROM (
+        SELECT review_id, review_date, rating, review_text,
+               ROW_NUMBER() OVER (PARTITION BY review_date, rating, review_text ORDER BY review_id) AS n
+        FROM reviews
+        WHERE bank_id = :bank_id AND play_review_id IS NULL
+    ) legacy
+    JOIN (
+        SELECT play_review_id, review_date, rating, review_text,
+               ROW_NUMBER() OVER (PARTITION BY review_date, rating, review_text ORDER BY play_review_id) AS n
+        FROM (
+            SELECT play_review_id, review_date, rating, review_text,
+                   ROW_NUMBER() OVER (PARTITION BY play_review_id ORDER BY review_date DESC NULLS LAST) AS id_rank
+            FROM reviews_staging s
+            WHERE NOT EXISTS (SELECT 1 FROM reviews r WHERE r.play_review_id = s.play_review_id)
+        ) unique_staged
+        WHERE id_rank = 1
+    ) staged
+      ON staged.review_date IS NOT DISTINCT FROM legacy.review_date
+     AND staged.rating IS NOT DISTINCT FROM legacy.rating
+     AND staged.review_text IS NOT DISTINCT FROM legacy.review_text
+     AND staged.n = legacy.n
+) matched
+WHERE reviews.review_id = matched.review_id
+"""
+
+# Existing rows of staged reviews whose date moved. A partitioned table keys
+# on (play_review_id, review_date), so there they are deleted and reinserted.
+MOVED_REVIEWS_SQL = """
+SELECT r.review_date
+FROM reviews r
+JOIN reviews_staging s ON r.play_review_id = s.play_review_id
+WHERE r.review_date IS DISTINCT FROM s.review_date
+"""
+
+DELETE_MOVED_REVIEWS_SQL = """
+DELETE FROM reviews r
+USING reviews_staging s
+WHERE r.play_review_id = s.play_review_id
+  AND (r.review_date IS DISTINCT FROM s.review_date OR s.review_date IS NULL)
+RETURNING r.review_date
+"""
+
+# Insert new reviews and update only the ones whose content changed.
+# xmax = 0 identifies freshly inserted rows in RETURNING.
+UPSERT_SQL = """
+INSERT INTO reviews (play_review_id, bank_id, review_text, rating, review_date,
+                     sentiment_label, sentiment_score, source)
+SELECT DISTINCT ON (play_review_id)
+       play_review_id, bank_id, review_text, rating, review_date,
+       sentiment_label, sentiment_score, source
+FROM reviews_staging
+ORDER BY play_review_id, review_date DESC NULLS LAST
+ON CONFLICT ({conflict_target}) DO UPDATE SET
+    bank_id = EXCLUDED.bank_id,
+    review_text = EXCLUDED.review_text,
+    rating = EXCLUDED.rating,
+    review_date = EXCLUDED.review_date,
+    sentiment_label = EXCLUDED.sentiment_label,
+    sentiment_score = EXCLUDED.sentiment_score,
+    source = EXCLUDED.source,
+    updated_at = CURRENT_TIMESTAMP
+WHERE (reviews.bank_id, reviews.review_text, reviews.rating, reviews.review_date,
+       reviews.sentiment_label, reviews.sentiment_score, reviews.source)
+      IS DISTINCT FROM
+      (EXCLUDED.bank_id, EXCLUDED.review_text, EXCLUDED.rating, EXCLUDED.review_date,
+       EXCLUDED.sentiment_label, EXCLUDED.sentiment_score, EXCLUDED.source)
+RETURNING (xmax = 0) AS inserted, review_date
+"""
+
+WATERMARK_SQL = """
+INSERT INTO load_watermarks (bank_id, last_review_date, last_loaded_at, rows_upserted)
+VALUES (:bank_id, :last_review_date, CURRENT_TIMESTAMP, :rows_upserted)
+ON CONFLICT (bank_id) DO UPDATE SET
+    last_review_date = GREATEST(load_watermarks.last_review_date, EXCLUDED.last_review_date),
+    last_loaded_at = EXCLUDED.last_loaded_at,
+    rows_upserted = EXCLUDED.rows_upserted
+"""
+
+
+def copy_dataframe(conn, df, table, columns, spool_max_bytes=64 * 1024 * 1024):
+    """Bulk load `df[columns]` into `table` with PostgreSQL COPY FROM STDIN.
     
-    # Connect to the default 'postgres' database
-    conn = psycopg2.connect(**db_params)
-    conn.autocommit = True  # Required for creating databases
+    Rows are serialized as CSV into a spooled buffer (in memory up to
+    `spool_max_bytes`, then on disk) and streamed with psycopg2's
+    `copy_expert` on the connection's own cursor, so the load is part of
+    whatever transaction `conn` is in.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=spool_max_bytes, mode='w+', encoding='utf-8', newline='') as buffer:
+        df[columns].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+    return len(df)
+
+
+def rows_since_watermark(df, watermark=None):
+    """Keep the keyed rows dated on or after `watermark`.
     
+    Rows without a `play_review_id` cannot be upserted and are dropped.
+    The watermark day itself is kept because reviews posted later that day
+    may have arrived after the previous load, and undated rows are always
+    kept (the upsert skips them if nothing changed).
+    """
+    df = df[df['play_review_id'].notna() & (df['play_review_id'].astype(str) != '')]
+    if watermark is None:
+        return df
+    dates = pd.to_datetime(df['review_date'], errors='coerce')
+    return df[(dates >= pd.Timestamp(watermark)) | dates.isna()]
+
+
+def latest_review_date(df):
+    """Newest review date in `df` as a `date`, or None."""
+    latest = pd.to_datetime(df['review_date'], errors='coerce').max()
+    return None if pd.isna(latest) else latest.date()
+
+# Load environment variables (this directory's .env) before any engine is created
+load_dotenv()
+
+# create a database 
+def create_database():
+    """Create the 'bank_reviews' database if it does not exist yet"""
     try:
-        with conn.cursor() as cursor:
-            # Check if database already exists
-            cursor.execute("SELECT 1 FROM pg_database WHERE datname = 'bank_reviews'")
-            exists = cursor.fetchone()
-            
-            if not exists:
-                # Create the database
-                print("Creating database 'bank_reviews'...")
-                cursor.execute(sql.SQL("CREATE DATABASE {}").format(
-                    sql.Identifier('bank_reviews'))
-                )
-                print("✅ Database 'bank_reviews' created successfully!")
-            else:
-                print("ℹ️ Database 'bank_reviews' already exists.")
-                
+        if ensure_database():
+            print("✅ Database 'bank_reviews' created successfully!")
+        else:
+            print("ℹ️ Database 'bank_reviews' already exists.")
     except Exception as e:
         print(f"❌ Error creating database: {e}")
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     create_database()
 
 
-# Load environment variables
-load_dotenv()
-
 class BankReviewLoader:
-    def __init__(self):
+    def __init__(self, load_method=None):
         try:
-            # Database connection parameters
-            self.db_user = os.getenv('DB_USER', 'postgres')
-            self.db_password = os.getenv('DB_PASSWORD', '13579.,ad')
-            self.db_host = os.getenv('DB_HOST', 'localhost')
-            self.db_port = os.getenv('DB_PORT', '5432')
-            self.db_name = os.getenv('DB_NAME', 'bank_reviews')
+            # 'copy' streams rows with COPY FROM STDIN, 'insert' uses multi-row INSERTs
+            self.load_method = load_method or os.getenv('LOAD_METHOD', 'copy')
+            # Range-partition reviews by month when the tables are (re)created
+            self.partitioned = os.getenv('REVIEWS_PARTITIONED', 'false').lower() in ('1', 'true', 'yes')
             
-            # Use the current directory for CSV files
-            self.data_dir = Path(r"C:/Users/My Device/Desktop/Week-2/data/processed")
+            # Processed files written by the pipeline / sentiment script
+            self.data_dir = Path(project_root) / PIPELINE_CONFIG['processed_dir']
             
-            # Create database engine
-            self.engine = create_engine(
-                f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
-            )
+            # Shared pooled engine (DB_* settings from the environment / .env)
+            self.engine = get_engine()
             
             # Bank files mapping
             self.bank_files = {
-                'Commercial Bank of Ethiopia': 'cleaned_bank_reviews_cbe.csv',
-                'Bank of Abyssinia': 'cleaned_bank_reviews_boa.csv',
-                'Dashen Bank': 'cleaned_bank_reviews_dashen.csv'
+                bank['full_name']: f'cleaned_bank_reviews_{key}.csv'
+                for key, bank in BANK_APPS.items()
             }
             
             print("✅ Database connection initialized")
@@ -97,76 +230,176 @@ class BankReviewLoader:
             return False
 
     def create_tables(self):
-        """Create the necessary tables if they don't exist"""
+        """Drop and recreate the tables (full reload)"""
         try:
-            with self.engine.connect() as conn:
-                conn.execute(text("""
-                DROP TABLE IF EXISTS reviews;
-                DROP TABLE IF EXISTS banks;
-                
-                CREATE TABLE banks (
-                    bank_id SERIAL PRIMARY KEY,
-                    bank_name VARCHAR(100) UNIQUE,
-                    app_name VARCHAR(100)
-                );
-
-                CREATE TABLE reviews (
-                    review_id SERIAL PRIMARY KEY,
-                    bank_id INTEGER REFERENCES banks(bank_id),
-                    review_text TEXT,
-                    rating INTEGER,
-                    review_date DATE,
-                    sentiment_label VARCHAR(20),
-                    sentiment_score FLOAT,
-                    source VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-                """))
-                conn.commit()
-                print("✅ Database tables created successfully")
+            with self.engine.begin() as conn:
+                drop_schema(conn)
+                create_schema(conn, partitioned=self.partitioned)
+            layout = "partitioned by month" if self.partitioned else "unpartitioned"
+            print(f"✅ Database tables created successfully ({layout})")
         except Exception as e:
             print(f"❌ Error creating tables: {str(e)}")
             raise
 
+    def ensure_tables(self):
+        """Create any missing tables and columns without touching existing data"""
+        try:
+            with self.engine.begin() as conn:
+                create_schema(conn, partitioned=self.partitioned)
+            print("✅ Database tables are up to date")
+        except Exception as e:
+            print(f"❌ Error ensuring tables: {str(e)}")
+            raise
+
+    def _upsert_bank(self, conn, bank_name):
+        """Insert the bank if it does not exist and return its id"""
+        result = conn.execute(
+            text("""
+            INSERT INTO banks (bank_name, app_name)
+            VALUES (:bank_name, :app_name)
+            ON CONFLICT (bank_name) 
+            DO UPDATE SET app_name = EXCLUDED.app_name
+            RETURNING bank_id
+            """),
+            {"bank_name": bank_name, "app_name": f"{bank_name} Mobile"}
+        )
+        return result.scalar()
+
+    def _read_reviews(self, file_path):
+        """Read the columns we load and rename them to the table's names"""
+        df = read_reviews(
+            file_path,
+            columns=['review_id', 'review', 'rating', 'date', 'sentiment_label', 'sentiment_score', 'source']
+        )
+        print(f"📊 Read {len(df)} rows from {file_path}")
+        if 'review_id' not in df.columns:
+            df['review_id'] = None
+        # Empty ids become NULL so they never collide on the unique key
+        df['review_id'] = df['review_id'].replace('', None)
+        return df.rename(columns={
+            'review_id': 'play_review_id',
+            'review': 'review_text',
+            'date': 'review_date'
+        })
+
+    def _write_rows(self, conn, df, table, columns):
+        """Load rows into `table` with the configured load method"""
+        if self.load_method == 'copy':
+            copy_dataframe(conn, df, table, columns)
+        else:
+            df[columns].to_sql(
+                table, 
+                conn, 
+                if_exists='append', 
+                index=False, 
+                method='multi', 
+                chunksize=1000
+            )
+
+    def _record_watermark(self, conn, bank_id, df, rows_upserted):
+        """Advance the bank's load watermark to the newest loaded review date"""
+        conn.execute(text(WATERMARK_SQL), {
+            "bank_id": bank_id,
+            "last_review_date": latest_review_date(df),
+            "rows_upserted": rows_upserted
+        })
+
+    def upsert_bank_data(self, bank_name, file_path):
+        """Incrementally load a single bank's reviews
+        
+        Rows dated from the bank's watermark onwards are staged in a
+        temporary table and merged into `reviews` with
+        INSERT ... ON CONFLICT (play_review_id), updating only rows whose
+        content changed, and the daily rollups are refreshed from the
+        earliest day touched. Everything runs in one transaction, so readers
+        see either the previous or the new state, never empty tables.
+        
+        While the bank still has rows loaded before `play_review_id` existed,
+        every keyed row is staged (the watermark is ignored) and those rows
+        are backfilled with their ids before the upsert, so they are updated
+        instead of inserted a second time.
+        """
+        try:
+            df = self._read_reviews(file_path)
+            
+            with self.engine.begin() as conn:
+                bank_id = self._upsert_bank(conn, bank_name)
+                watermark = conn.execute(
+                    text("SELECT last_review_date FROM load_watermarks WHERE bank_id = :bank_id"),
+                    {"bank_id": bank_id}
+                ).scalar()
+                legacy = conn.execute(text(LEGACY_REVIEWS_SQL), {"bank_id": bank_id}).scalar()
+                if legacy:
+                    watermark = None
+                
+                staged = rows_since_watermark(df, watermark).copy()
+                staged['bank_id'] = bank_id
+                print(f"🔎 {len(staged)} of {len(df)} rows are on or after watermark {watermark or '-'}")
+                
+                start_time = time.time()
+                partitioned = is_partitioned(conn)
+                if partitioned:
+                    ensure_partitions(conn, staged['review_date'])
+                conn.execute(text(STAGING_SQL))
+                self._write_rows(conn, staged, 'reviews_staging', STAGING_COLUMNS)
+                if legacy:
+                    backfilled = conn.execute(text(BACKFILL_REVIEW_IDS_SQL), {"bank_id": bank_id}).rowcount
+                    print(f"🔑 Backfilled play_review_id on {backfilled} previously loaded rows")
+                
+                # Old dates of moved reviews also need their rollup days refreshed
+                moved_sql = DELETE_MOVED_REVIEWS_SQL if partitioned else MOVED_REVIEWS_SQL
+                touched_dates = [row.review_date for row in conn.execute(text(moved_sql))]
+                upsert_sql = UPSERT_SQL.format(conflict_target=review_conflict_target(partitioned))
+                changes = conn.execute(text(upsert_sql)).fetchall()
+                inserted = sum(row.inserted for row in changes)
+                touched_dates += [row.review_date for row in changes]
+                
+                touched_dates = [d for d in touched_dates if d is not None]
+                if touched_dates:
+                    refresh_rollups(conn, bank_id, since=min(touched_dates))
+                self._record_watermark(conn, bank_id, staged, len(changes))
+                elapsed = max(time.time() - start_time, 1e-9)
+                record_stage('db_load', len(staged), elapsed)
+                DB_LOAD_ROWS_PER_SECOND.labels(bank_name, f"upsert_{self.load_method}").set(len(staged) / elapsed)
+                
+                print(f"✅ Upserted {bank_name}: {inserted} new, {len(changes) - inserted} updated, "
+                      f"{len(staged) - len(changes)} unchanged ({len(staged) / elapsed:,.0f} rows/sec)")
+                return True
+                
+        except Exception as e:
+            print(f"❌ Error upserting data for {bank_name}: {str(e)}")
+            return False
+
     def load_bank_data(self, bank_name, file_path):
-        """Load data for a single bank"""
+        """Load data for a single bank
+        
+        The bank upsert, the review load and the bank's rollup refresh run
+        in one transaction.
+        """
         try:
-            # Read the CSV file
-            df = pd.read_csv(file_path)
-            print(f"📊 Read {len(df)} rows from {file_path}")
+            # Read the CSV or Parquet file (only the columns we load)
+            df = self._read_reviews(file_path)
             
             with self.engine.begin() as conn:  # Use begin() for transaction management
                 # Insert bank if not exists
-                result = conn.execute(
-                    text("""
-                    INSERT INTO banks (bank_name, app_name)
-                    VALUES (:bank_name, :app_name)
-                    ON CONFLICT (bank_name) 
-                    DO UPDATE SET app_name = EXCLUDED.app_name
-                    RETURNING bank_id
-                    """),
-                    {"bank_name": bank_name, "app_name": f"{bank_name} Mobile"}
-                )
-                bank_id = result.scalar()
+                bank_id = self._upsert_bank(conn, bank_name)
                 
                 # Prepare reviews data
-                reviews_df = df[['review', 'rating', 'date', 'sentiment_label', 'sentiment_score', 'source']].copy()
+                reviews_df = df.copy()
                 reviews_df['bank_id'] = bank_id
-                reviews_df = reviews_df.rename(columns={
-                    'review': 'review_text',
-                    'date': 'review_date'
-                })
                 
-                # Insert reviews
-                reviews_df.to_sql(
-                    'reviews', 
-                    self.engine, 
-                    if_exists='append', 
-                    index=False, 
-                    method='multi', 
-                    chunksize=1000
-                )
-                print(f"✅ Loaded {len(reviews_df)} reviews for {bank_name}")
+                # Insert reviews on the same connection as the bank upsert
+                start_time = time.time()
+                if is_partitioned(conn):
+                    ensure_partitions(conn, reviews_df['review_date'])
+                self._write_rows(conn, reviews_df, 'reviews', STAGING_COLUMNS)
+                refresh_rollups(conn, bank_id)
+                self._record_watermark(conn, bank_id, reviews_df, len(reviews_df))
+                elapsed = max(time.time() - start_time, 1e-9)
+                record_stage('db_load', len(reviews_df), elapsed)
+                DB_LOAD_ROWS_PER_SECOND.labels(bank_name, self.load_method).set(len(reviews_df) / elapsed)
+                print(f"✅ Loaded {len(reviews_df)} reviews for {bank_name} "
+                      f"({self.load_method}: {len(reviews_df) / elapsed:,.0f} rows/sec)")
                 return True
                 
         except Exception as e:
@@ -212,8 +445,13 @@ class BankReviewLoader:
             print(f"❌ Error verifying data: {str(e)}")
             raise
 
-    def run(self):
-        """Main method to run the ETL process"""
+    def run(self, incremental=False):
+        """Main method to run the ETL process
+        
+        With `incremental=True` existing tables are kept and each bank is
+        upserted from its load watermark; otherwise tables are dropped and
+        every file is reloaded.
+        """
         print("\n" + "="*50)
         print("🏦 Starting Bank Reviews ETL Process")
         print("="*50)
@@ -223,16 +461,24 @@ class BankReviewLoader:
             if not self.test_connection():
                 return False
             
-            # Create tables (drops existing ones)
-            self.create_tables()
+            if incremental:
+                # Keep existing data, only add missing tables/columns
+                self.ensure_tables()
+                load = self.upsert_bank_data
+            else:
+                # Create tables (drops existing ones)
+                self.create_tables()
+                load = self.load_bank_data
             
             # Load data for each bank
             success_count = 0
             for bank_name, filename in self.bank_files.items():
                 file_path = self.data_dir / filename
+                if not file_path.exists():
+                    file_path = file_path.with_suffix('.parquet')
                 if file_path.exists():
                     print(f"\n🔍 Processing {bank_name} from {file_path}")
-                    if self.load_bank_data(bank_name, file_path):
+                    if load(bank_name, file_path):
                         success_count += 1
                 else:
                     print(f"\n❌ Error: File not found - {file_path}")
@@ -254,9 +500,15 @@ class BankReviewLoader:
             return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load processed bank reviews into PostgreSQL")
+    parser.add_argument('--incremental', action='store_true',
+                        help="upsert new/changed reviews instead of dropping and reloading the tables")
+    args = parser.parse_args()
     try:
         loader = BankReviewLoader()
-        if not loader.run():
+        ok = loader.run(incremental=args.incremental)
+        export_metrics()
+        if not ok:
             exit(1)
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
@@ -0,0 +1,207 @@
+"""
+Schema management for the bank reviews database.
+
+Creates the tables and indexes, optionally range-partitions `reviews` by
+month of `review_date`, and maintains the `review_daily_rollups` table
+(bank x day x sentiment) that reports read instead of scanning `reviews`.
+"""
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import text
+
+BANKS_SQL = """
+CREATE TABLE IF NOT EXISTS banks (
+    bank_id SERIAL PRIMARY KEY,
+    bank_name VARCHAR(100) UNIQUE,
+    app_name VARCHAR(100)
+);
+"""
+
+REVIEWS_SQL = """
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id SERIAL PRIMARY KEY,
+    bank_id INTEGER REFERENCES banks(bank_id),
+    review_text TEXT,
+    rating INTEGER,
+    review_date DATE,
+    sentiment_label VARCHAR(20),
+    sentiment_score FLOAT,
+    source VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# A partitioned table cannot have a primary key or unique index that leaves
+# out the partition key, so review_id is only indexed and the natural key
+# becomes (play_review_id, review_date). Undated rows go to the default
+# partition.
+PARTITIONED_REVIEWS_SQL = """
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id SERIAL,
+    bank_id INTEGER REFERENCES banks(bank_id),
+    review_text TEXT,
+    rating INTEGER,
+    review_date DATE,
+    sentiment_label VARCHAR(20),
+    sentiment_score FLOAT,
+    source VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) PARTITION BY RANGE (review_date);
+CREATE TABLE IF NOT EXISTS reviews_default PARTITION OF reviews DEFAULT;
+CREATE INDEX IF NOT EXISTS reviews_review_id_idx ON reviews (review_id);
+"""
+
+# Columns added after the original schema (no-ops on fresh tables)
+REVIEW_COLUMNS_SQL = """
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS play_review_id TEXT;
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+"""
+
+# Indexes for the bank / date / rating / sentiment filters and GROUP BYs
+INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS reviews_bank_date_idx ON reviews (bank_id, review_date);
+CREATE INDEX IF NOT EXISTS reviews_review_date_idx ON reviews (review_date);
+CREATE INDEX IF NOT EXISTS reviews_rating_idx ON reviews (rating);
+CREATE INDEX IF NOT EXISTS reviews_bank_sentiment_idx ON reviews (bank_id, sentiment_label);
+"""
+
+WATERMARKS_SQL = """
+CREATE TABLE IF NOT EXISTS load_watermarks (
+    bank_id INTEGER PRIMARY KEY REFERENCES banks(bank_id),
+    last_review_date DATE,
+    last_loaded_at TIMESTAMP,
+    rows_upserted INTEGER
+);
+"""
+
+# Sums rather than averages are stored so days can be re-aggregated exactly
+ROLLUPS_SQL = """
+CREATE TABLE IF NOT EXISTS review_daily_rollups (
+    bank_id INTEGER REFERENCES banks(bank_id),
+    review_date DATE,
+    sentiment_label VARCHAR(20),
+    review_count INTEGER NOT NULL,
+    rating_sum BIGINT NOT NULL,
+    sentiment_score_sum FLOAT NOT NULL,
+    avg_rating FLOAT GENERATED ALWAYS AS (rating_sum::float / NULLIF(review_count, 0)) STORED,
+    avg_sentiment_score FLOAT GENERATED ALWAYS AS (sentiment_score_sum / NULLIF(review_count, 0)) STORED,
+    PRIMARY KEY (bank_id, review_date, sentiment_label)
+);
+
+CREATE OR REPLACE VIEW bank_sentiment_summary AS
+SELECT
+    b.bank_name,
+    r.sentiment_label,
+    SUM(r.review_count) AS review_count,
+    ROUND(SUM(r.review_count) * 100.0 / SUM(SUM(r.review_count)) OVER (PARTITION BY b.bank_name), 1) AS percentage,
+    SUM(r.rating_sum)::float / SUM(r.review_count) AS avg_rating,
+    SUM(r.sentiment_score_sum) / SUM(r.review_count) AS avg_sentiment_score
+FROM review_daily_rollups r
+JOIN banks b ON r.bank_id = b.bank_id
+GROUP BY b.bank_name, r.sentiment_label;
+"""
+
+DROP_SQL = """
+DROP VIEW IF EXISTS bank_sentiment_summary;
+DROP TABLE IF EXISTS review_daily_rollups;
+DROP TABLE IF EXISTS load_watermarks;
+DROP TABLE IF EXISTS reviews;
+DROP TABLE IF EXISTS banks;
+"""
+
+# Rows dated before the earliest possible review; used for "since the start"
+_NO_SINCE = date(1, 1, 1)
+
+REFRESH_DELETE_SQL = """
+DELETE FROM review_daily_rollups
+WHERE bank_id = :bank_id AND review_date >= :since
+"""
+
+REFRESH_INSERT_SQL = """
+INSERT INTO review_daily_rollups (bank_id, review_date, sentiment_label,
+                                  review_count, rating_sum, sentiment_score_sum)
+SELECT
+    bank_id,
+    review_date,
+    COALESCE(sentiment_label, 'unknown'),
+    COUNT(*),
+    COALESCE(SUM(rating), 0),
+    COALESCE(SUM(sentiment_score), 0)
+FROM reviews
+WHERE bank_id = :bank_id AND review_date >= :since
+GROUP BY bank_id, review_date, COALESCE(sentiment_label, 'unknown')
+"""
+
+
+def is_partitioned(conn):
+    """Whether `reviews` is a partitioned table"""
+    return bool(conn.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partrelid
+            WHERE c.relname = 'reviews' AND pg_table_is_visible(c.oid)
+        )
+    """)).scalar())
+
+
+def review_conflict_target(partitioned):
+    """Columns of the unique review key used by ON CONFLICT"""
+    return 'play_review_id, review_date' if partitioned else 'play_review_id'
+
+
+def create_schema(conn, partitioned=False):
+    """Create any missing tables, indexes and rollups without touching data
+
+    `partitioned` only applies when `reviews` does not exist yet; an
+    existing table keeps its layout. Returns whether `reviews` is
+    partitioned.
+    """
+    conn.execute(text(BANKS_SQL))
+    conn.execute(text(PARTITIONED_REVIEWS_SQL if partitioned else REVIEWS_SQL))
+    conn.execute(text(REVIEW_COLUMNS_SQL))
+    partitioned = is_partitioned(conn)
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS reviews_play_review_id_key "
+        f"ON reviews ({review_conflict_target(partitioned)})"
+    ))
+    conn.execute(text(INDEXES_SQL))
+    conn.execute(text(WATERMARKS_SQL))
+    conn.execute(text(ROLLUPS_SQL))
+    return partitioned
+
+
+def drop_schema(conn):
+    """Drop every table and view managed here"""
+    conn.execute(text(DROP_SQL))
+
+
+def partition_months(dates):
+    """Distinct months covered by `dates`, as (start, end) date pairs"""
+    periods = pd.to_datetime(pd.Series(dates), errors='coerce').dropna().dt.to_period('M').unique()
+    return [(p.start_time.date(), (p + 1).start_time.date()) for p in sorted(periods)]
+
+
+def ensure_partitions(conn, dates):
+    """Create the monthly `reviews` partitions needed to hold `dates`
+
+    Must run before rows for a new month are written, otherwise they land in
+    the default partition and the month's partition can no longer be added.
+    """
+    for start, end in partition_months(dates):
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS reviews_y{start.year}m{start.month:02d} "
+            f"PARTITION OF reviews FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+
+
+def refresh_rollups(conn, bank_id, since=None):
+    """Recompute a bank's daily rollups from `since` (all days when None)
+
+    Only the days on or after `since` are re-aggregated, which uses the
+    (bank_id, review_date) index and costs O(changed days) after an
+    incremental load. Undated reviews are not rolled up.
+    """
+    params = {"bank_id": bank_id, "since": since or _NO_SINCE}
+    conn.execute(text(REFRESH_DELETE_SQL), params)
+    conn.execute(text(REFRESH_INSERT_SQL), params)
@@ -0,0 +1,238 @@
+"""
+Multi-label aspect tagging (login/OTP, transfer failures, crashes, fees, ...).
+
+All aspect keywords from ASPECTS_CONFIG are compiled into one Aho-Corasick
+automaton, so each review is scanned once, character by character, no
+matter how many keywords there are. Each aspect then gets a sentiment
+from the clauses of the review that mention it ("login is easy but the
+transfer failed" is positive on login and negative on transfers).
+"""
+import bisect
+import re
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import ASPECTS_CONFIG, SENTIMENT_CONFIG
+from src.analysis.sentiment import ANALYZERS, score_texts
+from src.metrics import record_stage
+
+# Languages whose keywords may match inside a word
+SUBWORD_LANGUAGES = {'am'}
+
+_WHITESPACE = re.compile(r'\s+')
+# Sentence ends (incl. Ethiopic full stop and semicolon) and 'but' start a new clause
+_CLAUSE_BREAK = re.compile(r'[.!?;።፤]+|\bbut\b|\bhowever\b|ግን')
+
+
+def normalize(text: Any) -> str:
+    """Lowercase and collapse whitespace; keywords are matched against this form."""
+    if not isinstance(text, str):
+        return ''
+    return _WHITESPACE.sub(' ', text.lower()).strip()
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a fixed set of patterns.
+
+    The trie's failure links are folded into a full transition table (one
+    dict per state), so scanning costs one dict lookup per character and
+    reports every occurrence of every pattern, overlapping ones included.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        children: List[Dict[str, int]] = [{}]
+        own: List[List[int]] = [[]]
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("Patterns must not be empty")
+            state = 0
+            for char in pattern:
+                next_state = children[state].get(char)
+                if next_state is None:
+                    next_state = len(children)
+                    children[state][char] = next_state
+                    children.append({})
+                    own.append([])
+                state = next_state
+            own[state].append(index)
+
+        # Breadth-first, so a state's failure target is complete before the state
+        self._transitions: List[Dict[str, int]] = [{} for _ in children]
+        self._outputs: List[Tuple[int, ...]] = [()] * len(children)
+        fail = [0] * len(children)
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            self._transitions[state] = {**self._transitions[fail[state]], **children[state]} if state else dict(children[0])
+            for char, child in children[state].items():
+                fail[child] = self._transitions[fail[state]].get(char, 0) if state else 0
+                self._outputs[child] = tuple(own[child]) + self._outputs[fail[child]]
+                queue.append(child)
+
+    def __len__(self) -> int:
+        """Number of automaton states."""
+        return len(self._transitions)
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        """Yield (start, end, pattern index) for every occurrence in `text`."""
+        transitions, outputs, patterns = self._transitions, self._outputs, self.patterns
+        state = 0
+        for position, char in enumerate(text):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    yield position + 1 - len(patterns[index]), position + 1, index
+
+
+def _is_word_char(text: str, position: int) -> bool:
+    return 0 <= position < len(text) and (text[position].isalnum() or text[position] == '_')
+
+
+class AspectTagger:
+    """
+    Tags texts with every aspect whose keywords they contain.
+
+    Args:
+        keywords: aspect -> language -> keywords (default ASPECTS_CONFIG['keywords'])
+    """
+
+    def __init__(self, keywords: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        keywords = keywords if keywords is not None else ASPECTS_CONFIG['keywords']
+        self.aspects = list(keywords)
+        patterns = []
+        # Per pattern: (aspect number, must start a word, must end a word)
+        self._rules: List[Tuple[int, bool, bool]] = []
+        for aspect, (name, languages) in enumerate(keywords.items()):
+            for language, words in languages.items():
+                whole_word = language not in SUBWORD_LANGUAGES
+                for word in words:
+                    prefix = word.endswith('*')
+                    pattern = normalize(word.rstrip('*'))
+                    if pattern:
+                        patterns.append(pattern)
+                        self._rules.append((aspect, whole_word, whole_word and not prefix))
+        self.automaton = AhoCorasick(patterns)
+
+    def find(self, text: Any) -> List[Tuple[int, int, int]]:
+        """(aspect number, start, end) of each keyword match in the normalized `text`."""
+        text = normalize(text)
+        matches = []
+        for start, end, index in self.automaton.iter_matches(text):
+            aspect, starts_word, ends_word = self._rules[index]
+            if starts_word and _is_word_char(text, start - 1):
+                continue
+            if ends_word and _is_word_char(text, end):
+                continue
+            matches.append((aspect, start, end))
+        return matches
+
+    def tag(self, texts: Sequence[Any]) -> np.ndarray:
+        """Boolean (texts x aspects) matrix of the aspects each text mentions."""
+        tags = np.zeros((len(texts), len(self.aspects)), dtype=bool)
+        for row, text in enumerate(texts):
+            for aspect, _, _ in self.find(text):
+                tags[row, aspect] = True
+        return tags
+
+
+def _clauses(text: str) -> Tuple[List[int], List[str]]:
+    """Start offsets and texts of the clauses of a normalized text."""
+    starts, clauses, start = [], [], 0
+    for match in _CLAUSE_BREAK.finditer(text):
+        starts.append(start)
+        clauses.append(text[start:match.start()])
+        start = match.end()
+    starts.append(start)
+    clauses.append(text[start:])
+    return starts, clauses
+
+
+def _tag_clauses(
+    texts: Sequence[Any],
+    tagger: AspectTagger,
+    sentiment: bool
+) -> Tuple[np.ndarray, List[str], List[List[Tuple[int, int]]]]:
+    """
+    Tag `texts` and, with `sentiment`, collect the clauses mentioning an aspect.
+
+    Returns the (texts x aspects) tag matrix, the clauses to score and the
+    (row, aspect) cells each clause feeds.
+    """
+    tags = np.zeros((len(texts), len(tagger.aspects)), dtype=bool)
+    clause_texts: List[str] = []
+    clause_cells: List[List[Tuple[int, int]]] = []
+    for row, text in enumerate(texts):
+        matches = tagger.find(text)
+        for aspect, _, _ in matches:
+            tags[row, aspect] = True
+        if not matches or not sentiment:
+            continue
+        starts, clauses = _clauses(normalize(text))
+        cells: Dict[int, set] = {}
+        for aspect, match_start, _ in matches:
+            cells.setdefault(bisect.bisect_right(starts, match_start) - 1, set()).add(aspect)
+        for clause, aspects in cells.items():
+            clause_texts.append(clauses[clause])
+            clause_cells.append([(row, aspect) for aspect in aspects])
+    return tags, clause_texts, clause_cells
+
+
+def _aspect_scores(
+    shape: Tuple[int, int],
+    clause_texts: List[str],
+    clause_cells: List[List[Tuple[int, int]]]
+) -> np.ndarray:
+    """Mean clause polarity per (row, aspect) cell, NaN where no clause mentions it."""
+    scores = np.full(shape, np.nan)
+    if not clause_texts:
+        return scores
+    _, clause_scores = score_texts(clause_texts, analyzer=SENTIMENT_CONFIG['analyzer'])
+    totals = np.zeros(shape)
+    clause_counts = np.zeros(shape)
+    for score, cells in zip(clause_scores, clause_cells):
+        for row, aspect in cells:
+            totals[row, aspect] += score
+            clause_counts[row, aspect] += 1
+    mentioned = clause_counts > 0
+    scores[mentioned] = totals[mentioned] / clause_counts[mentioned]
+    return scores
+
+
+def add_aspect_columns(
+    df: pd.DataFrame,
+    tagger: Optional[AspectTagger] = None,
+    column: Optional[str] = None,
+    sentiment: Optional[bool] = None
+) -> pd.DataFrame:
+    """
+    Add aspect columns tagged from `column` (default ASPECTS_CONFIG['column']).
+
+    Adds `aspects` (the matched aspect names joined by ';') and, per aspect,
+    a boolean `aspect_<name>` column. With sentiment enabled, also
+    `aspect_<name>_score` (the mean polarity of the clauses mentioning the
+    aspect, NaN when it is not mentioned) and `aspect_<name>_label`.
+    """
+    start = time.perf_counter()
+    tagger = tagger or AspectTagger()
+    column = column or ASPECTS_CONFIG['column']
+    sentiment = ASPECTS_CONFIG['sentiment'] if sentiment is None else sentiment
+
+    tags, clause_texts, clause_cells = _tag_clauses(df[column].tolist(), tagger, sentiment)
+    scores = _aspect_scores(tags.shape, clause_texts, clause_cells)
+
+    names = np.array(tagger.aspects, dtype=object)
+    df['aspects'] = [';'.join(names[row]) for row in tags]
+    for aspect, name in enumerate(tagger.aspects):
+        df[f"aspect_{name}"] = tags[:, aspect]
+        if sentiment:
+            labels = ANALYZERS[SENTIMENT_CONFIG['analyzer']][1](np.nan_to_num(scores[:, aspect]))
+            df[f"aspect_{name}_score"] = scores[:, aspect]
+            df[f"aspect_{name}_label"] = np.where(tags[:, aspect], labels, '')
+    record_stage('aspect_tagging', len(df), time.perf_counter() - start)
+    return df
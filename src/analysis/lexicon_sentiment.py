@@ -0,0 +1,274 @@
+"""
+Vectorized lexicon sentiment using TextBlob's polarity lexicon.
+
+TextBlob walks each review word by word in Python. Here a whole batch is
+tokenized once into a sparse (reviews x vocabulary) count matrix, and the
+lexicon polarity of every review comes from one sparse matrix-vector
+product: the sum of the polarities of its lexicon words divided by how
+many there are (TextBlob's average over assessed words).
+
+TextBlob's context rules are then applied with array operations over the
+flat token stream, correcting only the reviews they touch:
+
+- intensifiers ("very good"): a lexicon adverb directly before a lexicon
+  word merges into one assessment, the word's polarity times the adverb's
+  intensity (clipped to [-1, 1])
+- negation ("not good", "no good", "not a good"): an assessment right after
+  'no'/'not'/'never' (skipping one-letter words) counts -0.5x; a negated
+  intensifier divides by its intensity instead ("not very good")
+- exclamation marks boost the preceding assessment 1.25x each
+
+Scores are labeled with the `analyze_sentiment` thresholds. Known
+differences from TextBlob: emoticons such as ":(" are not scored, words
+glued to punctuation ("good,but") are split rather than left unknown, and
+intensifiers only apply to the very next word.
+
+Usage:
+    python src/analysis/lexicon_sentiment.py --sample 5000   # agreement with TextBlob
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.analysis.sentiment import labels_for_scores, polarity
+
+# Bump when the rules change, so cached scores are recomputed
+RULES_VERSION = 2
+
+# Words, hyphenated words and exclamation marks; apostrophes split words as in TextBlob
+_TOKEN = re.compile(r"[^\W_]+(?:-[^\W_]+)*|!")
+_EXCLAMATION_BOOST = 1.25
+_NEGATION_FACTOR = -0.5
+
+
+class LexiconScorer:
+    """
+    Batch polarity scorer over a word -> (polarity, intensity) lexicon.
+
+    Token ids are assigned from a growing vocabulary; per-id lexicon vectors
+    (polarity, known, modifier, negation, ...) are extended as new words
+    appear, so repeated batches reuse earlier lookups.
+
+    Args:
+        lexicon: word -> (polarity, intensity, is_modifier); default
+            TextBlob's English lexicon
+        negations: Words that negate the next assessment
+    """
+
+    def __init__(
+        self,
+        lexicon: Optional[Dict[str, Tuple[float, float, bool]]] = None,
+        negations: Optional[Sequence[str]] = None
+    ):
+        if lexicon is None or negations is None:
+            from textblob.en import sentiment as textblob_lexicon
+            if lexicon is None:
+                lexicon = {
+                    word: (entry[None][0], entry[None][2], 'RB' in entry)
+                    for word, entry in textblob_lexicon.items()
+                }
+            if negations is None:
+                negations = textblob_lexicon.negations
+        self.lexicon = lexicon
+        self.negations = set(negations)
+        self._vocabulary: Dict[str, int] = {}
+        self._polarity = np.empty(0)
+        self._intensity = np.empty(0)
+        self._known = np.empty(0, dtype=bool)
+        self._modifier = np.empty(0, dtype=bool)
+        self._negation = np.empty(0, dtype=bool)
+        self._short = np.empty(0, dtype=bool)
+        self._exclamation = np.empty(0, dtype=bool)
+
+    def _extend_vocabulary(self, words: List[str]) -> None:
+        entries = [self.lexicon.get(word) for word in words]
+        self._polarity = np.concatenate([self._polarity, [e[0] if e else 0.0 for e in entries]])
+        self._intensity = np.concatenate([self._intensity, [e[1] if e else 1.0 for e in entries]])
+        self._known = np.concatenate([self._known, [e is not None for e in entries]])
+        self._modifier = np.concatenate([self._modifier, [bool(e and e[2]) for e in entries]])
+        self._negation = np.concatenate([self._negation, [w in self.negations for w in words]])
+        self._short = np.concatenate([self._short, [len(w) <= 1 for w in words]])
+        self._exclamation = np.concatenate([self._exclamation, [w == '!' for w in words]])
+
+    def tokenize(self, texts: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Flat token ids of all `texts` and the text number of each token."""
+        vocabulary = self._vocabulary
+        new_words: List[str] = []
+        ids: List[int] = []
+        lengths: List[int] = []
+        for text in texts:
+            tokens = _TOKEN.findall(text.lower()) if isinstance(text, str) else []
+            for token in tokens:
+                token_id = vocabulary.get(token)
+                if token_id is None:
+                    token_id = vocabulary[token] = len(vocabulary)
+                    new_words.append(token)
+                ids.append(token_id)
+            lengths.append(len(tokens))
+        if new_words:
+            self._extend_vocabulary(new_words)
+        docs = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+        return np.array(ids, dtype=np.int64), docs
+
+    def count_matrix(self, ids: np.ndarray, docs: np.ndarray, n_docs: int) -> sparse.csr_matrix:
+        """Sparse (texts x vocabulary) token counts."""
+        return sparse.csr_matrix(
+            (np.ones(len(ids)), (docs, ids)), shape=(n_docs, len(self._vocabulary))
+        )
+
+    def score(self, texts: Sequence[Any]) -> np.ndarray:
+        """Polarity in [-1, 1] of each text (0.0 for text without lexicon words)."""
+        texts = list(texts)
+        n_docs = len(texts)
+        ids, docs = self.tokenize(texts)
+        if not len(ids):
+            return np.zeros(n_docs)
+
+        # Lexicon sums and counts for all texts at once
+        counts = self.count_matrix(ids, docs, n_docs)
+        totals = counts @ self._polarity
+        assessed = counts @ self._known.astype(float)
+
+        # Assessments are runs of lexicon words joined by intensifiers
+        known = self._known[ids]
+        same_doc = np.r_[False, docs[1:] == docs[:-1]]
+        merged = known & same_doc & np.r_[False, self._modifier[ids[:-1]]]
+        head = known & ~merged
+        positions = np.flatnonzero(known)
+        if not len(positions):
+            return np.zeros(n_docs)
+        group = np.cumsum(head[positions]) - 1
+        heads = positions[head[positions]]
+        ends = positions[np.r_[head[positions][1:], True]]
+        raw = np.bincount(group, weights=self._polarity[ids[positions]])
+        size = np.bincount(group)
+
+        # Negation right before the assessment, skipping one one-letter word
+        previous = heads - 1
+        follows = same_doc[heads]
+        negated = follows.copy()
+        negated[follows] = self._negation[ids[previous[follows]]]
+        skipped = follows.copy()
+        skipped[follows] = self._short[ids[previous[follows]]] & ~known[previous[follows]] & same_doc[previous[follows]]
+        skipped[skipped] = self._negation[ids[previous[skipped] - 1]]
+        negated |= skipped
+
+        # Intensified value: the last word's polarity times the preceding intensity;
+        # a negated intensifier divides instead ("not very good" is mildly negative)
+        value = self._polarity[ids[ends]]
+        intensified = merged[ends]
+        intensity = self._intensity[ids[ends[intensified] - 1]]
+        inverted = negated[intensified] & (size[intensified] == 2)
+        intensity[inverted] = 1.0 / np.where(intensity[inverted] == 0, 1.0, intensity[inverted])
+        value[intensified] = np.clip(value[intensified] * intensity, -1.0, 1.0)
+
+        # Exclamation marks boost the last assessment before them (in the same text)
+        marks = np.flatnonzero(self._exclamation[ids])
+        if len(marks) and len(ends):
+            before = np.searchsorted(ends, marks) - 1
+            valid = before >= 0
+            valid[valid] = docs[ends[before[valid]]] == docs[marks[valid]]
+            boosts = np.bincount(before[valid], minlength=len(ends))
+            value = np.clip(value * _EXCLAMATION_BOOST ** boosts, -1.0, 1.0)
+
+        value[negated] *= _NEGATION_FACTOR
+
+        # Replace each corrected run's raw sum and count with its single assessment
+        group_docs = docs[heads]
+        totals += np.bincount(group_docs, weights=value - raw, minlength=n_docs)
+        assessed += np.bincount(group_docs, weights=1 - size, minlength=n_docs)
+        return np.divide(totals, assessed, out=np.zeros(n_docs), where=assessed > 0)
+
+
+_default_scorer: Optional[LexiconScorer] = None
+
+
+def get_scorer() -> LexiconScorer:
+    """Shared scorer over TextBlob's lexicon (built on first use)."""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = LexiconScorer()
+    return _default_scorer
+
+
+def lexicon_scores(texts: Sequence[Any]) -> np.ndarray:
+    """Vectorized polarity of `texts` with the shared scorer."""
+    return get_scorer().score(texts)
+
+
+def agreement_report(texts: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Compare the vectorized scorer with TextBlob on `texts`.
+
+    Returns:
+        Dict with rows, label_agreement (fraction of equal labels),
+        score_correlation, mean_abs_diff, the TextBlob and lexicon timings,
+        speedup and a labels confusion table (TextBlob rows x lexicon columns)
+    """
+    texts = list(texts)
+    start = time.perf_counter()
+    textblob_scores = np.array([polarity(text) for text in texts])
+    textblob_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = LexiconScorer().score(texts)
+    lexicon_seconds = time.perf_counter() - start
+
+    textblob_labels = labels_for_scores(textblob_scores)
+    labels = labels_for_scores(scores)
+    varied = len(texts) > 1 and textblob_scores.std() > 0 and scores.std() > 0
+    return {
+        'rows': len(texts),
+        'label_agreement': float(np.mean(np.array(textblob_labels) == np.array(labels))) if texts else 1.0,
+        'score_correlation': float(np.corrcoef(textblob_scores, scores)[0, 1]) if varied else float('nan'),
+        'mean_abs_diff': float(np.abs(textblob_scores - scores).mean()) if texts else 0.0,
+        'textblob_seconds': textblob_seconds,
+        'lexicon_seconds': lexicon_seconds,
+        'speedup': textblob_seconds / lexicon_seconds if lexicon_seconds > 0 else float('inf'),
+        'confusion': pd.crosstab(pd.Series(textblob_labels, name='textblob'), pd.Series(labels, name='lexicon')),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agreement of the vectorized lexicon scorer with TextBlob")
+    parser.add_argument('files', nargs='*', help="review files (default: the processed files, "
+                                                 "or synthetic reviews when there are none)")
+    parser.add_argument('--sample', type=int, default=5000, help="reviews compared (0 = all)")
+    args = parser.parse_args()
+
+    from src.storage import processed_files, read_reviews
+    paths = args.files or processed_files()
+    if paths:
+        texts = pd.concat([read_reviews(path, columns=['review'])['review'] for path in paths], ignore_index=True)
+        source = f"{len(paths)} files"
+    else:
+        from src.utils.synthetic_reviews import generate_reviews
+        texts = pd.Series([r['content'] for r in generate_reviews(args.sample or 5000)])
+        source = "synthetic reviews"
+    if args.sample and len(texts) > args.sample:
+        texts = texts.sample(args.sample, random_state=42)
+
+    report = agreement_report(texts.tolist())
+    print(f"📊 Lexicon scorer vs TextBlob on {report['rows']} reviews ({source})")
+    print(f"   Label agreement:   {report['label_agreement']:.1%}")
+    print(f"   Score correlation: {report['score_correlation']:.3f}")
+    print(f"   Mean |difference|: {report['mean_abs_diff']:.4f}")
+    print(f"   TextBlob {report['textblob_seconds']:.2f}s, lexicon {report['lexicon_seconds']:.3f}s "
+          f"({report['speedup']:.0f}x faster)")
+    print(report['confusion'].to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,384 @@
+"""
+Local inverted index for searching review text.
+
+Each term maps to the sorted ids of the reviews containing it, so a query
+only touches the posting lists of its terms instead of scanning every
+review. Queries combine terms (AND), `OR`, negation (`-term` or
+`NOT term`) and "quoted phrases", and can be filtered by bank, rating, date
+range and sentiment label. New reviews are added incrementally (already
+indexed review ids are skipped) and the index is saved as one compressed,
+delta-encoded .npz file.
+
+Usage:
+    python src/analysis/search_index.py build
+    python src/analysis/search_index.py search "otp OR \"verification code\" -email" --bank CBE --rating 1-2
+"""
+import argparse
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.settings import SEARCH_CONFIG
+from src.storage import iter_review_chunks, processed_files, review_keys
+
+FORMAT_VERSION = 1
+SENTIMENT_LABELS = ['positive', 'neutral', 'negative']
+INDEX_COLUMNS = ['review_id', 'review', 'rating', 'date', 'bank', 'sentiment_label']
+
+_TOKEN = re.compile(r'\w+')
+_QUERY_TOKEN = re.compile(r'(-?)"([^"]*)"|(\S+)')
+_NO_DATE = np.iinfo(np.int32).min
+
+
+def tokenize(text) -> List[str]:
+    """Lowercased word tokens (letters and digits of any script, incl. Amharic)."""
+    if not isinstance(text, str):
+        return []
+    return _TOKEN.findall(text.lower())
+
+
+def _pack_strings(strings: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    raw = data.tobytes()
+    return [raw[start:end].decode('utf-8') for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def _parse_day(value) -> int:
+    """Days since 1970-01-01 (for date filters)."""
+    return int(pd.Timestamp(value).to_datetime64().astype('datetime64[D]').astype(np.int64))
+
+
+class SearchIndex:
+    """
+    Inverted index over review text with per-review filter columns.
+
+    Posting lists are kept as `array('I')` of review numbers, which stay
+    sorted because reviews are only ever appended. Bank and sentiment are
+    stored as small integer codes, rating as a byte and date as a day number.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._texts: List[str] = []
+        self._banks: List[str] = []
+        self._bank_codes = array('H')
+        self._ratings = array('b')
+        self._days = array('i')
+        self._sentiments = array('b')
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def _bank_code(self, bank: str) -> int:
+        if bank not in self._banks:
+            self._banks.append(bank)
+        return self._banks.index(bank)
+
+    def add(self, df: pd.DataFrame, occurrences: Optional[Dict[str, int]] = None) -> int:
+        """
+        Index the reviews in `df` (columns as in the processed files; only
+        `review` is required). Reviews already indexed, by `review_id` or by
+        content when there is no id (see `review_keys`), are skipped.
+        Returns the number of reviews added.
+        """
+        n = len(df)
+
+        def column(name, default):
+            return df[name] if name in df.columns else pd.Series(default, index=df.index)
+
+        ids = review_keys(df, occurrences)
+        texts = column('review', '').fillna('').astype(str).tolist()
+        banks = column('bank', '').fillna('').astype(str).tolist()
+        ratings = pd.to_numeric(column('rating', 0), errors='coerce').fillna(0).astype(np.int8).tolist()
+        dates = pd.to_datetime(column('date', None), errors='coerce')
+        days = np.where(
+            dates.isna(), _NO_DATE, dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+        ).tolist() if n else []
+        sentiments = column('sentiment_label', '').fillna('').astype(str).str.lower()
+        sentiment_codes = sentiments.map({label: i for i, label in enumerate(SENTIMENT_LABELS)}).fillna(-1)
+        sentiment_codes = sentiment_codes.astype(np.int8).tolist()
+
+        added = 0
+        for i in range(n):
+            review_id = ids[i]
+            if review_id in self._positions:
+                continue
+            position = len(self._ids)
+            self._positions[review_id] = position
+            self._ids.append(review_id)
+            self._texts.append(texts[i])
+            self._bank_codes.append(self._bank_code(banks[i]))
+            self._ratings.append(ratings[i])
+            self._days.append(days[i])
+            self._sentiments.append(sentiment_codes[i])
+            for term in set(tokenize(texts[i])):
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = array('I')
+                postings.append(position)
+            added += 1
+        return added
+
+    def postings(self, term: str) -> np.ndarray:
+        """Sorted review numbers containing `term`."""
+        postings = self._postings.get(term.lower())
+        if postings is None:
+            return np.empty(0, dtype=np.uint32)
+        return np.frombuffer(postings, dtype=np.uint32).copy()
+
+    def _phrase(self, words: List[str]) -> np.ndarray:
+        """Reviews containing every word, then checked for the words in sequence."""
+        if not words:
+            return np.arange(len(self), dtype=np.uint32)
+        matches = self.postings(words[0])
+        for word in words[1:]:
+            matches = np.intersect1d(matches, self.postings(word), assume_unique=True)
+        if len(words) == 1:
+            return matches
+        # The words in sequence with only non-word characters between them
+        phrase = re.compile(r'(?<!\w)' + r'\W+'.join(map(re.escape, words)) + r'(?!\w)')
+        keep = [doc for doc in matches.tolist() if phrase.search(self._texts[doc].lower())]
+        return np.array(keep, dtype=np.uint32)
+
+    def match(self, query: str) -> np.ndarray:
+        """
+        Review numbers matching `query`, in index order.
+
+        Space-separated clauses must all match; `OR` separates alternatives;
+        `-clause` or `NOT clause` excludes; "double quotes" match a phrase.
+        """
+        groups: List[List[Tuple[bool, List[str]]]] = [[]]
+        negate_next = False
+        for minus, phrase, word in _QUERY_TOKEN.findall(query):
+            if word == 'OR':
+                groups.append([])
+                continue
+            if word == 'AND':
+                continue
+            if word == 'NOT':
+                negate_next = True
+                continue
+            negate = negate_next or bool(minus)
+            if word.startswith('-') and len(word) > 1:
+                negate, word = True, word[1:]
+            groups[-1].append((negate, tokenize(phrase if phrase or not word else word)))
+            negate_next = False
+
+        result = np.empty(0, dtype=np.uint32)
+        for clauses in groups:
+            if not clauses:
+                continue
+            positive = [words for negate, words in clauses if not negate]
+            # Only-negative groups start from every review
+            matches = self._phrase(positive[0]) if positive else np.arange(len(self), dtype=np.uint32)
+            for words in positive[1:]:
+                matches = np.intersect1d(matches, self._phrase(words), assume_unique=True)
+            for words in (words for negate, words in clauses if negate):
+                matches = np.setdiff1d(matches, self._phrase(words), assume_unique=True)
+            result = np.union1d(result, matches)
+        return result.astype(np.uint32)
+
+    def search(
+        self,
+        query: str = '',
+        bank: Optional[Union[str, Iterable[str]]] = None,
+        rating: Optional[Union[int, Tuple[int, int]]] = None,
+        since=None,
+        until=None,
+        sentiment: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Reviews matching `query` and the filters, newest first.
+
+        Args:
+            query: Query string (see `match`); empty matches every review
+            bank: Bank name or names
+            rating: A rating or an inclusive (low, high) range
+            since: First review date to include
+            until: Last review date to include
+            sentiment: 'positive', 'neutral' or 'negative'
+            limit: Maximum number of results
+
+        Returns:
+            DataFrame with review_id, bank, rating, date, sentiment_label and review
+        """
+        docs = self.match(query) if query.strip() else np.arange(len(self), dtype=np.uint32)
+        if len(docs) and bank is not None:
+            banks = [bank] if isinstance(bank, str) else list(bank)
+            codes = [i for i, name in enumerate(self._banks) if name.upper() in {b.upper() for b in banks}]
+            docs = docs[np.isin(np.frombuffer(self._bank_codes, dtype=np.uint16)[docs], codes)]
+        if len(docs) and rating is not None:
+            low, high = rating if isinstance(rating, tuple) else (rating, rating)
+            ratings = np.frombuffer(self._ratings, dtype=np.int8)[docs]
+            docs = docs[(ratings >= low) & (ratings <= high)]
+        if len(docs) and (since is not None or until is not None):
+            days = np.frombuffer(self._days, dtype=np.int32)[docs]
+            keep = days != _NO_DATE
+            if since is not None:
+                keep &= days >= _parse_day(since)
+            if until is not None:
+                keep &= days <= _parse_day(until)
+            docs = docs[keep]
+        if len(docs) and sentiment is not None:
+            code = SENTIMENT_LABELS.index(sentiment.lower())
+            docs = docs[np.frombuffer(self._sentiments, dtype=np.int8)[docs] == code]
+
+        # Newest first; reviews without a date last
+        days = np.frombuffer(self._days, dtype=np.int32)[docs]
+        docs = docs[np.argsort(-days.astype(np.int64), kind='stable')]
+        if limit is not None:
+            docs = docs[:limit]
+
+        doc_list = docs.tolist()
+        day_values = np.frombuffer(self._days, dtype=np.int32)[docs]
+        dates = pd.to_datetime(np.where(day_values == _NO_DATE, np.datetime64('NaT'),
+                                        day_values.astype('datetime64[D]')))
+        sentiments = np.frombuffer(self._sentiments, dtype=np.int8)[docs].tolist()
+        return pd.DataFrame({
+            'review_id': [self._ids[d] for d in doc_list],
+            'bank': [self._banks[self._bank_codes[d]] for d in doc_list],
+            'rating': np.frombuffer(self._ratings, dtype=np.int8)[docs].astype(int),
+            'date': dates.date if len(docs) else [],
+            'sentiment_label': [SENTIMENT_LABELS[s] if s >= 0 else '' for s in sentiments],
+            'review': [self._texts[d] for d in doc_list],
+        })
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        Write the index to `path` (default SEARCH_CONFIG['index_path']).
+
+        Posting lists are delta-encoded and the whole file is zlib-compressed;
+        strings are stored as UTF-8 blobs with offsets, so no pickling is needed.
+        """
+        path = path or SEARCH_CONFIG['index_path']
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        terms = list(self._postings)
+        lists = [np.frombuffer(self._postings[t], dtype=np.uint32) for t in terms]
+        counts = np.array([len(p) for p in lists], dtype=np.int64)
+        deltas = np.concatenate([np.diff(p, prepend=np.uint32(0)) for p in lists]) if lists else np.empty(0)
+        arrays = {'version': np.array([FORMAT_VERSION]), 'posting_counts': counts,
+                  'postings': deltas.astype(np.uint32)}
+        for name, strings in (('terms', terms), ('ids', self._ids), ('texts', self._texts), ('banks', self._banks)):
+            arrays[name], arrays[f"{name}_offsets"] = _pack_strings(strings)
+        arrays['bank_codes'] = np.frombuffer(self._bank_codes, dtype=np.uint16)
+        arrays['ratings'] = np.frombuffer(self._ratings, dtype=np.int8)
+        arrays['days'] = np.frombuffer(self._days, dtype=np.int32)
+        arrays['sentiments'] = np.frombuffer(self._sentiments, dtype=np.int8)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'SearchIndex':
+        """Read an index written by `save`."""
+        path = path or SEARCH_CONFIG['index_path']
+        index = cls()
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version'][0]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported search index version in {path}")
+            strings = {
+                name: _unpack_strings(data[name], data[f"{name}_offsets"])
+                for name in ('terms', 'ids', 'texts', 'banks')
+            }
+            postings = data['postings']
+            ends = np.cumsum(data['posting_counts'])
+            starts = ends - data['posting_counts']
+            for term, start, end in zip(strings['terms'], starts.tolist(), ends.tolist()):
+                index._postings[term] = array('I', np.cumsum(postings[start:end], dtype=np.uint32).tobytes())
+            index._ids = strings['ids']
+            index._texts = strings['texts']
+            index._banks = strings['banks']
+            index._positions = {review_id: i for i, review_id in enumerate(index._ids)}
+            index._bank_codes = array('H', data['bank_codes'].tobytes())
+            index._ratings = array('b', data['ratings'].tobytes())
+            index._days = array('i', data['days'].tobytes())
+            index._sentiments = array('b', data['sentiments'].tobytes())
+        return index
+
+
+def load_or_create(path: Optional[str] = None) -> SearchIndex:
+    """The saved index at `path`, or a new empty one."""
+    path = path or SEARCH_CONFIG['index_path']
+    return SearchIndex.load(path) if os.path.exists(path) else SearchIndex()
+
+
+def index_files(index: SearchIndex, paths: Iterable[Union[str, Path]], chunksize: Optional[int] = None) -> int:
+    """Add the reviews of each CSV/Parquet file to `index`; returns the number added."""
+    chunksize = chunksize or SEARCH_CONFIG['chunksize']
+    added = 0
+    for path in paths:
+        occurrences: Dict[str, int] = {}
+        for chunk in iter_review_chunks(path, chunksize, INDEX_COLUMNS):
+            added += index.add(chunk, occurrences)
+    return added
+
+
+def _rating_range(value: str) -> Tuple[int, int]:
+    low, _, high = value.partition('-')
+    return int(low), int(high or low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the local review search index")
+    parser.add_argument('--index', default=SEARCH_CONFIG['index_path'], help="index file")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="add new reviews from the processed files (or FILES)")
+    build.add_argument('files', nargs='*')
+    search = commands.add_parser('search', help="query the index")
+    search.add_argument('query')
+    search.add_argument('--bank', action='append')
+    search.add_argument('--rating', type=_rating_range, help="rating or range, e.g. 1-2")
+    search.add_argument('--since')
+    search.add_argument('--until')
+    search.add_argument('--sentiment', choices=SENTIMENT_LABELS)
+    search.add_argument('--limit', type=int, default=SEARCH_CONFIG['default_limit'])
+    args = parser.parse_args()
+
+    index = load_or_create(args.index)
+    if args.command == 'build':
+        paths = args.files or processed_files()
+        added = index_files(index, paths)
+        index.save(args.index)
+        print(f"🔎 Indexed {added} new reviews from {len(paths)} files "
+              f"({len(index)} reviews, {index.vocabulary_size} terms) -> {args.index}")
+        return
+
+    results = index.search(args.query, bank=args.bank, rating=args.rating, since=args.since,
+                           until=args.until, sentiment=args.sentiment)
+    print(f"🔎 {len(results)} reviews match {args.query!r}")
+    for row in results.head(args.limit).itertuples():
+        print(f"   [{row.bank} ⭐{row.rating} {row.date} {row.sentiment_label}] {row.review[:120]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from textblob import TextBlob
+
+from config.settings import SENTIMENT_CONFIG
+from src.analysis.sentiment_cache import SentimentCache, get_sentiment_cache
+from src.metrics import SENTIMENT_ROWS_PER_SECOND, record_stage
+
+
+def label_for_score(score: float) -> str:
+    """Map a polarity score to positive/negative/neutral."""
+    if score > SENTIMENT_CONFIG['positive_threshold']:
+        return 'positive'
+    if score < SENTIMENT_CONFIG['negative_threshold']:
+        return 'negative'
+    return 'neutral'
+
+
+def labels_for_scores(scores: Sequence[float]) -> List[str]:
+    """Vectorized `label_for_score`."""
+    scores = np.asarray(scores, dtype=float)
+    return np.select(
+        [scores > SENTIMENT_CONFIG['positive_threshold'], scores < SENTIMENT_CONFIG['negative_threshold']],
+        ['positive', 'negative'],
+        default='neutral'
+    ).tolist()
+
+
+def _vader_labels(scores: Sequence[float]) -> List[str]:
+    """VADER compound thresholds, as used in the CBE sentiment notebook."""
+    scores = np.asarray(scores, dtype=float)
+    return np.select([scores >= 0.05, scores <= -0.05], ['positive', 'negative'], default='neutral').tolist()
+
+
+def polarity(text) -> float:
+    """TextBlob polarity, 0.0 for missing or blank text."""
+    if pd.isna(text) or str(text).strip() == '':
+        return 0.0
+    return TextBlob(str(text)).sentiment.polarity
+
+
+_vader_analyzer = None
+
+
+def vader_compound(text) -> float:
+    """VADER compound score, 0.0 for missing or blank text."""
+    global _vader_analyzer
+    if pd.isna(text) or str(text).strip() == '':
+        return 0.0
+    if _vader_analyzer is None:
+        try:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        except ImportError as e:
+            raise ImportError("The 'vader' analyzer needs the vaderSentiment package: pip install vaderSentiment") from e
+        _vader_analyzer = SentimentIntensityAnalyzer()
+    return _vader_analyzer.polarity_scores(str(text))['compound']
+
+
+def _package_version(package: str) -> str:
+    """Installed version of `package`, used to invalidate cached scores on upgrades."""
+    try:
+        from importlib.metadata import version
+        return version(package)
+    except Exception:
+        return 'unknown'
+
+
+def lexicon_polarity(text) -> float:
+    """Polarity from the vectorized TextBlob-lexicon scorer (see lexicon_sentiment.py)."""
+    from src.analysis.lexicon_sentiment import lexicon_scores
+    return float(lexicon_scores([text])[0])
+
+
+def _lexicon_version() -> str:
+    from src.analysis.lexicon_sentiment import RULES_VERSION
+    return f"{_package_version('textblob')}+rules{RULES_VERSION}"
+
+
+# name -> (score function, vectorized labeler, version function)
+ANALYZERS: Dict[str, Tuple[Callable[[Any], float], Callable[[Sequence[float]], List[str]], Callable[[], str]]] = {
+    'textblob': (polarity, labels_for_scores, partial(_package_version, 'textblob')),
+    'vader': (vader_compound, _vader_labels, partial(_package_version, 'vaderSentiment')),
+    'lexicon': (lexicon_polarity, labels_for_scores, _lexicon_version),
+}
+
+
+def _get_analyzer(name: str):
+    if name not in ANALYZERS:
+        raise ValueError(f"Unknown sentiment analyzer: {name} (choose from {', '.join(ANALYZERS)})")
+    return ANALYZERS[name]
+
+
+def analyze_sentiment(text) -> Tuple[str, float]:
+    """Analyze sentiment using TextBlob and return label and score."""
+    score = polarity(text)
+    return label_for_score(score), score
+
+
+def _score_chunk(texts: List, analyzer: str = 'textblob') -> List[float]:
+    score = _get_analyzer(analyzer)[0]
+    return [score(text) for text in texts]
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def score_texts(
+    texts: Iterable,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    analyzer: str = 'textblob'
+) -> Tuple[List[str], List[float]]:
+    """
+    Score many texts, spreading chunks of them across a process pool.
+
+    Args:
+        texts: Review texts (missing values score 0.0)
+        workers: Number of processes (defaults to SENTIMENT_CONFIG / CPU count)
+        chunk_size: Texts per task; by default each worker gets about four
+            chunks so stragglers even out
+        analyzer: Name of the analyzer in ANALYZERS
+
+    Returns:
+        (labels, scores) in input order
+    """
+    texts = list(texts)
+    label = _get_analyzer(analyzer)[1]
+    if analyzer == 'lexicon':
+        # Scores the whole batch with sparse matrix products, no process pool needed
+        from src.analysis.lexicon_sentiment import lexicon_scores
+        scores = lexicon_scores(texts).tolist()
+        return label(scores), scores
+    workers = workers or SENTIMENT_CONFIG['workers'] or os.cpu_count() or 1
+    if workers == 1 or len(texts) < SENTIMENT_CONFIG['min_parallel_rows']:
+        scores = _score_chunk(texts, analyzer)
+        return label(scores), scores
+
+    chunk_size = chunk_size or SENTIMENT_CONFIG['chunk_size'] or max(1, math.ceil(len(texts) / (workers * 4)))
+    scores = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_scores in executor.map(partial(_score_chunk, analyzer=analyzer), _chunks(texts, chunk_size)):
+            scores.extend(chunk_scores)
+    return label(scores), scores
+
+
+def score_texts_cached(
+    texts: Iterable,
+    analyzer: Optional[str] = None,
+    cache: Optional[SentimentCache] = None,
+    use_cache: bool = True,
+    **kwargs
+) -> Tuple[List[str], List[float]]:
+    """
+    Like `score_texts`, but only texts missing from the sentiment cache are scored.
+
+    Results are cached per (text hash, analyzer, analyzer version), so
+    rescoring an unchanged file is mostly cache hits, and switching between
+    analyzers keeps the other analyzer's results. Only the cached scores are
+    used; labels always come from the current thresholds. Without a `cache`
+    the configured one is used; pass `use_cache=False` to score without any.
+    """
+    texts = list(texts)
+    analyzer = analyzer or SENTIMENT_CONFIG['analyzer']
+    version = _get_analyzer(analyzer)[2]()
+    if use_cache and cache is None:
+        cache = get_sentiment_cache()
+    if not use_cache or cache is None:
+        return score_texts(texts, analyzer=analyzer, **kwargs)
+
+    keys = ['' if pd.isna(t) else str(t) for t in texts]
+    unique = list(dict.fromkeys(keys))
+    results = cache.get_many(unique, analyzer, version)
+    misses = [t for t in unique if t not in results]
+    if misses:
+        labels, scores = score_texts(misses, analyzer=analyzer, **kwargs)
+        new_results = list(zip(misses, labels, scores))
+        cache.set_many(new_results, analyzer, version)
+        results.update({text: (label, score) for text, label, score in new_results})
+
+    # Labels are re-derived from the scores, so threshold changes apply to cached results
+    scores = [results[k][1] for k in keys]
+    return _get_analyzer(analyzer)[1](scores), scores
+
+
+def add_sentiment_columns(df: pd.DataFrame, text_column: str = 'review', **kwargs) -> pd.DataFrame:
+    """Add `sentiment_label` and `sentiment_score` columns scored from `text_column` (cached)."""
+    start = time.perf_counter()
+    labels, scores = score_texts_cached(df[text_column], **kwargs)
+    seconds = time.perf_counter() - start
+    record_stage('sentiment_scoring', len(df), seconds)
+    if seconds > 0:
+        analyzer = kwargs.get('analyzer') or SENTIMENT_CONFIG['analyzer']
+        SENTIMENT_ROWS_PER_SECOND.labels(analyzer).set(len(df) / seconds)
+    df['sentiment_label'] = labels
+    df['sentiment_score'] = scores
+    return df
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from config.settings import SENTIMENT_CONFIG
+
+
+class SentimentCache:
+    """
+    Size-bounded on-disk cache of sentiment scores.
+
+    Entries are keyed by (text hash, analyzer name, analyzer version), so
+    results from different analyzers live side by side and upgrading an
+    analyzer invalidates only its own entries. When the cache grows past
+    `max_entries`, the least recently used entries are evicted. Stored
+    labels reflect the thresholds at scoring time; `score_texts_cached`
+    relabels from the scores.
+    """
+
+    def __init__(self, path: str, max_entries: int = 500_000):
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS sentiment ('
+            'text_hash TEXT, analyzer TEXT, version TEXT, label TEXT, score REAL, last_used REAL, '
+            'PRIMARY KEY (text_hash, analyzer, version))'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS sentiment_last_used ON sentiment (last_used)')
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(str(text).encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: Iterable[str], analyzer: str, version: str) -> Dict[str, Tuple[str, float]]:
+        """Look up several texts. Returns {text: (label, score)} for the ones found."""
+        hashes = {self.text_hash(t): t for t in texts}
+        found = {}
+        with self._lock:
+            hash_list = list(hashes)
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(hash_list), 500):
+                chunk = hash_list[i:i + 500]
+                rows = self._conn.execute(
+                    'SELECT text_hash, label, score FROM sentiment WHERE analyzer = ? AND version = ? '
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    [analyzer, version, *chunk]
+                ).fetchall()
+                for text_hash, label, score in rows:
+                    found[hashes[text_hash]] = (label, score)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    'UPDATE sentiment SET last_used = ? WHERE text_hash = ? AND analyzer = ? AND version = ?',
+                    [(now, self.text_hash(t), analyzer, version) for t in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def set_many(self, results: Iterable[Tuple[str, str, float]], analyzer: str, version: str) -> None:
+        """Store (text, label, score) results and evict the least recently used overflow."""
+        now = time.time()
+        rows = [(self.text_hash(t), analyzer, version, label, score, now) for t, label, score in results]
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?, ?, ?)', rows)
+            overflow = self._conn.execute('SELECT COUNT(*) FROM sentiment').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    'DELETE FROM sentiment WHERE rowid IN '
+                    '(SELECT rowid FROM sentiment ORDER BY last_used ASC LIMIT ?)',
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss/eviction counts and the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM sentiment').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_default_cache: Optional[SentimentCache] = None
+
+
+def get_sentiment_cache() -> Optional[SentimentCache]:
+    """Return the cache configured in SENTIMENT_CONFIG, or None when disabled."""
+    global _default_cache
+    config = SENTIMENT_CONFIG['cache']
+    if not config['enabled']:
+        return None
+    if _default_cache is None:
+        _default_cache = SentimentCache(config['path'], config['max_entries'])
+    return _default_cache
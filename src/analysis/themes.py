@@ -0,0 +1,416 @@
+"""
+Incremental keyword and theme extraction over review text.
+
+Reviews are tokenized into word n-grams (stop words and short words
+dropped) and counted into sparse document-term matrices, batch by batch.
+Only the vocabulary and, per bank, the number of reviews, the term counts
+and the document frequencies are kept, so new batches update the model
+without refitting and reports are computed from the stored counts:
+
+- top keywords per bank: term frequency in the bank x inverse document
+  frequency over all reviews (TF-IDF with the bank as the document)
+- distinctive terms of one bank against another (or the rest): log-odds
+  ratios with an informative Dirichlet prior (Monroe et al., 2008)
+
+The model is saved as one compressed .npz file. Already counted reviews
+are remembered (as 64-bit hashes of their id, or of their content when
+there is no id), so re-running an update over the same processed files
+only counts new reviews.
+
+Usage:
+    python src/analysis/themes.py update
+    python src/analysis/themes.py keywords --bank CBE --ngram 2
+    python src/analysis/themes.py compare CBE BOA
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, CountVectorizer
+from sklearn.preprocessing import normalize
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.settings import THEMES_CONFIG
+from src.storage import iter_review_chunks, processed_files, review_keys
+
+FORMAT_VERSION = 1
+THEME_COLUMNS = ['review_id', 'review', 'rating', 'date', 'bank']
+
+
+class ThemeModel:
+    """
+    Vocabulary plus per-bank term counts and document frequencies.
+
+    The vocabulary only grows: a term gets the next column the first time it
+    is seen and keeps it. Per-bank counts are dense int64 arrays over the
+    vocabulary (grown geometrically); batches are counted as scipy CSR
+    matrices. Frequency cut-offs such as `min_df` are applied when reporting,
+    not when counting, because a rare term may become common later.
+
+    Args:
+        ngram_range: Smallest and largest word n-gram counted
+        min_token_length: Shortest word kept
+        extra_stop_words: Words ignored in addition to the English stop words
+    """
+
+    def __init__(
+        self,
+        ngram_range: Optional[Tuple[int, int]] = None,
+        min_token_length: Optional[int] = None,
+        extra_stop_words: Optional[Iterable[str]] = None
+    ):
+        self.ngram_range = tuple(ngram_range or THEMES_CONFIG['ngram_range'])
+        self.min_token_length = min_token_length or THEMES_CONFIG['min_token_length']
+        self.extra_stop_words = sorted(
+            extra_stop_words if extra_stop_words is not None else THEMES_CONFIG['extra_stop_words']
+        )
+        self._analyze = CountVectorizer(
+            token_pattern=r'(?u)\b[^\W\d_]{%d,}\b' % self.min_token_length,
+            stop_words=sorted(ENGLISH_STOP_WORDS | set(self.extra_stop_words)),
+            ngram_range=self.ngram_range,
+        ).build_analyzer()
+
+        self._vocabulary: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._term_ngrams = array('B')
+        self._banks: List[str] = []
+        self._reviews: List[int] = []
+        self._term_counts: List[np.ndarray] = []
+        self._doc_counts: List[np.ndarray] = []
+        self._capacity = 0
+        self._seen: set = set()
+
+    def __len__(self) -> int:
+        """Number of reviews counted."""
+        return sum(self._reviews)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._terms)
+
+    @property
+    def banks(self) -> List[str]:
+        return list(self._banks)
+
+    def settings(self) -> Dict[str, Any]:
+        """Tokenizer settings; a saved model keeps the ones it was built with."""
+        return {'ngram_range': list(self.ngram_range), 'min_token_length': self.min_token_length,
+                'extra_stop_words': self.extra_stop_words}
+
+    def _bank_index(self, bank: str, create: bool = False) -> int:
+        for i, name in enumerate(self._banks):
+            if name.upper() == bank.upper():
+                return i
+        if not create:
+            raise KeyError(f"No reviews counted for bank {bank!r}")
+        self._banks.append(bank)
+        self._reviews.append(0)
+        self._term_counts.append(np.zeros(self._capacity, dtype=np.int64))
+        self._doc_counts.append(np.zeros(self._capacity, dtype=np.int64))
+        return len(self._banks) - 1
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._capacity:
+            return
+        self._capacity = max(size, 2 * self._capacity, 1024)
+        for counts in (self._term_counts, self._doc_counts):
+            for i, values in enumerate(counts):
+                grown = np.zeros(self._capacity, dtype=np.int64)
+                grown[:len(values)] = values
+                counts[i] = grown
+
+    def count_matrix(self, texts: Sequence[Any], grow: bool = False) -> sparse.csr_matrix:
+        """
+        Sparse (reviews x terms) n-gram counts of `texts`. Terms outside the
+        vocabulary are dropped, or added to it when `grow` is True.
+        """
+        vocabulary = self._vocabulary
+        indices = array('i')
+        indptr = array('q', [0])
+        for text in texts:
+            for term in self._analyze(text if isinstance(text, str) else ''):
+                column = vocabulary.get(term)
+                if column is None:
+                    if not grow:
+                        continue
+                    column = vocabulary[term] = len(self._terms)
+                    self._terms.append(term)
+                    self._term_ngrams.append(term.count(' ') + 1)
+                indices.append(column)
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int64), np.frombuffer(indices, dtype=np.int32),
+             np.frombuffer(indptr, dtype=np.int64)),
+            shape=(len(texts), len(self._terms))
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    def partial_fit(self, texts: Sequence[Any], bank: str, ids: Optional[Sequence[Any]] = None) -> int:
+        """
+        Count a batch of `bank`'s reviews. Reviews whose id was counted
+        before are skipped. Returns the number of reviews counted.
+        """
+        texts = list(texts)
+        if ids is not None:
+            hashes = pd.util.hash_array(np.asarray(ids, dtype=object).astype(str)).tolist()
+            keep = []
+            for i, value in enumerate(hashes):
+                if value not in self._seen:
+                    self._seen.add(value)
+                    keep.append(i)
+            texts = [texts[i] for i in keep]
+        if not texts:
+            return 0
+
+        matrix = self.count_matrix(texts, grow=True)
+        size = matrix.shape[1]
+        self._reserve(size)
+        position = self._bank_index(bank, create=True)
+        self._reviews[position] += len(texts)
+        self._term_counts[position][:size] += np.asarray(matrix.sum(axis=0)).ravel()
+        self._doc_counts[position][:size] += np.bincount(matrix.indices, minlength=size)
+        return len(texts)
+
+    def update(self, df: pd.DataFrame, occurrences: Optional[Dict[str, int]] = None) -> int:
+        """
+        Count the reviews in `df` (`review` and `bank` columns). Reviews are
+        identified by `review_id`, or by content when there is none (see
+        `review_keys`; pass the same `occurrences` for every chunk of a file).
+        """
+        df = df.assign(_key=review_keys(df, occurrences))
+        counted = 0
+        for bank, group in df.groupby(df['bank'].fillna('').astype(str), sort=False):
+            counted += self.partial_fit(group['review'].tolist(), bank, group['_key'].tolist())
+        return counted
+
+    def _counts(self, counts: List[np.ndarray], bank: Optional[str]) -> np.ndarray:
+        size = len(self._terms)
+        if bank is None:
+            return sum((values[:size] for values in counts), np.zeros(size, dtype=np.int64))
+        return counts[self._bank_index(bank)][:size]
+
+    def idf(self) -> np.ndarray:
+        """Smoothed inverse document frequency of each term over all reviews."""
+        document_frequency = self._counts(self._doc_counts, None)
+        return np.log((1 + len(self)) / (1 + document_frequency)) + 1
+
+    def transform(self, texts: Sequence[Any]) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF rows for `texts` using the counted vocabulary and IDF."""
+        return normalize(self.count_matrix(texts).multiply(self.idf()).tocsr())
+
+    def bank_matrix(self) -> sparse.csr_matrix:
+        """Sparse (banks x terms) TF-IDF matrix, each bank's reviews pooled as one document."""
+        term_counts = sparse.csr_matrix(np.vstack([self._counts(self._term_counts, bank) for bank in self._banks]))
+        return normalize(term_counts.multiply(self.idf()).tocsr(), norm='l1')
+
+    def _report_mask(self, document_frequency: np.ndarray, min_df: Optional[int], ngram: Optional[int]) -> np.ndarray:
+        min_df = THEMES_CONFIG['min_df'] if min_df is None else min_df
+        mask = document_frequency >= max(min_df, 1)
+        if ngram is not None:
+            mask &= np.frombuffer(self._term_ngrams, dtype=np.uint8) == ngram
+        return mask
+
+    def top_keywords(
+        self,
+        bank: Optional[str] = None,
+        n: Optional[int] = None,
+        min_df: Optional[int] = None,
+        ngram: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Highest TF-IDF terms of `bank` (or of all reviews).
+
+        Args:
+            bank: Bank name; None pools every bank
+            n: Number of terms (default THEMES_CONFIG['top_n'])
+            min_df: Minimum number of the bank's reviews containing a term
+            ngram: Only report n-grams of this length (e.g. 2 for phrases)
+
+        Returns:
+            DataFrame with term, reviews (containing it), count and score
+        """
+        n = n or THEMES_CONFIG['top_n']
+        term_counts = self._counts(self._term_counts, bank)
+        doc_counts = self._counts(self._doc_counts, bank)
+        scores = term_counts / max(term_counts.sum(), 1) * self.idf()
+        candidates = np.flatnonzero(self._report_mask(doc_counts, min_df, ngram))
+        top = candidates[np.argsort(-scores[candidates], kind='stable')[:n]]
+        return pd.DataFrame({
+            'term': [self._terms[i] for i in top.tolist()],
+            'reviews': doc_counts[top],
+            'count': term_counts[top],
+            'score': scores[top],
+        })
+
+    def distinctive_terms(
+        self,
+        bank: str,
+        other: Optional[str] = None,
+        n: Optional[int] = None,
+        min_df: Optional[int] = None,
+        ngram: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Terms used most distinctively by `bank` compared with `other` (default:
+        every other bank), ranked by the z-score of their log-odds ratio with
+        the all-bank counts as the prior.
+
+        Returns:
+            DataFrame with term, z_score, count (in `bank`) and other_count
+        """
+        n = n or THEMES_CONFIG['top_n']
+        counts = self._counts(self._term_counts, bank)
+        if other is None:
+            other_counts = self._counts(self._term_counts, None) - counts
+            other_docs = self._counts(self._doc_counts, None) - self._counts(self._doc_counts, bank)
+        else:
+            other_counts = self._counts(self._term_counts, other)
+            other_docs = self._counts(self._doc_counts, other)
+        prior = self._counts(self._term_counts, None)
+
+        total, other_total, prior_total = counts.sum(), other_counts.sum(), prior.sum()
+        mask = self._report_mask(self._counts(self._doc_counts, bank) + other_docs, min_df, ngram) & (prior > 0)
+        terms = np.flatnonzero(mask)
+        y, y_other, alpha = counts[terms], other_counts[terms], prior[terms]
+        delta = (np.log((y + alpha) / (total + prior_total - y - alpha))
+                 - np.log((y_other + alpha) / (other_total + prior_total - y_other - alpha)))
+        z_scores = delta / np.sqrt(1 / (y + alpha) + 1 / (y_other + alpha))
+
+        order = np.argsort(-z_scores, kind='stable')[:n]
+        top = terms[order]
+        return pd.DataFrame({
+            'term': [self._terms[i] for i in top.tolist()],
+            'z_score': z_scores[order],
+            'count': counts[top],
+            'other_count': other_counts[top],
+        })
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Write the model to `path` (default THEMES_CONFIG['state_path']), sparse and compressed."""
+        path = path or THEMES_CONFIG['state_path']
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        size = len(self._terms)
+        arrays = {
+            'version': np.array([FORMAT_VERSION]),
+            # Terms never contain newlines (they are words joined by spaces)
+            'terms': np.frombuffer('\n'.join(self._terms).encode('utf-8'), dtype=np.uint8),
+            'banks': np.frombuffer(json.dumps(self._banks).encode('utf-8'), dtype=np.uint8),
+            'settings': np.frombuffer(json.dumps(self.settings()).encode('utf-8'), dtype=np.uint8),
+            'reviews': np.array(self._reviews, dtype=np.int64),
+            'seen': np.sort(np.fromiter(self._seen, dtype=np.uint64, count=len(self._seen))),
+        }
+        for name, counts in (('term_counts', self._term_counts), ('doc_counts', self._doc_counts)):
+            matrix = sparse.csr_matrix(np.vstack([values[:size] for values in counts])
+                                       if counts else np.zeros((0, size), dtype=np.int64))
+            arrays[f"{name}_data"] = matrix.data
+            arrays[f"{name}_indices"] = matrix.indices
+            arrays[f"{name}_indptr"] = matrix.indptr
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'ThemeModel':
+        """Read a model written by `save`."""
+        path = path or THEMES_CONFIG['state_path']
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version'][0]) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported theme model version in {path}")
+            model = cls(**json.loads(data['settings'].tobytes().decode('utf-8')))
+            raw_terms = data['terms'].tobytes().decode('utf-8')
+            model._terms = raw_terms.split('\n') if raw_terms else []
+            model._vocabulary = {term: i for i, term in enumerate(model._terms)}
+            model._term_ngrams = array('B', [term.count(' ') + 1 for term in model._terms])
+            model._banks = json.loads(data['banks'].tobytes().decode('utf-8'))
+            model._reviews = data['reviews'].tolist()
+            model._seen = set(data['seen'].tolist())
+
+            size = len(model._terms)
+            model._capacity = size
+            for name, counts in (('term_counts', model._term_counts), ('doc_counts', model._doc_counts)):
+                matrix = sparse.csr_matrix(
+                    (data[f"{name}_data"], data[f"{name}_indices"], data[f"{name}_indptr"]),
+                    shape=(len(model._banks), size)
+                )
+                counts.extend(row for row in matrix.toarray().astype(np.int64))
+        return model
+
+
+def load_or_create(path: Optional[str] = None) -> ThemeModel:
+    """The saved model at `path`, or a new empty one."""
+    path = path or THEMES_CONFIG['state_path']
+    return ThemeModel.load(path) if os.path.exists(path) else ThemeModel()
+
+
+def update_from_files(model: ThemeModel, paths: Iterable[Union[str, Path]], chunksize: Optional[int] = None) -> int:
+    """Count the reviews of each CSV/Parquet file into `model`; returns the number counted."""
+    chunksize = chunksize or THEMES_CONFIG['chunksize']
+    counted = 0
+    for path in paths:
+        occurrences: Dict[str, int] = {}
+        for chunk in iter_review_chunks(path, chunksize, THEME_COLUMNS):
+            counted += model.update(chunk, occurrences)
+    return counted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally extract keywords and themes from reviews")
+    parser.add_argument('--state', default=THEMES_CONFIG['state_path'], help="model file")
+    commands = parser.add_subparsers(dest='command', required=True)
+    update = commands.add_parser('update', help="count new reviews from the processed files (or FILES)")
+    update.add_argument('files', nargs='*')
+    for name, help_text in (('keywords', "top TF-IDF keywords per bank"),
+                            ('compare', "terms distinguishing BANK from OTHER (or the other banks)")):
+        command = commands.add_parser(name, help=help_text)
+        if name == 'compare':
+            command.add_argument('bank')
+            command.add_argument('other', nargs='?')
+        else:
+            command.add_argument('--bank', action='append')
+        command.add_argument('--top', type=int, default=THEMES_CONFIG['top_n'])
+        command.add_argument('--ngram', type=int, help="only n-grams of this length")
+        command.add_argument('--min-df', type=int, default=THEMES_CONFIG['min_df'])
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model = load_or_create(args.state)
+    if args.command == 'update':
+        paths = args.files or processed_files()
+        counted = update_from_files(model, paths)
+        model.save(args.state)
+        print(f"🧩 Counted {counted} new reviews from {len(paths)} files "
+              f"({len(model)} reviews, {model.vocabulary_size} terms) -> {args.state}")
+    elif args.command == 'keywords':
+        for bank in args.bank or model.banks:
+            keywords = model.top_keywords(bank, n=args.top, min_df=args.min_df, ngram=args.ngram)
+            print(f"\n🏦 {bank}: {', '.join(keywords['term'])}")
+    else:
+        terms = model.distinctive_terms(args.bank, args.other, n=args.top, min_df=args.min_df, ngram=args.ngram)
+        print(f"\n🏦 {args.bank} vs {args.other or 'other banks'}:")
+        for row in terms.itertuples():
+            print(f"   {row.term:<30} z={row.z_score:6.2f}  ({row.count} vs {row.other_count})")
+    print(f"\n⏱️  Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,22 @@
+import os
 import pandas as pd
-import emoji
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional, Union
 from deep_translator import GoogleTranslator
 from config.settings import TRANSLATION_CONFIG, EMOJI_CONFIG, VALIDATION
+from src.translation_cache import TranslationCache, get_translation_cache
+from src.utils.emoji_engine import analyze_emojis, analyze_emoji_series
+from src.storage import write_reviews
+from src.metrics import EMOJI_SECONDS, TRANSLATION_FAILURES, TRANSLATION_RETRIES, TRANSLATION_SECONDS
+from src.utils.resilience import CircuitBreaker, CircuitOpenError, get_breaker, retry_call
+
+# Column order of processed reviews (emoji columns follow when enabled)
+REVIEW_COLUMNS = [
+    'review_id', 'bank', 'app_id', 'review', 'review_clean', 'rating',
+    'date', 'thumbs_up', 'language', 'scrape_timestamp',
+    'translated_review', 'is_translated'
+]
 
 def create_output_dir(dir_name: str = 'data') -> None:
     """Create output directory if it doesn't exist."""
@@ -14,57 +27,168 @@ def translate_text(text: str, target_lang: str = 'en') -> str:
     """Translate text to target language with retry logic."""
     if not text or not text.strip() or len(text) < VALIDATION['min_review_length']:
         return text
-        
-    for attempt in range(TRANSLATION_CONFIG['retries']):
-        try:
+
+    def translate() -> str:
+        with TRANSLATION_SECONDS.labels('single').time():
             return GoogleTranslator(
                 source='auto',
                 target=target_lang,
                 timeout=TRANSLATION_CONFIG['timeout']
             ).translate(text)
-        except Exception as e:
-            if attempt == TRANSLATION_CONFIG['retries'] - 1:
-                print(f"Translation failed after {TRANSLATION_CONFIG['retries']} attempts: {e}")
-                return text
-            time.sleep(1)  # Wait before retry
+
+    return _translate_with_retries(translate, text, 'single', 1)
+
+def _translation_breaker() -> CircuitBreaker:
+    return get_breaker(f"translate:{TRANSLATION_CONFIG['provider']}")
+
+def _translate_with_retries(translate: Callable[[], Any], fallback: Any, mode: str, size: int) -> Any:
+    """
+    Run `translate` with backoff retries, returning `fallback` if it keeps failing.
+
+    While the provider's circuit is open, translations fall back to the
+    source text immediately instead of waiting out every retry.
+    """
+    try:
+        return retry_call(
+            translate,
+            attempts=TRANSLATION_CONFIG['retries'],
+            breaker=_translation_breaker(),
+            on_retry=lambda attempt, error, delay: TRANSLATION_RETRIES.labels(mode).inc()
+        )
+    except CircuitOpenError:
+        TRANSLATION_FAILURES.labels(mode).inc(size)
+        return fallback
+    except Exception as e:
+        label = 'Translation' if mode == 'single' else 'Batch translation'
+        print(f"{label} failed after retrying: {e}")
+        TRANSLATION_FAILURES.labels(mode).inc(size)
+        return fallback
+
+def _google_translator(target_lang: str) -> GoogleTranslator:
+    return GoogleTranslator(source='auto', target=target_lang, timeout=TRANSLATION_CONFIG['timeout'])
+
+def _translate_chunk(chunk: List[str], translator: Any) -> List[str]:
+    """Translate one batch, falling back to the source texts if every retry fails."""
+    def translate() -> List[str]:
+        with TRANSLATION_SECONDS.labels('batch').time():
+            return translator.translate_batch(chunk)
+
+    return _translate_with_retries(translate, chunk, 'batch', len(chunk))
+
+def translate_batch(
+    texts: List[str],
+    target_lang: str = 'en',
+    cache: Optional[TranslationCache] = None,
+    translator_factory: Optional[Callable[[str], Any]] = None,
+    batch_size: Optional[int] = None,
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Translate many texts, reusing cached translations and batching the rest.
+
+    Duplicate texts are translated once. Texts not found in the cache are split
+    into batches of `batch_size` which are translated concurrently; successful
+    results are written back to the cache.
+
+    Args:
+        texts: Texts to translate
+        target_lang: Language to translate to
+        cache: Translation cache (defaults to the one in TRANSLATION_CONFIG)
+        translator_factory: Builds a backend with a `translate_batch` method for
+            a target language; one backend is created per batch
+        batch_size: Texts per translation call
+        max_workers: Batches translated concurrently
+
+    Returns:
+        Translations in the same order as `texts`
+    """
+    if cache is None:
+        cache = get_translation_cache()
+    if translator_factory is None:
+        translator_factory = _google_translator
+    batch_size = batch_size or TRANSLATION_CONFIG['batch_size']
+    max_workers = max_workers or TRANSLATION_CONFIG['max_workers']
+
+    # Too short or empty texts are returned unchanged, like translate_text
+    pending = list(dict.fromkeys(
+        t for t in texts
+        if t and t.strip() and len(t) >= VALIDATION['min_review_length']
+    ))
+    translations = cache.get_many(pending, target_lang) if cache is not None else {}
+    misses = [t for t in pending if t not in translations]
+
+    if misses:
+        chunks = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda chunk: _translate_chunk(chunk, translator_factory(target_lang)),
+                chunks
+            ))
+        new_pairs = []
+        for chunk, translated in zip(chunks, results):
+            for source, target in zip(chunk, translated):
+                translations[source] = target
+                # A result identical to the source is usually a failed call
+                if target and target != source:
+                    new_pairs.append((source, target))
+        if cache is not None and new_pairs:
+            cache.set_many(new_pairs, target_lang)
+
+    return [translations.get(t, t) for t in texts]
 
 def extract_emoji_info(text: str) -> Dict[str, Any]:
     """Extract emoji information from text."""
-    if not isinstance(text, str):
-        return {'emojis': [], 'count': 0, 'descriptions': []}
-    
-    emoji_chars = [c for c in text if c in emoji.EMOJI_DATA]
-    emoji_descriptions = [emoji.demojize(e) for e in emoji_chars]
-    
+    info = analyze_emojis(text)
     return {
-        'emojis': emoji_chars,
-        'count': len(emoji_chars),
-        'descriptions': emoji_descriptions
+        'emojis': info['emojis'],
+        'count': info['count'],
+        'descriptions': info['descriptions']
     }
 
 def process_reviews(raw_reviews: List[Dict[str, Any]], bank_name: str) -> List[Dict[str, Any]]:
     """Process and clean review data."""
     processed = []
     
-    for review in raw_reviews:
+    # Skip reviews that are too short
+    kept = [
+        review for review in raw_reviews
+        if len(str(review.get('content', '')).strip()) >= VALIDATION['min_review_length']
+    ]
+    
+    # Translate everything that needs it in one batched, cached pass
+    translations = {}
+    if TRANSLATION_CONFIG['enabled']:
+        to_translate = [
+            review.get('content', '') for review in kept
+            if review.get('language', 'en') != TRANSLATION_CONFIG['target_language']
+            and review.get('content', '').strip()
+        ]
+        if to_translate:
+            cache = get_translation_cache()
+            translated = translate_batch(to_translate, TRANSLATION_CONFIG['target_language'], cache=cache)
+            translations = dict(zip(to_translate, translated))
+            if cache is not None:
+                stats = cache.stats()
+                print(f"   Translation cache: {stats['hits']} hits, {stats['misses']} misses")
+    
+    emoji_seconds = 0.0
+    for review in kept:
         content = review.get('content', '')
         language = review.get('language', 'en')
         
-        # Skip if review is too short
-        if len(str(content).strip()) < VALIDATION['min_review_length']:
-            continue
-            
-        # Extract emoji information
-        emoji_info = extract_emoji_info(content) if EMOJI_CONFIG['extract_emojis'] else {
-            'emojis': [], 'count': 0, 'descriptions': []
-        }
+        # Extract emoji information and the emoji-free text in one pass
+        start = time.perf_counter()
+        emoji_info = analyze_emojis(str(content))
+        emoji_seconds += time.perf_counter() - start
+        if not EMOJI_CONFIG['extract_emojis']:
+            emoji_info.update({'emojis': [], 'count': 0, 'descriptions': []})
         
         # Translate if enabled and needed
         translated_content = ""
         if (TRANSLATION_CONFIG['enabled'] and 
             language != TRANSLATION_CONFIG['target_language'] and 
             content.strip()):
-            translated_content = translate_text(content, TRANSLATION_CONFIG['target_language'])
+            translated_content = translations.get(content, '')
         
         # Build review data
         review_data = {
@@ -72,7 +196,7 @@ def process_reviews(raw_reviews: List[Dict[str, Any]], bank_name: str) -> List[D
             'bank': bank_name,
             'app_id': review.get('app_id', ''),
             'review': content,
-            'review_clean': emoji.replace_emoji(str(content), replace='').strip(),
+            'review_clean': emoji_info['clean_text'],
             'rating': min(max(int(review.get('score', 0)), 1), 5),  # Ensure 1-5
             'date': review.get('at', '').strftime('%Y-%m-%d') if review.get('at') else '',
             'thumbs_up': int(review.get('thumbsUpCount', 0)),
@@ -88,41 +212,143 @@ def process_reviews(raw_reviews: List[Dict[str, Any]], bank_name: str) -> List[D
         
         processed.append(review_data)
     
+    EMOJI_SECONDS.labels('single_pass').observe(emoji_seconds)
     return processed
 
-def save_to_csv(data: List[Dict[str, Any]], filename: str) -> bool:
-    """Save processed data to CSV with error handling."""
-    if not data:
+def process_reviews_frame(raw_reviews: Union[pd.DataFrame, List[Dict[str, Any]], Any], bank_name: str) -> pd.DataFrame:
+    """
+    Columnar version of `process_reviews`.
+
+    Takes the raw scraper output as a DataFrame (e.g. `ReviewBuffer.to_frame()`),
+    a pyarrow Table or a list of review dicts and applies the same filtering, clamping, formatting, emoji
+    extraction and translation with whole-column operations. The result has
+    the same columns, in the same order, as a DataFrame built from
+    `process_reviews` output.
+    """
+    if isinstance(raw_reviews, pd.DataFrame):
+        df = raw_reviews
+    elif hasattr(raw_reviews, 'to_pandas'):
+        df = raw_reviews.to_pandas()
+    else:
+        df = pd.DataFrame(list(raw_reviews))
+
+    def column(name: str, default: Any) -> pd.Series:
+        if name not in df.columns:
+            return pd.Series(default, index=df.index, dtype=object)
+        series = df[name]
+        # Categoricals (e.g. from ReviewBuffer) need the default as a category to fill with it
+        if isinstance(series.dtype, pd.CategoricalDtype) and default is not None \
+                and default not in series.cat.categories:
+            series = series.cat.add_categories([default])
+        return series
+
+    # Skip reviews that are too short
+    content = column('content', '').fillna('').astype(str)
+    keep = content.str.strip().str.len() >= VALIDATION['min_review_length']
+    df = df[keep]
+    content = content[keep]
+
+    language = column('language', 'en').fillna('en')
+    target = TRANSLATION_CONFIG['target_language']
+
+    # Translate everything that needs it in one batched, cached pass
+    translated = pd.Series('', index=df.index, dtype=object)
+    if TRANSLATION_CONFIG['enabled']:
+        needs = language != target  # Kept reviews are never blank
+        if needs.any():
+            translated[needs] = translate_batch(content[needs].tolist(), target)
+
+    with EMOJI_SECONDS.labels('frame').time():
+        emoji_info = analyze_emoji_series(content)
+    if not EMOJI_CONFIG['extract_emojis']:
+        emoji_info['emojis'] = [[] for _ in range(len(df))]
+        emoji_info['count'] = 0
+        emoji_info['descriptions'] = [[] for _ in range(len(df))]
+
+    at = pd.to_datetime(column('at', None), errors='coerce')
+    has_translation = translated != ''
+    emoji_columns = EMOJI_CONFIG['emoji_columns']
+
+    result = pd.DataFrame({
+        'review_id': column('reviewId', '').fillna(''),
+        'bank': bank_name,
+        'app_id': column('app_id', '').fillna(''),
+        'review': content,
+        'review_clean': emoji_info['clean_text'],
+        'rating': pd.to_numeric(column('score', 0), errors='coerce').fillna(0).astype(int).clip(1, 5),
+        'date': at.dt.strftime('%Y-%m-%d').fillna(''),
+        'thumbs_up': pd.to_numeric(column('thumbsUpCount', 0), errors='coerce').fillna(0).astype(int),
+        'language': language,
+        'scrape_timestamp': column('scrape_timestamp', '').fillna(''),
+        'translated_review': translated.where(has_translation, content),
+        'is_translated': has_translation & (language != target),
+        emoji_columns['emojis']: emoji_info['emojis'],
+        emoji_columns['count']: emoji_info['count'],
+        emoji_columns['descriptions']: emoji_info['descriptions']
+    }, index=df.index)
+
+    return result.reset_index(drop=True)
+
+def _review_frame(data: Union[List[Dict[str, Any]], pd.DataFrame]) -> pd.DataFrame:
+    """Build the output frame with every expected column in order."""
+    df = data.copy() if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    
+    # Ensure all expected columns exist
+    expected_columns = list(REVIEW_COLUMNS)
+    
+    # Add emoji columns if enabled
+    if EMOJI_CONFIG['extract_emojis']:
+        expected_columns.extend(EMOJI_CONFIG['emoji_columns'].values())
+    
+    # Add missing columns with default values
+    for col in expected_columns:
+        if col not in df.columns:
+            df[col] = None
+    
+    # Reorder columns
+    return df[expected_columns]
+
+def save_to_csv(data: Union[List[Dict[str, Any]], pd.DataFrame], filename: str, append: bool = False) -> bool:
+    """Save processed data to CSV with error handling.
+
+    With `append=True` rows are added to an existing file instead of
+    overwriting it; the header is only written when the file is new.
+    """
+    if len(data) == 0:
         print("No data to save!")
         return False
     
     try:
-        df = pd.DataFrame(data)
-        
-        # Ensure all expected columns exist
-        expected_columns = [
-            'review_id', 'bank', 'app_id', 'review', 'review_clean', 'rating',
-            'date', 'thumbs_up', 'language', 'scrape_timestamp',
-            'translated_review', 'is_translated'
-        ]
-        
-        # Add emoji columns if enabled
-        if EMOJI_CONFIG['extract_emojis']:
-            expected_columns.extend(EMOJI_CONFIG['emoji_columns'].values())
-        
-        # Add missing columns with default values
-        for col in expected_columns:
-            if col not in df.columns:
-                df[col] = None
-        
-        # Reorder columns
-        df = df[expected_columns]
+        df = _review_frame(data)
         
         # Save to CSV
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
-        print(f"\n✅ Saved {len(df)} reviews to {filename}")
+        if append and os.path.exists(filename):
+            # No BOM when appending, it would end up in the middle of the file
+            df.to_csv(filename, mode='a', header=False, index=False, encoding='utf-8')
+            print(f"\n✅ Appended {len(df)} reviews to {filename}")
+        else:
+            df.to_csv(filename, index=False, encoding='utf-8-sig')
+            print(f"\n✅ Saved {len(df)} reviews to {filename}")
         return True
         
     except Exception as e:
         print(f"❌ Error saving to {filename}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def save_reviews(data: Union[List[Dict[str, Any]], pd.DataFrame], filename: str, append: bool = False) -> bool:
+    """Save processed data as CSV or Parquet, depending on the file suffix."""
+    if filename.endswith('.csv'):
+        return save_to_csv(data, filename, append)
+    if len(data) == 0:
+        print("No data to save!")
+        return False
+    
+    try:
+        df = _review_frame(data)
+        write_reviews(df, filename, append)
+        print(f"\n✅ {'Appended' if append else 'Saved'} {len(df)} reviews to {filename}")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Error saving to {filename}: {e}")
+        return False
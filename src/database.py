@@ -0,0 +1,129 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, Connection, Engine
+
+from config.settings import DATABASE_CONFIG
+
+load_dotenv()
+
+Params = Union[Dict[str, Any], Sequence[Dict[str, Any]], None]
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def database_url(database: Optional[str] = None) -> Union[str, URL]:
+    """
+    Connection URL for `database` (default: DB_NAME or DATABASE_CONFIG['name']).
+
+    DATABASE_URL, when set, is used as-is for the default database. Otherwise
+    the URL is built from the DB_USER, DB_PASSWORD, DB_HOST and DB_PORT
+    environment variables.
+    """
+    if database is None and os.getenv('DATABASE_URL'):
+        return os.environ['DATABASE_URL']
+    return URL.create(
+        'postgresql+psycopg2',
+        username=os.getenv('DB_USER', 'postgres'),
+        password=os.getenv('DB_PASSWORD') or None,
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', '5432')),
+        database=database or os.getenv('DB_NAME', DATABASE_CONFIG['name'])
+    )
+
+
+def get_engine(database: Optional[str] = None) -> Engine:
+    """
+    Return the process-wide pooled engine for `database`.
+
+    Engines are created once per database and reused, so every query borrows
+    an already-open connection from the pool instead of reconnecting.
+    """
+    key = database or ''
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = create_engine(
+                database_url(database),
+                pool_size=DATABASE_CONFIG['pool_size'],
+                max_overflow=DATABASE_CONFIG['max_overflow'],
+                pool_recycle=DATABASE_CONFIG['pool_recycle'],
+                pool_pre_ping=DATABASE_CONFIG['pool_pre_ping']
+            )
+        return _engines[key]
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection (e.g. before forking worker processes)."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+@contextmanager
+def transaction(database: Optional[str] = None) -> Iterator[Connection]:
+    """Pooled connection inside a transaction that commits on success and rolls back on error."""
+    with get_engine(database).begin() as conn:
+        yield conn
+
+
+def execute(sql: str, params: Params = None, database: Optional[str] = None) -> Union[List[Any], int]:
+    """
+    Run a parameterized statement in its own transaction.
+
+    `sql` uses named `:param` placeholders that are bound, never formatted
+    into the string. A list of parameter dicts runs the statement once per
+    dict (executemany). Returns the result rows for statements that return
+    rows, otherwise the affected row count.
+    """
+    with transaction(database) as conn:
+        result = conn.execute(text(sql), params or {})
+        return result.fetchall() if result.returns_rows else result.rowcount
+
+
+def fetch_df(sql: str, params: Optional[Dict[str, Any]] = None, database: Optional[str] = None) -> pd.DataFrame:
+    """Run a parameterized query and return the whole result as a DataFrame."""
+    with get_engine(database).connect() as conn:
+        result = conn.execute(text(sql), params or {})
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+
+def stream_query(
+    sql: str,
+    params: Optional[Dict[str, Any]] = None,
+    chunksize: Optional[int] = None,
+    database: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a query's result as DataFrames of at most `chunksize` rows.
+
+    Uses a server-side (named) cursor, so only one chunk is held in memory
+    at a time no matter how large the result is. The connection stays
+    checked out until the iterator is exhausted or closed.
+    """
+    chunksize = chunksize or DATABASE_CONFIG['stream_chunksize']
+    with get_engine(database).connect() as conn:
+        streaming = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+        result = streaming.execute(text(sql), params or {})
+        columns = list(result.keys())
+        for rows in result.partitions(chunksize):
+            yield pd.DataFrame(rows, columns=columns)
+
+
+def ensure_database(name: Optional[str] = None) -> bool:
+    """Create the database if it does not exist. Returns True when it was created."""
+    name = name or os.getenv('DB_NAME', DATABASE_CONFIG['name'])
+    # CREATE DATABASE cannot run inside a transaction
+    engine = get_engine('postgres')
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        exists = conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :name"), {'name': name}).scalar()
+        if exists:
+            return False
+        conn.execute(text(f"CREATE DATABASE {engine.dialect.identifier_preparer.quote(name)}"))
+        return True
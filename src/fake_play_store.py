@@ -0,0 +1,300 @@
+"""
+Local stand-in for Google Play, for offline load testing of the scraper.
+
+The server serves app info and paginated reviews generated from a seed,
+with configurable latency, error rate and throttling (HTTP 429 above a
+request rate). The client functions `app`, `reviews` and `reviews_all`
+have the same signatures and return shapes as google_play_scraper's, so
+the scraper can switch to them with SCRAPING_CONFIG['backend'] = 'fake'.
+
+Usage:
+    python src/fake_play_store.py [--port 8765] [--latency-ms 50] [--error-rate 0.05] [--rps 20]
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+from urllib.request import urlopen
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from google_play_scraper import Sort
+
+from config.settings import BANK_APPS, SCRAPING_CONFIG
+from src.utils.rate_limiter import TokenBucket
+from src.utils.synthetic_reviews import generate_reviews
+
+# Largest page the server returns, like Play's own page limit
+MAX_PAGE_SIZE = 200
+
+
+class FakePlayStore:
+    """
+    Request handling for the fake backend, independent of the HTTP layer.
+
+    Reviews for each (app_id, lang) are generated once from the seed, so the
+    same server always returns the same data in the same order.
+
+    Args:
+        reviews_per_app: Reviews available per app and language
+        latency_ms: Mean added latency per request
+        latency_jitter_ms: Uniform +/- jitter around the mean latency
+        error_rate: Fraction of requests answered with HTTP 500
+        requests_per_second: Token-bucket rate above which requests get HTTP 429
+            (None = unlimited)
+        seed: Seed for the review data, latency and injected errors
+    """
+
+    def __init__(
+        self,
+        reviews_per_app: int = 1000,
+        latency_ms: float = 0.0,
+        latency_jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        requests_per_second: Optional[float] = None,
+        seed: int = 42
+    ):
+        self.reviews_per_app = reviews_per_app
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self._bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        self._rng = random.Random(seed)
+        self._reviews: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0}
+
+    def _app_reviews(self, app_id: str, lang: str) -> List[Dict[str, Any]]:
+        """Reviews of one app and language, newest first."""
+        key = (app_id, lang)
+        with self._lock:
+            if key not in self._reviews:
+                seed = self.seed ^ zlib.crc32(f"{app_id}:{lang}".encode('utf-8'))
+                generated = generate_reviews(
+                    self.reviews_per_app, seed=seed,
+                    amharic_share=0.9 if lang == 'am' else 0.05, duplicate_share=0.0
+                )
+                for i, review in enumerate(generated):
+                    review.update({
+                        'userName': f"User {i}",
+                        'userImage': '',
+                        'reviewCreatedVersion': '1.0.0',
+                        'appVersion': '1.0.0',
+                        'replyContent': None,
+                        'repliedAt': None,
+                    })
+                    for field in ('app_id', 'language', 'scrape_timestamp'):
+                        review.pop(field)
+                generated.sort(key=lambda r: r['at'], reverse=True)
+                self._reviews[key] = generated
+            return self._reviews[key]
+
+    def _delay(self) -> bool:
+        """Sleep for the simulated latency; returns True when this request should fail."""
+        with self._lock:
+            jitter = self._rng.uniform(-self.latency_jitter_ms, self.latency_jitter_ms)
+            failed = self._rng.random() < self.error_rate
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+        return failed
+
+    def handle(self, path: str, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """Answer one request; returns (HTTP status, JSON payload)."""
+        with self._lock:
+            self.stats['requests'] += 1
+        if self._bucket is not None and not self._bucket.try_acquire():
+            with self._lock:
+                self.stats['throttled'] += 1
+            return 429, {'error': 'Too Many Requests'}
+        if self._delay():
+            with self._lock:
+                self.stats['errors'] += 1
+            return 500, {'error': 'Injected server error'}
+
+        parts = [part for part in path.split('/') if part]
+        if len(parts) == 2 and parts[0] == 'apps':
+            return 200, self._app_info(parts[1], query.get('lang', 'en'))
+        if len(parts) == 3 and parts[0] == 'apps' and parts[2] == 'reviews':
+            return 200, self._reviews_page(parts[1], query)
+        return 404, {'error': f"Unknown path {path}"}
+
+    def _app_info(self, app_id: str, lang: str) -> Dict[str, Any]:
+        names = {bank['id']: bank.get('full_name', bank['name']) for bank in BANK_APPS.values()}
+        scores = [r['score'] for r in self._app_reviews(app_id, lang)]
+        return {
+            'appId': app_id,
+            'title': f"{names.get(app_id, app_id)} (fake)",
+            'score': sum(scores) / len(scores) if scores else 0,
+            'ratings': len(scores),
+            'reviews': len(scores),
+            'installs': '1,000,000+',
+            'version': '1.0.0',
+            'updated': int(datetime(2026, 1, 1).timestamp()),
+        }
+
+    def _reviews_page(self, app_id: str, query: Dict[str, str]) -> Dict[str, Any]:
+        reviews = self._app_reviews(app_id, query.get('lang', 'en'))
+        if query.get('sort') == str(Sort.MOST_RELEVANT.value):
+            reviews = sorted(reviews, key=lambda r: r['thumbsUpCount'], reverse=True)
+        start = int(query.get('token') or 0)
+        count = min(int(query.get('count', 100)), MAX_PAGE_SIZE)
+        page = reviews[start:start + count]
+        end = start + len(page)
+        return {
+            'reviews': [dict(r, at=r['at'].isoformat()) for r in page],
+            'next_token': str(end) if end < len(reviews) else None,
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    store: FakePlayStore
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        status, payload = self.store.handle(url.path, query)
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host: str = '127.0.0.1', port: int = 0, **options) -> ThreadingHTTPServer:
+    """
+    Start a fake Play Store on a background thread and return the server.
+
+    `port=0` picks a free port (see `server.server_address`). `options` are
+    passed to `FakePlayStore`; the store is available as `server.store`.
+    Call `server.shutdown()` to stop it.
+    """
+    store = FakePlayStore(**options)
+    handler = type('FakePlayStoreHandler', (_RequestHandler,), {'store': store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.store = store
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class ContinuationToken:
+    """Pagination state, shaped like google_play_scraper's continuation token."""
+
+    def __init__(self, token, lang, country, sort, count, filter_score_with=None, filter_device_with=None):
+        self.token = token
+        self.lang = lang
+        self.country = country
+        self.sort = sort
+        self.count = count
+        self.filter_score_with = filter_score_with
+        self.filter_device_with = filter_device_with
+
+
+def _get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """GET a JSON document from the configured fake server; HTTP errors raise HTTPError."""
+    base = SCRAPING_CONFIG['fake_server']['url'].rstrip('/')
+    query = urlencode({k: v for k, v in params.items() if v is not None})
+    with urlopen(f"{base}{path}?{query}", timeout=30) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def app(app_id: str, lang: str = 'en', country: str = 'us') -> Dict[str, Any]:
+    """Fake counterpart of `google_play_scraper.app`."""
+    return _get(f"/apps/{quote(app_id)}", {'lang': lang, 'country': country})
+
+
+def reviews(
+    app_id: str,
+    lang: str = 'en',
+    country: str = 'us',
+    sort: Sort = Sort.NEWEST,
+    count: int = 100,
+    filter_score_with: Optional[int] = None,
+    filter_device_with: Optional[int] = None,
+    continuation_token: Optional[ContinuationToken] = None
+) -> Tuple[List[Dict[str, Any]], ContinuationToken]:
+    """Fake counterpart of `google_play_scraper.reviews` (one or more pages up to `count`)."""
+    token = None
+    if continuation_token is not None:
+        token = continuation_token.token
+        if token is None:
+            return [], continuation_token
+        lang, country = continuation_token.lang, continuation_token.country
+        sort, count = continuation_token.sort, continuation_token.count
+
+    result = []
+    while len(result) < count:
+        payload = _get(f"/apps/{quote(app_id)}/reviews", {
+            'lang': lang, 'country': country, 'sort': sort.value,
+            'count': min(count - len(result), MAX_PAGE_SIZE), 'token': token,
+        })
+        for review in payload['reviews']:
+            review['at'] = datetime.fromisoformat(review['at'])
+        result.extend(payload['reviews'])
+        token = payload['next_token']
+        if token is None:
+            break
+    return result, ContinuationToken(token, lang, country, sort, count, filter_score_with, filter_device_with)
+
+
+def reviews_all(app_id: str, sleep_milliseconds: int = 0, **kwargs) -> List[Dict[str, Any]]:
+    """Fake counterpart of `google_play_scraper.reviews_all` (ignores `count`, like the original)."""
+    kwargs.pop('count', None)
+    kwargs.pop('continuation_token', None)
+    result = []
+    token = None
+    while True:
+        page, token = reviews(app_id, count=MAX_PAGE_SIZE, continuation_token=token, **kwargs)
+        result.extend(page)
+        if token.token is None:
+            break
+        time.sleep(sleep_milliseconds / 1000)
+    return result
+
+
+def main():
+    config = SCRAPING_CONFIG['fake_server']
+    port = urlparse(config['url']).port or 8765
+    parser = argparse.ArgumentParser(description="Serve a fake Google Play for offline scraper testing")
+    parser.add_argument('--port', type=int, default=port)
+    parser.add_argument('--reviews', type=int, default=config['reviews_per_app'], help="reviews per app and language")
+    parser.add_argument('--latency-ms', type=float, default=config['latency_ms'])
+    parser.add_argument('--jitter-ms', type=float, default=config['latency_jitter_ms'])
+    parser.add_argument('--error-rate', type=float, default=config['error_rate'])
+    parser.add_argument('--rps', type=float, default=config['requests_per_second'], help="throttle above this rate")
+    parser.add_argument('--seed', type=int, default=config['seed'])
+    args = parser.parse_args()
+
+    server = start_server(
+        port=args.port, reviews_per_app=args.reviews, latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        requests_per_second=args.rps, seed=args.seed
+    )
+    print(f"🧪 Fake Play Store listening on http://127.0.0.1:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 {server.store.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 import sys
 from pathlib import Path
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import pandas as pd
 
 # Add the project root to Python path
 project_root = str(Path(__file__).parent.parent)
@@ -9,8 +11,12 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from config.settings import BANK_APPS, SCRAPING_CONFIG, LANGUAGE_CONFIG, TRANSLATION_CONFIG
-from src.scraper import get_app_info, scrape_app_reviews
-from src.data_handler import process_reviews, save_to_csv, create_output_dir
+from src.scraper import get_app_info, scrape_app_reviews, scrape_new_reviews, scrape_reviews_concurrently
+from src.scrape_state import ScrapeStateStore
+from src.data_handler import process_reviews_frame, save_reviews, create_output_dir
+from src.storage import with_format
+from src.utils.review_buffer import ReviewBuffer
+from src.metrics import export_metrics, timed
 
 def print_app_info(app_info: Dict[str, Any], bank_name: str) -> None:
     """Print formatted app information."""
@@ -24,11 +30,8 @@ def print_app_info(app_info: Dict[str, Any], bank_name: str) -> None:
     print(f"   🔄 Version: {app_info.get('version', 'N/A')}")
     print(f"   📅 Last Updated: {app_info.get('updated', 'N/A')}")
 
-def main():
-    """Main function to orchestrate the scraping and processing of app reviews."""
-    all_reviews = []
-    create_output_dir(SCRAPING_CONFIG['output']['directory'])
-    
+def print_banner() -> None:
+    """Print the scrape targets and translation setting."""
     print("\n" + "="*60)
     print("🚀 Starting Bank App Review Scraper")
     print("="*60)
@@ -39,6 +42,89 @@ def main():
     else:
         print("⏭️  Translation is DISABLED")
     print("="*60 + "\n")
+
+def print_language_distribution(processed: pd.DataFrame) -> None:
+    """Print how many processed reviews there are per language."""
+    lang_counts = processed['language'].value_counts().to_dict()
+        
+    print(f"✅ Processed {len(processed)} reviews")
+    print("   Language distribution:")
+    for lang, count in lang_counts.items():
+        print(f"   - {LANGUAGE_CONFIG['language_names'].get(lang, lang).title()}: {count}")
+
+def prefetch_concurrently() -> Dict[str, ReviewBuffer]:
+    """Scrape every (app_id, lang) job in parallel up front, compacted per app."""
+    jobs = [
+        (bank_data['id'], lang)
+        for bank_data in BANK_APPS.values()
+        for lang in bank_data.get('supported_languages', [LANGUAGE_CONFIG['default_language']])
+    ]
+    print(f"⚡ Scraping {len(jobs)} jobs with up to "
+          f"{SCRAPING_CONFIG['concurrency']['max_workers']} workers...")
+    scrape_start = time.time()
+    results = scrape_reviews_concurrently(jobs, count=SCRAPING_CONFIG['reviews_per_language'])
+    # Compact each bank's reviews as soon as the jobs are done
+    prefetched = {}
+    for app_id, lang in jobs:
+        prefetched.setdefault(app_id, ReviewBuffer()).extend(results.pop((app_id, lang), []))
+    print(f"⏱️  Concurrent scrape completed in {time.time() - scrape_start:.1f} seconds")
+    return prefetched
+
+def scrape_bank(
+    app_id: str,
+    languages: List[str],
+    state: Optional[ScrapeStateStore],
+    prefetched: Optional[Dict[str, ReviewBuffer]]
+) -> ReviewBuffer:
+    """
+    One bank's reviews: only new ones in incremental mode (`state`), the
+    concurrently prefetched ones when given, else a sequential scrape.
+    """
+    if state is not None:
+        return ReviewBuffer(scrape_new_reviews(app_id=app_id, state=state, languages=languages))
+    if prefetched is not None:
+        return prefetched.pop(app_id, ReviewBuffer())
+    return ReviewBuffer(scrape_app_reviews(
+        app_id=app_id,
+        count=SCRAPING_CONFIG['reviews_per_language'],
+        languages=languages
+    ))
+
+def save_bank(
+    processed: pd.DataFrame,
+    reviews: ReviewBuffer,
+    bank_name: str,
+    state: Optional[ScrapeStateStore]
+) -> Optional[str]:
+    """
+    Save one bank's processed reviews (appending in incremental mode) and
+    record its high-water marks. Returns the output path, or None on failure.
+    """
+    output_filename = SCRAPING_CONFIG['output']['filename'].format(bank_name=bank_name.lower())
+    output_path = with_format(f"{SCRAPING_CONFIG['output']['directory']}/{output_filename}")
+    if not save_reviews(processed, output_path, append=state is not None):
+        return None
+    if state is not None:
+        state.record(reviews)
+    return output_path
+
+def main():
+    """Main function to orchestrate the scraping and processing of app reviews."""
+    saved_files = []
+    total_reviews = 0
+    create_output_dir(SCRAPING_CONFIG['output']['directory'])
+    print_banner()
+    
+    # Incremental mode only fetches reviews newer than the stored high-water marks
+    incremental_config = SCRAPING_CONFIG['incremental']
+    state = None
+    if incremental_config['enabled']:
+        state = ScrapeStateStore(incremental_config['state_file'], incremental_config['max_seen_ids'])
+        print("📌 Incremental mode: only new reviews will be fetched and appended")
+    
+    # In concurrent mode every (app_id, lang) job is scraped up front
+    concurrent = SCRAPING_CONFIG['concurrency']['enabled'] and state is None
+    prefetched = prefetch_concurrently() if concurrent else None
     
     # Process each bank's app
     for bank_key, bank_data in BANK_APPS.items():
@@ -59,67 +145,51 @@ def main():
         print(f"\n🔄 Scraping up to {SCRAPING_CONFIG['reviews_per_language']} reviews per language...")
         start_time = time.time()
         
-        reviews = scrape_app_reviews(
-            app_id=app_id,
-            count=SCRAPING_CONFIG['reviews_per_language'],
-            languages=languages
-        )
+        with timed('scrape') as scrape_stage:
+            reviews = scrape_bank(app_id, languages, state, prefetched)
+            scrape_stage['rows'] = len(reviews)
         
         if reviews:
             # Process reviews
             print(f"\n🔄 Processing {len(reviews)} reviews...")
-            processed = process_reviews(reviews, bank_name)
-            all_reviews.extend(processed)
+            with timed('process_reviews') as process_stage:
+                processed = process_reviews_frame(reviews.to_frame(), bank_name)
+                process_stage['rows'] = len(processed)
+            total_reviews += len(processed)
+            
+            print_language_distribution(processed)
             
-            # Print summary
-            lang_counts = {}
-            for r in processed:
-                lang = r.get('language', 'unknown')
-                lang_counts[lang] = lang_counts.get(lang, 0) + 1
-                
-            print(f"✅ Processed {len(processed)} reviews")
-            print("   Language distribution:")
-            for lang, count in lang_counts.items():
-                print(f"   - {LANGUAGE_CONFIG['language_names'].get(lang, lang).title()}: {count}")
+            # Save this bank's reviews right away so only one bank is held in memory
+            output_path = save_bank(processed, reviews, bank_name, state) if len(processed) else None
+            if output_path:
+                saved_files.append((bank_name, len(processed), output_path))
+            del processed
         else:
             print("⚠️ No reviews found or error occurred")
         
-        # Be nice to the server
-        time.sleep(SCRAPING_CONFIG['sleep_time'])
+        # Be nice to the server (the rate limiter already paces concurrent mode)
+        if not concurrent:
+            time.sleep(SCRAPING_CONFIG['sleep_time'])
         print(f"⏱️  Completed in {time.time() - start_time:.1f} seconds")
     
-    # Save reviews for each bank in separate files
-    if all_reviews:
-        # Group reviews by bank
-        reviews_by_bank = {}
-        for review in all_reviews:
-            bank = review.get('bank')
-            if bank not in reviews_by_bank:
-                reviews_by_bank[bank] = []
-            reviews_by_bank[bank].append(review)
-        
-        # Save each bank's reviews to a separate file
-        saved_files = []
-        for bank_name, bank_reviews in reviews_by_bank.items():
-            # Format the output filename with bank name
-            output_filename = SCRAPING_CONFIG['output']['filename'].format(bank_name=bank_name.lower())
-            output_path = f"{SCRAPING_CONFIG['output']['directory']}/{output_filename}"
-            
-            # Save the bank's reviews
-            if save_to_csv(bank_reviews, output_path):
-                saved_files.append((bank_name, len(bank_reviews), output_path))
-        
+    # Persist high-water marks only for banks whose rows were written
+    if state is not None:
+        state.save()
+    
+    if total_reviews:
         # Print final summary
         print("\n" + "="*60)
         print("🏁 Scraping Complete!")
         print("="*60)
-        print(f"📊 Total Reviews: {len(all_reviews)}")
+        print(f"📊 Total Reviews: {total_reviews}")
         print("\n💾 Saved files:")
         for bank_name, count, path in saved_files:
             print(f"   - {bank_name}: {count} reviews -> {path}")
         print("="*60)
     else:
         print("\n❌ No reviews were scraped")
+    
+    export_metrics()
 
 def run():
     """Wrapper function to run the main scraper."""
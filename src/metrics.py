@@ -0,0 +1,216 @@
+"""
+Pipeline instrumentation: Prometheus metrics plus a JSON run summary.
+
+Metrics live in a dedicated registry and can be exported as a node_exporter
+textfile, served over HTTP, or summarized as JSON at the end of a run.
+
+When preprocessing runs banks in worker processes, each worker returns how
+much its counters grew and the parent adds that to its own counters. To also
+collect the workers' histograms and gauges, set PROMETHEUS_MULTIPROC_DIR to
+an empty directory before starting the run (prometheus_client multiprocess
+mode).
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server, write_to_textfile
+from prometheus_client import multiprocess
+
+from config.settings import METRICS_CONFIG
+
+REGISTRY = CollectorRegistry()
+
+STAGE_SECONDS = Histogram(
+    'pipeline_stage_seconds', 'Wall time of one pipeline stage call', ['stage'], registry=REGISTRY,
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+)
+STAGE_ROWS = Counter('pipeline_stage_rows', 'Rows output by a pipeline stage', ['stage'], registry=REGISTRY)
+REVIEWS_SCRAPED = Counter(
+    'reviews_scraped', 'Reviews fetched from the Play Store', ['app_id', 'language'], registry=REGISTRY
+)
+SCRAPE_PAGE_RETRIES = Counter(
+    'scrape_page_retries', 'Review page requests that failed and were retried', ['app_id'], registry=REGISTRY
+)
+TRANSLATION_SECONDS = Histogram(
+    'translation_request_seconds', 'Latency of one translation request (single text or batch)', ['mode'],
+    registry=REGISTRY, buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+TRANSLATION_RETRIES = Counter('translation_retries', 'Translation attempts that failed and were retried', ['mode'],
+                              registry=REGISTRY)
+TRANSLATION_FAILURES = Counter('translation_failures', 'Translations that fell back to the source text', ['mode'],
+                               registry=REGISTRY)
+EMOJI_SECONDS = Histogram(
+    'emoji_extraction_seconds', 'Time to extract emojis from one batch of reviews', ['path'], registry=REGISTRY,
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+ROWS_DROPPED = Counter(
+    'preprocess_rows_dropped', 'Rows removed by each preprocess_data step', ['bank', 'step'], registry=REGISTRY
+)
+SENTIMENT_ROWS_PER_SECOND = Gauge(
+    'sentiment_rows_per_second', 'Throughput of the last sentiment scoring call', ['analyzer'], registry=REGISTRY,
+    multiprocess_mode='max'
+)
+DB_LOAD_ROWS_PER_SECOND = Gauge(
+    'db_load_rows_per_second', 'Throughput of the last database load per bank', ['bank', 'method'],
+    registry=REGISTRY, multiprocess_mode='max'
+)
+
+# Counters a worker process reports back to its parent, by metric name
+COUNTERS = {
+    'pipeline_stage_rows': STAGE_ROWS,
+    'reviews_scraped': REVIEWS_SCRAPED,
+    'scrape_page_retries': SCRAPE_PAGE_RETRIES,
+    'translation_retries': TRANSLATION_RETRIES,
+    'translation_failures': TRANSLATION_FAILURES,
+    'preprocess_rows_dropped': ROWS_DROPPED,
+}
+
+# Counter values keyed by (metric name, sorted label pairs)
+CounterValues = Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]
+
+_run_started = datetime.now()
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block as one call of `stage`.
+
+    Yields a dict; set `rows` on it to count the rows the stage produced.
+    """
+    info: Dict[str, Any] = {'rows': 0}
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        record_stage(stage, info['rows'], time.perf_counter() - start)
+
+
+def record_stage(stage: str, rows: int, seconds: float) -> None:
+    """Record one call of `stage` that produced `rows` rows in `seconds`."""
+    STAGE_SECONDS.labels(stage).observe(seconds)
+    STAGE_ROWS.labels(stage).inc(rows)
+
+
+def counter_values() -> CounterValues:
+    """Current value of every labelled child of the COUNTERS."""
+    values: CounterValues = {}
+    for family in REGISTRY.collect():
+        if family.name not in COUNTERS:
+            continue
+        for sample in family.samples:
+            if sample.name.endswith('_total'):
+                values[(family.name, tuple(sorted(sample.labels.items())))] = sample.value
+    return values
+
+
+def counter_deltas(before: CounterValues) -> CounterValues:
+    """How much each counter grew since the `before` snapshot of `counter_values()`."""
+    return {
+        key: value - before.get(key, 0.0)
+        for key, value in counter_values().items()
+        if value != before.get(key, 0.0)
+    }
+
+
+def add_counter_deltas(deltas: CounterValues) -> None:
+    """
+    Add the counter growth a worker process returned to this process's counters.
+
+    Does nothing in multiprocess mode, which already collects the workers'
+    own values.
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return
+    for (name, labels), delta in deltas.items():
+        COUNTERS[name].labels(**dict(labels)).inc(delta)
+
+
+def collection_registry() -> CollectorRegistry:
+    """Registry to export from: the multiprocess collector when enabled, else REGISTRY."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def run_summary() -> Dict[str, Any]:
+    """
+    Structured summary of everything recorded in this run.
+
+    `stages` has total seconds, calls, rows and rows/sec per stage;
+    `metrics` lists every other sample by metric name with its labels.
+    """
+    stages: Dict[str, Dict[str, Any]] = {}
+    metrics: Dict[str, list] = {}
+    for family in collection_registry().collect():
+        for sample in family.samples:
+            if sample.name.endswith(('_bucket', '_created')):
+                continue
+            if family.name == 'pipeline_stage_seconds' and sample.name.endswith(('_sum', '_count')):
+                field = 'seconds' if sample.name.endswith('_sum') else 'calls'
+                stages.setdefault(sample.labels['stage'], {})[field] = sample.value
+                continue
+            if family.name == 'pipeline_stage_rows':
+                stages.setdefault(sample.labels['stage'], {})['rows'] = int(sample.value)
+                continue
+            labels = {k: v for k, v in sample.labels.items() if k != 'pid'}
+            metrics.setdefault(sample.name, []).append({'labels': labels, 'value': sample.value})
+
+    for stats in stages.values():
+        stats.setdefault('rows', 0)
+        seconds = stats.get('seconds', 0.0)
+        stats['rows_per_sec'] = stats['rows'] / seconds if seconds else None
+
+    finished = datetime.now()
+    return {
+        'run_started': _run_started.isoformat(timespec='seconds'),
+        'run_finished': finished.isoformat(timespec='seconds'),
+        'duration_seconds': (finished - _run_started).total_seconds(),
+        'stages': stages,
+        'metrics': metrics,
+    }
+
+
+def write_run_summary(path: Optional[str] = None) -> Dict[str, Any]:
+    """Write `run_summary()` as JSON to `path` (default METRICS_CONFIG['summary_path'])."""
+    path = path or METRICS_CONFIG['summary_path']
+    summary = run_summary()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def write_textfile(path: Optional[str] = None) -> None:
+    """Write the metrics in Prometheus text format (for node_exporter's textfile collector)."""
+    path = path or METRICS_CONFIG['textfile']
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_to_textfile(path, collection_registry())
+
+
+def start_exporter(port: Optional[int] = None) -> None:
+    """Serve the metrics over HTTP on `port` (default METRICS_CONFIG['http_port'])."""
+    start_http_server(port or METRICS_CONFIG['http_port'], registry=collection_registry())
+
+
+def export_metrics() -> Optional[Dict[str, Any]]:
+    """Write the configured textfile and JSON run summary; returns the summary."""
+    if not METRICS_CONFIG['enabled']:
+        return None
+    if METRICS_CONFIG['textfile']:
+        write_textfile()
+    if METRICS_CONFIG['summary_path']:
+        summary = write_run_summary()
+        print(f"📈 Metrics written to {METRICS_CONFIG['textfile']} and {METRICS_CONFIG['summary_path']}")
+        return summary
+    return run_summary()
@@ -0,0 +1,397 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.settings import (
+    ASPECTS_CONFIG, BANK_APPS, METRICS_CONFIG, PIPELINE_CONFIG, PREPROCESSING_CONFIG, SCRAPING_CONFIG,
+    SENTIMENT_CONFIG, STORAGE_CONFIG
+)
+from src.analysis.sentiment import ANALYZERS, add_sentiment_columns
+from src.analysis.sentiment_cache import get_sentiment_cache
+from src.preprocessing.preprocess import (
+    REQUIRED_COLUMNS, discover_inputs, make_aspect_tagger, make_seen_set, preprocess_chunk, rows_per_chunk
+)
+from src.preprocessing.near_duplicates import make_near_duplicate_index
+from src.storage import ReviewSink, iter_review_chunks
+from src.metrics import export_metrics, record_stage, start_exporter
+
+# Stage DAG: each stage lists the stages whose output it consumes
+STAGE_DEPENDENCIES = {
+    'scrape': [],
+    'preprocess': ['scrape'],
+    'sentiment': ['preprocess'],
+    'load': ['sentiment'],
+}
+
+# Per-bank stages that transform review batches, in data-flow order
+BATCH_STAGES = ['preprocess', 'sentiment']
+
+# Bump to invalidate cached outputs when a stage's logic changes
+STAGE_VERSIONS = {'preprocess': 1, 'sentiment': 1, 'load': 1}
+
+StageFn = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def stage_order(selected: List[str]) -> List[str]:
+    """Selected stages in dependency order."""
+    unknown = set(selected) - set(STAGE_DEPENDENCIES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+    order = TopologicalSorter(STAGE_DEPENDENCIES).static_order()
+    return [stage for stage in order if stage in selected]
+
+
+def file_fingerprint(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _sentiment_params() -> Dict[str, Any]:
+    """The configured analyzer, its version and label thresholds."""
+    analyzer = SENTIMENT_CONFIG['analyzer']
+    return {
+        'analyzer': analyzer,
+        'analyzer_version': ANALYZERS[analyzer][2](),
+        'positive_threshold': SENTIMENT_CONFIG['positive_threshold'],
+        'negative_threshold': SENTIMENT_CONFIG['negative_threshold'],
+    }
+
+
+def stage_params(stage: str) -> Dict[str, Any]:
+    """Settings that change a stage's output, folded into its fingerprint."""
+    if stage == 'preprocess':
+        params = {
+            'dedup': PREPROCESSING_CONFIG['dedup'],
+            'bloom_capacity': PREPROCESSING_CONFIG['bloom_capacity'],
+            'bloom_error_rate': PREPROCESSING_CONFIG['bloom_error_rate'],
+            'near_duplicates': PREPROCESSING_CONFIG['near_duplicates'],
+            'aspects': ASPECTS_CONFIG,
+        }
+        if ASPECTS_CONFIG['enabled'] and ASPECTS_CONFIG['sentiment']:
+            # Aspect scores and labels come from the sentiment analyzer
+            params['aspect_sentiment'] = _sentiment_params()
+        return params
+    if stage == 'sentiment':
+        return _sentiment_params()
+    return {}
+
+
+def stage_fingerprint(stage: str, upstream_fingerprint: str) -> str:
+    """Fingerprint of a stage's output: its version and settings plus its input's fingerprint."""
+    payload = json.dumps({
+        'stage': stage,
+        'version': STAGE_VERSIONS[stage],
+        'params': stage_params(stage),
+        'input': upstream_fingerprint,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def stage_output(stage: str, bank: str) -> str:
+    """Where a batch stage writes a bank's output."""
+    fmt = STORAGE_CONFIG['format']
+    if stage == 'sentiment':
+        # Final output, in the layout load_to_postgres.py reads
+        return os.path.join(PIPELINE_CONFIG['processed_dir'], f"cleaned_bank_reviews_{bank}.{fmt}")
+    return os.path.join(PIPELINE_CONFIG['cache_dir'], f"{stage}_bank_reviews_{bank}.{fmt}")
+
+
+class StageManifest:
+    """
+    JSON record of each stage's last successful output per bank.
+
+    A stage is skipped when its recorded fingerprint matches the current one
+    and its output file still exists.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+
+    def is_current(self, stage: str, bank: str, fingerprint: str, output: Optional[str] = None) -> bool:
+        entry = self._entries.get(f"{stage}:{bank}")
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return False
+        return output is None or os.path.exists(output)
+
+    def record(self, stage: str, bank: str, fingerprint: str, rows: int) -> None:
+        self._entries[f"{stage}:{bank}"] = {
+            'fingerprint': fingerprint,
+            'rows': rows,
+            'completed_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self.save()
+
+    def rows(self, stage: str, bank: str) -> int:
+        return self._entries.get(f"{stage}:{bank}", {}).get('rows', 0)
+
+    def save(self) -> None:
+        """Write the manifest atomically to disk."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _stage_function(stage: str, bank: str) -> StageFn:
+    """Batch transform for one bank (stateful across batches, e.g. the dedup seen-set)."""
+    if stage == 'preprocess':
+        seen = make_seen_set()
+        near_duplicates = make_near_duplicate_index()
+        aspect_tagger = make_aspect_tagger()
+        return lambda chunk: preprocess_chunk(chunk, bank, seen, near_duplicates, aspect_tagger)
+    cache = get_sentiment_cache()
+    return lambda chunk: add_sentiment_columns(chunk, 'review', cache=cache, use_cache=cache is not None)
+
+
+def _partial_path(path: str) -> str:
+    """Temporary path a stage writes to before its output is committed."""
+    root, suffix = os.path.splitext(path)
+    return f"{root}.partial{suffix}"
+
+
+def run_batch_stages(
+    stages: List[str],
+    bank: str,
+    source_path: str,
+    source_columns: Optional[List[str]],
+    chunksize: int
+) -> List[Dict[str, Any]]:
+    """
+    Stream a bank's batches through `stages` in one pass.
+
+    Each batch read from `source_path` goes through every stage in turn and
+    is appended to each stage's output, so only one batch is in memory at a
+    time and no stage re-reads the previous stage's file. Outputs are
+    written to `.partial` files and renamed once every batch succeeded.
+    """
+    functions = [_stage_function(stage, bank) for stage in stages]
+    reports = [{'stage': stage, 'bank': bank, 'status': 'ran', 'rows_in': 0, 'rows_out': 0, 'seconds': 0.0}
+               for stage in stages]
+    sinks = [ReviewSink(_partial_path(stage_output(stage, bank))) for stage in stages]
+    try:
+        batches = iter_review_chunks(source_path, chunksize, source_columns)
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            reports[0]['seconds'] += time.perf_counter() - start
+            if batch is None:
+                break
+            # Empty batches go through every stage too, so each output gets its columns
+            for function, sink, report in zip(functions, sinks, reports):
+                start = time.perf_counter()
+                report['rows_in'] += len(batch)
+                batch = function(batch)
+                sink.write(batch)
+                report['rows_out'] += len(batch)
+                report['seconds'] += time.perf_counter() - start
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    for stage, sink in zip(stages, sinks):
+        output = stage_output(stage, bank)
+        if os.path.exists(sink.path):
+            os.replace(sink.path, output)
+        elif os.path.exists(output):
+            # Nothing was read: the previous run's output must not be served as this one's
+            os.remove(output)
+    return reports
+
+
+class _Loader:
+    """Lazily creates the database loader, so DB packages are only imported when loading."""
+
+    def __init__(self):
+        self._loader = None
+
+    def upsert(self, bank: str, path: str) -> bool:
+        if self._loader is None:
+            sys.path.append(str(Path(project_root) / 'data' / 'database'))
+            from load_to_postgres import BankReviewLoader
+            self._loader = BankReviewLoader()
+            self._loader.ensure_tables()
+        bank_name = BANK_APPS.get(bank, {}).get('full_name', bank.upper())
+        return self._loader.upsert_bank_data(bank_name, path)
+
+
+def _plan_stages(
+    bank: str,
+    fingerprint: str,
+    stages: List[str],
+    manifest: StageManifest,
+    force: bool
+) -> List[Tuple[str, str, str]]:
+    """(stage, fingerprint, 'cached' | 'pending' | 'skipped') for each per-bank stage."""
+    plan = []
+    available = True
+    for stage in BATCH_STAGES + ['load']:
+        fingerprint = stage_fingerprint(stage, fingerprint)
+        output = stage_output(stage, bank) if stage in BATCH_STAGES else None
+        if not force and manifest.is_current(stage, bank, fingerprint, output):
+            status = 'cached'
+        elif stage in stages and available:
+            status = 'pending'
+        else:
+            status = 'skipped'
+            available = False
+        plan.append((stage, fingerprint, status))
+    return plan
+
+
+def _fused_run(raw_path: Path, bank: str, statuses: Dict[str, str]) -> Tuple[List[str], str, Optional[List[str]]]:
+    """
+    The consecutive pending batch stages to run fused, and the file (with the
+    columns to read) they start from: the last output before them.
+    """
+    run = [stage for stage in BATCH_STAGES if statuses[stage] == 'pending']
+    if not run:
+        return [], '', None
+    first = BATCH_STAGES.index(run[0])
+    run = [stage for stage in BATCH_STAGES[first:first + len(run)] if statuses[stage] == 'pending']
+    if first == 0:
+        return run, str(raw_path), REQUIRED_COLUMNS
+    return run, stage_output(BATCH_STAGES[first - 1], bank), None
+
+
+def _load_report(bank: str, stage: str, fingerprint: str, manifest: StageManifest, loader: _Loader) -> Dict[str, Any]:
+    """Upsert a bank's final output into the database and report on it."""
+    start = time.perf_counter()
+    rows = manifest.rows('sentiment', bank)
+    ok = loader.upsert(bank, stage_output('sentiment', bank))
+    if ok:
+        manifest.record(stage, bank, fingerprint, rows)
+    return {'stage': stage, 'bank': bank, 'status': 'ran' if ok else 'failed', 'rows_in': rows,
+            'rows_out': rows if ok else 0, 'seconds': time.perf_counter() - start}
+
+
+def run_bank(
+    raw_path: Path,
+    stages: List[str],
+    manifest: StageManifest,
+    loader: _Loader,
+    force: bool = False
+) -> List[Dict[str, Any]]:
+    """Run the per-bank stages for one raw review file, skipping stages whose output is current."""
+    bank = raw_path.stem.split('_')[-1]
+    plan = _plan_stages(bank, file_fingerprint(str(raw_path)), stages, manifest, force)
+    statuses = {stage: status for stage, _, status in plan}
+    fingerprints = {stage: fp for stage, fp, _ in plan}
+    reports = []
+
+    run, source_path, source_columns = _fused_run(raw_path, bank, statuses)
+    if run:
+        chunksize = PIPELINE_CONFIG['chunksize'] or rows_per_chunk(
+            source_path, PREPROCESSING_CONFIG['memory_budget_mb']
+        )
+        try:
+            reports += run_batch_stages(run, bank, source_path, source_columns, chunksize)
+        except Exception as e:
+            print(f"❌ {bank.upper()}: {', '.join(run)} failed - {str(e)}")
+            return [{'stage': stage, 'bank': bank, 'status': 'failed'} for stage in run]
+        for report in reports:
+            manifest.record(report['stage'], bank, fingerprints[report['stage']], report['rows_out'])
+
+    for stage, fingerprint, status in plan:
+        if stage not in stages or stage in run:
+            continue
+        if status == 'pending':  # load
+            reports.append(_load_report(bank, stage, fingerprint, manifest, loader))
+            continue
+        report = {'stage': stage, 'bank': bank, 'status': status}
+        if status == 'cached':
+            report['rows_out'] = manifest.rows(stage, bank)
+        reports.append(report)
+    return reports
+
+
+def run_pipeline(stages: Optional[List[str]] = None, force: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run the selected stages (default PIPELINE_CONFIG['stages']) in DAG order.
+
+    Returns one report per stage and bank with its status ('ran', 'cached',
+    'skipped' or 'failed'), row counts and timing.
+    """
+    stages = stage_order(stages or PIPELINE_CONFIG['stages'])
+    reports = []
+
+    if 'scrape' in stages:
+        from src.main import main as scrape
+        start = time.perf_counter()
+        scrape()
+        reports.append({'stage': 'scrape', 'bank': '*', 'status': 'ran', 'seconds': time.perf_counter() - start})
+
+    manifest = StageManifest(os.path.join(PIPELINE_CONFIG['cache_dir'], 'manifest.json'))
+    loader = _Loader()
+    inputs = discover_inputs(Path(SCRAPING_CONFIG['output']['directory']))
+    if not inputs:
+        print(f"❌ No bank_reviews_* files found in {SCRAPING_CONFIG['output']['directory']}")
+    for raw_path in inputs:
+        print(f"\n🔍 {raw_path.stem.split('_')[-1].upper()}: {raw_path}")
+        reports += run_bank(raw_path, stages, manifest, loader, force=force)
+    return reports
+
+
+def print_report(reports: List[Dict[str, Any]]) -> None:
+    """Print per-stage status, row counts and timing."""
+    print("\n" + "="*60)
+    print("📊 Pipeline Summary")
+    print("="*60)
+    icons = {'ran': '✅', 'cached': '♻️ ', 'skipped': '⏭️ ', 'failed': '❌'}
+    for report in reports:
+        rows = ''
+        if 'rows_in' in report:
+            rows = f"{report['rows_in']} -> {report.get('rows_out', 0)} rows"
+        elif 'rows_out' in report:
+            rows = f"{report['rows_out']} rows"
+        seconds = f"{report['seconds']:.2f}s" if 'seconds' in report else ''
+        print(f"{icons.get(report['status'], '')} {report['stage']:<10} {report['bank'].upper():<7} "
+              f"{report['status']:<8} {rows:<24} {seconds}")
+    print("="*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bank reviews pipeline")
+    parser.add_argument('--stages', help=f"comma-separated stages to run (default: {','.join(PIPELINE_CONFIG['stages'])})")
+    parser.add_argument('--force', action='store_true', help="ignore cached stage outputs")
+    args = parser.parse_args()
+
+    stages = args.stages.split(',') if args.stages else None
+    if METRICS_CONFIG['enabled'] and METRICS_CONFIG['http_port']:
+        start_exporter()
+    reports = run_pipeline(stages, force=args.force)
+    print_report(reports)
+    for report in reports:
+        if report['status'] == 'ran':
+            record_stage(report['stage'], report.get('rows_out', 0), report['seconds'])
+    export_metrics()
+    if any(report['status'] == 'failed' for report in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
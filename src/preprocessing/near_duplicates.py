@@ -0,0 +1,184 @@
+"""
+Near-duplicate review detection with MinHash signatures and an LSH index.
+
+Each review is normalized (lowercased, punctuation dropped), split into
+character shingles and summarized by a MinHash signature whose agreement
+rate estimates the Jaccard similarity of two reviews' shingle sets. The
+signature is cut into bands; reviews sharing any band are candidates, and a
+candidate counts as a near-duplicate when its estimated similarity reaches
+the threshold. Each review is only compared against the representatives of
+the buckets it falls in, so detection runs in near-linear time.
+"""
+import re
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import PREPROCESSING_CONFIG
+
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHIFT = np.uint64(32)
+# Hash keys must be 16 characters long
+_SHINGLE_KEY = 'near-dup-shingle'
+# Upper bound on permutation x shingle values computed at once
+_BATCH_ELEMENTS = 1 << 23
+
+_PUNCTUATION = re.compile(r'[^\w\s]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(text: Any) -> str:
+    """Lowercase, drop punctuation and emojis, and collapse whitespace."""
+    if not isinstance(text, str):
+        return ''
+    return _WHITESPACE.sub(' ', _PUNCTUATION.sub(' ', text.lower())).strip()
+
+
+def shingles(text: str, size: int) -> List[str]:
+    """Overlapping character `size`-grams of `text` (the whole text when shorter)."""
+    if len(text) <= size:
+        return [text]
+    return [text[i:i + size] for i in range(len(text) - size + 1)]
+
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows) splitting `num_perm` so that pairs at `threshold` are very
+    likely to share a band: the S-curve midpoint (1/bands)**(1/rows) is the
+    largest one not above the threshold.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [option for option in options if (1 / option[0]) ** (1 / option[1]) <= threshold]
+    if not below:
+        return options[0]
+    return max(below, key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index of representative reviews.
+
+    `add()` returns, for each new review, the id of an earlier review it
+    near-duplicates (or None, in which case the review becomes a
+    representative). State persists across calls, so one index can dedupe a
+    bank's reviews chunk by chunk.
+
+    Args:
+        threshold: Estimated Jaccard similarity at which reviews are near-duplicates
+        num_perm: MinHash signature length (more = more accurate, slower)
+        shingle_size: Characters per shingle
+        seed: Seed for the hash permutations
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        shingle_size: Optional[int] = None,
+        seed: int = 1
+    ):
+        config = PREPROCESSING_CONFIG['near_duplicates']
+        self.threshold = threshold if threshold is not None else config['threshold']
+        self.num_perm = num_perm or config['num_perm']
+        self.shingle_size = shingle_size or config['shingle_size']
+        self.bands, self.rows = lsh_bands(self.threshold, self.num_perm)
+
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash functions ((a * x + b) mod 2**64) >> 32, a odd
+        self._a = rng.integers(0, 1 << 64, size=self.num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 64, size=self.num_perm, dtype=np.uint64, endpoint=False)
+        self._band_mix = rng.integers(1, 1 << 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self._tables: List[dict] = [{} for _ in range(self.bands)]
+        self._signatures: List[np.ndarray] = []
+        self._ids: List[Any] = []
+
+    def __len__(self) -> int:
+        """Number of representative reviews indexed."""
+        return len(self._ids)
+
+    def signatures(self, texts: Iterable[Any]) -> np.ndarray:
+        """MinHash signatures of `texts`, one row of `num_perm` values each."""
+        return self._minhash([normalize(text) for text in texts])
+
+    def _minhash(self, normalized: List[str]) -> np.ndarray:
+        # Identical texts share one signature
+        codes, unique = pd.factorize(pd.Series(normalized, dtype=object))
+        docs = [shingles(text, self.shingle_size) for text in unique]
+        signatures = np.empty((len(docs), self.num_perm), dtype=np.uint64)
+        per_batch = max(1, _BATCH_ELEMENTS // self.num_perm)
+
+        start = 0
+        while start < len(docs):
+            # Take documents until the batch holds about `per_batch` shingles
+            end, total = start, 0
+            while end < len(docs) and (total == 0 or total + len(docs[end]) <= per_batch):
+                total += len(docs[end])
+                end += 1
+            batch = docs[start:end]
+            flat = np.array([s for doc in batch for s in doc], dtype=object)
+            hashes = pd.util.hash_array(flat, hash_key=_SHINGLE_KEY) & _MAX_HASH
+            values = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> _SHIFT
+            offsets = np.cumsum([0] + [len(doc) for doc in batch[:-1]])
+            signatures[start:end] = np.minimum.reduceat(values, offsets, axis=1).T
+            start = end
+        return signatures[codes]
+
+    def _band_keys(self, signatures: np.ndarray) -> List[List[int]]:
+        bands = signatures.reshape(len(signatures), self.bands, self.rows)
+        return (bands * self._band_mix).sum(axis=2).tolist()
+
+    def add(self, texts: Sequence[Any], ids: Optional[Sequence[Any]] = None) -> List[Any]:
+        """
+        Index `texts`, returning for each the id of the earlier representative
+        it near-duplicates, or None when it is new. `ids` default to each
+        text's position in the index. Texts with no words (e.g. emoji-only
+        reviews) are never matched or indexed.
+        """
+        if ids is None:
+            ids = range(len(self._ids), len(self._ids) + len(texts))
+        normalized = [normalize(text) for text in texts]
+        signatures = self._minhash(normalized)
+        keys = self._band_keys(signatures)
+
+        matches: List[Any] = []
+        for text, signature, row_keys, review_id in zip(normalized, signatures, keys, ids):
+            match = None
+            if not text:
+                matches.append(None)
+                continue
+            for table, key in zip(self._tables, row_keys):
+                candidate = table.get(key)
+                if candidate is None:
+                    continue
+                similarity = np.count_nonzero(self._signatures[candidate] == signature) / self.num_perm
+                if similarity >= self.threshold:
+                    match = self._ids[candidate]
+                    break
+            if match is None:
+                position = len(self._ids)
+                self._ids.append(review_id)
+                self._signatures.append(signature)
+                for table, key in zip(self._tables, row_keys):
+                    table.setdefault(key, position)
+            matches.append(match)
+        return matches
+
+
+def make_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """A new index when near-duplicate detection is enabled in the config, else None."""
+    if not PREPROCESSING_CONFIG['near_duplicates']['enabled']:
+        return None
+    return NearDuplicateIndex()
+
+
+def find_near_duplicates(df: pd.DataFrame, index: NearDuplicateIndex, column: str = 'review') -> pd.Series:
+    """
+    Index `df[column]` and return, per row, the review_id (or row label when
+    there is no review_id column) of the earlier review it near-duplicates,
+    or '' for rows that are not near-duplicates.
+    """
+    ids = df['review_id'].astype(str).tolist() if 'review_id' in df.columns else df.index.tolist()
+    matches = index.add(df[column].tolist(), ids)
+    return pd.Series(['' if match is None else match for match in matches], index=df.index, dtype=object)
@@ -1,9 +1,12 @@
 import pandas as pd
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import logging
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 # Set up logging
 logging.basicConfig(
@@ -16,12 +19,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.settings import ASPECTS_CONFIG, PREPROCESSING_CONFIG, STORAGE_CONFIG
+from src.storage import ReviewSink, iter_review_chunks, read_reviews, write_reviews
+from src.utils.seen_sets import BloomFilter, HashedIdSet
+from src.preprocessing.near_duplicates import NearDuplicateIndex, find_near_duplicates, make_near_duplicate_index
+from src.metrics import (
+    ROWS_DROPPED, CounterValues, add_counter_deltas, counter_deltas, counter_values, export_metrics, record_stage
+)
+
+if TYPE_CHECKING:
+    from src.analysis.aspects import AspectTagger
+
+REQUIRED_COLUMNS = ['review_id', 'review', 'rating', 'date']
+
 def load_data(file_path: str) -> Optional[pd.DataFrame]:
-    """Load and validate the input CSV file."""
+    """Load and validate the input CSV or Parquet file (only the columns preprocessing uses)."""
     try:
-        df = pd.read_csv(file_path)
-        required_columns = ['review_id', 'review', 'rating', 'date']
-        missing = [col for col in required_columns if col not in df.columns]
+        df = read_reviews(file_path, columns=REQUIRED_COLUMNS)
+        missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         if missing:
             logger.error(f"Missing required columns: {', '.join(missing)}")
             return None
@@ -36,35 +56,87 @@ def clean_text(text: str) -> str:
         return ""
     return str(text).strip()
 
-def preprocess_data(df: pd.DataFrame, bank_name: str) -> pd.DataFrame:
-    """Clean and preprocess the review data."""
+def preprocess_data(
+    df: pd.DataFrame,
+    bank_name: str,
+    keep_review_id: bool = False,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    aspect_tagger: Optional['AspectTagger'] = None
+) -> pd.DataFrame:
+    """
+    Clean and preprocess the review data.
+
+    With `keep_review_id=True` the Play Store `review_id` is kept as the
+    first column, so the database load can upsert on it.
+
+    When near-duplicate detection is enabled, reviews that near-duplicate an
+    earlier review of the bank are flagged in a `duplicate_of` column (the
+    earlier review's id) or dropped, per PREPROCESSING_CONFIG. Pass the same
+    `near_duplicates` index for every chunk of a bank; by default a new index
+    is used for this call.
+
+    When aspect tagging is enabled (ASPECTS_CONFIG), the cleaned reviews get
+    multi-label aspect columns with per-aspect sentiment. Pass one compiled
+    `aspect_tagger` for all chunks to avoid rebuilding it.
+    """
+    bank = bank_name.upper()
+    near_config = PREPROCESSING_CONFIG['near_duplicates']
+    if near_duplicates is None:
+        near_duplicates = make_near_duplicate_index()
+    if aspect_tagger is None:
+        aspect_tagger = make_aspect_tagger()
+    
     # 1. Remove duplicates
+    rows = len(df)
     df = df.drop_duplicates(subset=['review_id'])
+    ROWS_DROPPED.labels(bank, 'duplicate').inc(rows - len(df))
     
     # 2. Clean review text
-    df['review'] = df['review'].apply(clean_text)
+    rows = len(df)
+    df = df.assign(review=df['review'].apply(clean_text))
     df = df[df['review'] != '']
+    ROWS_DROPPED.labels(bank, 'empty_review').inc(rows - len(df))
     
     # 3. Validate and clean ratings
-    df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+    rows = len(df)
+    df = df.assign(rating=pd.to_numeric(df['rating'], errors='coerce'))
     df = df[df['rating'].between(1, 5)]
+    ROWS_DROPPED.labels(bank, 'invalid_rating').inc(rows - len(df))
     
-    # 4. Clean and format dates
-    df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.date
+    # 4. Flag or collapse near-duplicate reviews
+    if near_duplicates is not None:
+        duplicate_of = find_near_duplicates(df, near_duplicates, near_config['column'])
+        if near_config['mode'] == 'collapse':
+            rows = len(df)
+            df = df[duplicate_of == '']
+            ROWS_DROPPED.labels(bank, 'near_duplicate').inc(rows - len(df))
+        else:
+            df = df.assign(duplicate_of=duplicate_of)
+    
+    # 5. Clean and format dates
+    df = df.assign(date=pd.to_datetime(df['date'], errors='coerce').dt.date)
     
-    # 5. Add metadata
-    df['bank'] = bank_name.upper()
-    df['source'] = 'Google Play Store'
+    # 6. Add metadata
+    df = df.assign(bank=bank, source='Google Play Store')
     
-    # 6. Select and order columns
+    # 7. Select and order columns
     columns = ['review', 'rating', 'date', 'bank', 'source']
-    return df[columns]
+    if keep_review_id:
+        columns = ['review_id'] + columns
+    if 'duplicate_of' in df.columns:
+        columns.append('duplicate_of')
+    df = df[columns]
+    
+    # 8. Tag aspects
+    if aspect_tagger is not None:
+        from src.analysis.aspects import add_aspect_columns
+        df = add_aspect_columns(df.copy(), aspect_tagger)
+    return df
 
 def save_processed_data(df: pd.DataFrame, output_path: str) -> bool:
-    """Save the processed data to CSV."""
+    """Save the processed data to CSV or Parquet, depending on the file suffix."""
     try:
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        df.to_csv(output_path, index=False)
+        write_reviews(df, output_path)
         return True
     except Exception as e:
         logger.error(f"Error saving to {output_path}: {str(e)}")
@@ -83,7 +155,7 @@ def process_bank(input_file: str, output_file: str) -> Dict:
     initial_count = len(df)
     
     # Preprocess data
-    processed_df = preprocess_data(df, bank_name)
+    processed_df = preprocess_data(df, bank_name, keep_review_id=True)
     final_count = len(processed_df)
     
     # Save results
@@ -97,6 +169,205 @@ def process_bank(input_file: str, output_file: str) -> Dict:
         }
     return {'bank': bank_name, 'status': 'failed', 'reason': 'save_error'}
 
+def rows_per_chunk(file_path: str, memory_budget_mb: float) -> int:
+    """Estimate how many rows fit in the memory budget from a sample of the file."""
+    sample = next(iter_review_chunks(file_path, 1000, REQUIRED_COLUMNS))
+    bytes_per_row = max(1, sample.memory_usage(deep=True).sum() / max(len(sample), 1))
+    # preprocess_data holds a few copies of the chunk at once
+    return max(1000, int(memory_budget_mb * 1024 * 1024 / (bytes_per_row * 4)))
+
+def make_seen_set(dedup: Optional[str] = None):
+    """Cross-chunk review_id seen-set for `dedup` ('exact' or 'bloom', default from config)."""
+    dedup = dedup or PREPROCESSING_CONFIG['dedup']
+    if dedup == 'bloom':
+        return BloomFilter(PREPROCESSING_CONFIG['bloom_capacity'], PREPROCESSING_CONFIG['bloom_error_rate'])
+    return HashedIdSet()
+
+def make_aspect_tagger() -> Optional['AspectTagger']:
+    """A tagger for the configured aspects when tagging is enabled, else None."""
+    if not ASPECTS_CONFIG['enabled']:
+        return None
+    # Imported here: aspect sentiment needs the sentiment stack (textblob)
+    from src.analysis.aspects import AspectTagger
+    return AspectTagger()
+
+def preprocess_chunk(
+    chunk: pd.DataFrame,
+    bank_name: str,
+    seen,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    aspect_tagger: Optional['AspectTagger'] = None
+) -> pd.DataFrame:
+    """
+    Drop review_ids already in `seen` (adding the rest) and clean the chunk
+    with `preprocess_data`, checking near-duplicates against `near_duplicates`
+    (shared by all chunks of the bank) when detection is enabled and tagging
+    aspects with `aspect_tagger`.
+    """
+    seen_before = seen.check_and_add(chunk['review_id'].astype(str))
+    ROWS_DROPPED.labels(bank_name.upper(), 'duplicate').inc(int(seen_before.sum()))
+    chunk = chunk[~seen_before]
+    return preprocess_data(chunk, bank_name, keep_review_id=True, near_duplicates=near_duplicates,
+                           aspect_tagger=aspect_tagger)
+
+def process_bank_streaming(
+    input_file: str,
+    output_file: str,
+    chunksize: Optional[int] = None,
+    dedup: Optional[str] = None
+) -> Dict:
+    """
+    Process a single bank's data in fixed-size chunks.
+
+    Memory use stays flat regardless of input size: each chunk is cleaned
+    with `preprocess_data` and appended to the output, and duplicate
+    `review_id`s across chunks are tracked in a compact hashed seen-set or,
+    with `dedup='bloom'`, a fixed-size Bloom filter. Chunks go to a `.tmp`
+    file that replaces `output_file` only once the whole input was
+    processed, so a failed run leaves the previous output in place. Returns
+    the same summary dict as `process_bank`.
+    """
+    bank_name = Path(input_file).stem.split('_')[-1]
+    logger.info(f"\nProcessing {bank_name.upper()} (streaming)...")
+
+    seen = make_seen_set(dedup)
+    near_duplicates = make_near_duplicate_index()
+    aspect_tagger = make_aspect_tagger()
+
+    root, suffix = os.path.splitext(output_file)
+    tmp_path = f"{root}.tmp{suffix}"
+    initial_count = 0
+    failure = None
+    try:
+        chunksize = chunksize or PREPROCESSING_CONFIG['chunksize'] or rows_per_chunk(
+            input_file, PREPROCESSING_CONFIG['memory_budget_mb']
+        )
+        with ReviewSink(tmp_path) as sink:
+            for chunk in iter_review_chunks(input_file, chunksize, REQUIRED_COLUMNS):
+                missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+                if missing:
+                    logger.error(f"Missing required columns: {', '.join(missing)}")
+                    failure = 'load_error'
+                    break
+                initial_count += len(chunk)
+                sink.write(preprocess_chunk(chunk, bank_name, seen, near_duplicates, aspect_tagger))
+            final_count = sink.rows
+    except Exception as e:
+        logger.error(f"Error streaming {input_file} to {output_file}: {str(e)}")
+        failure = 'stream_error'
+    if failure:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return {'bank': bank_name, 'status': 'failed', 'reason': failure}
+    os.replace(tmp_path, output_file)
+
+    logger.info(f"{bank_name.upper()}: streamed {initial_count} rows in chunks of {chunksize} "
+                f"(seen-set {seen.nbytes / 1024:.0f} KB)")
+    return {
+        'bank': bank_name.upper(),
+        'status': 'success',
+        'initial_rows': initial_count,
+        'final_rows': final_count,
+        'duplicates_removed': initial_count - final_count
+    }
+
+class _CapturingHandler(logging.Handler):
+    """Collects log messages so a worker's output can be replayed in order."""
+    def __init__(self):
+        super().__init__()
+        self.messages: List[Tuple[int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append((record.levelno, record.getMessage()))
+
+def _process_bank_worker(
+    input_file: str,
+    output_file: str,
+    streaming: bool
+) -> Tuple[Dict, List[Tuple[int, str]], CounterValues]:
+    """
+    Run one bank in a worker process, returning its result, captured log
+    lines and how much the metric counters grew.
+    """
+    metrics_before = counter_values()
+    handler = _CapturingHandler()
+    logger.addHandler(handler)
+    logger.propagate = False
+    start = time.perf_counter()
+    try:
+        if streaming:
+            result = process_bank_streaming(input_file, output_file)
+        else:
+            result = process_bank(input_file, output_file)
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = True
+    result['seconds'] = time.perf_counter() - start
+    return result, handler.messages, counter_deltas(metrics_before)
+
+def discover_inputs(data_dir: Path) -> List[Path]:
+    """
+    Find every bank_reviews_*.csv / .parquet file in `data_dir`.
+
+    When a bank has both formats, the one matching STORAGE_CONFIG['format']
+    wins.
+    """
+    inputs: Dict[str, Path] = {}
+    preferred = f".{STORAGE_CONFIG['format']}"
+    for path in sorted(data_dir.glob('bank_reviews_*')):
+        if path.suffix not in ('.csv', '.parquet'):
+            continue
+        if path.stem not in inputs or path.suffix == preferred:
+            inputs[path.stem] = path
+    return [inputs[stem] for stem in sorted(inputs)]
+
+def process_all_banks(data_dir: Path, output_dir: Path, workers: Optional[int] = None) -> List[Dict]:
+    """
+    Preprocess every discovered bank file across a process pool.
+
+    Each worker's log lines are buffered and replayed bank by bank, so the
+    log stays readable, and its counter growth is added to this process's
+    metrics. Results are returned in input order.
+    """
+    inputs = discover_inputs(data_dir)
+    if not inputs:
+        logger.error(f"No bank_reviews_* files found in {data_dir}")
+        return []
+
+    streaming = PREPROCESSING_CONFIG['streaming']
+    jobs = [
+        (str(path), str(output_dir / f"cleaned_{path.stem}.{STORAGE_CONFIG['format']}"), streaming)
+        for path in inputs
+    ]
+    workers = workers or PREPROCESSING_CONFIG['workers'] or os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    logger.info(f"Preprocessing {len(jobs)} bank files with {workers} worker(s)")
+
+    if workers == 1:
+        # In-process: the counters were already incremented here
+        outputs = [_process_bank_worker(*job)[:2] for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_process_bank_worker, *job) for job in jobs]
+            outputs = []
+            for job, future in zip(jobs, futures):
+                try:
+                    result, messages, deltas = future.result()
+                    add_counter_deltas(deltas)
+                    outputs.append((result, messages))
+                except Exception as e:
+                    bank_name = Path(job[0]).stem.split('_')[-1]
+                    outputs.append(({'bank': bank_name, 'status': 'failed', 'reason': str(e)}, []))
+
+    results = []
+    for result, messages in outputs:
+        for level, message in messages:
+            logger.log(level, message)
+        if result['status'] == 'success':
+            record_stage('preprocess', result['final_rows'], result.get('seconds', 0.0))
+        results.append(result)
+    return results
+
 def main():
     """Main function to run the preprocessing pipeline."""
     # Set up paths
@@ -104,19 +375,8 @@ def main():
     data_dir = base_dir.parent / 'data'  # Changed: Now points to Week-2/data
     output_dir = data_dir / 'processed'
     
-    # Process each bank
-    bank_files = [
-        'bank_reviews_cbe.csv',
-        'bank_reviews_boa.csv',
-        'bank_reviews_dashen.csv'
-    ]
-    
-    results = []
-    for bank_file in bank_files:
-        input_path = data_dir / bank_file
-        output_path = output_dir / f"cleaned_{bank_file}"
-        result = process_bank(str(input_path), str(output_path))
-        results.append(result)
+    # Process every bank file found in the data directory
+    results = process_all_banks(data_dir, output_dir)
     
     # Print summary
     logger.info("\n=== Processing Summary ===")
@@ -128,6 +388,14 @@ def main():
             )
         else:
             logger.error(f"{result['bank']}: Failed - {result.get('reason', 'unknown')}")
+    succeeded = [r for r in results if r['status'] == 'success']
+    if succeeded:
+        logger.info(
+            f"TOTAL: {sum(r['final_rows'] for r in succeeded)} reviews from "
+            f"{len(succeeded)}/{len(results)} banks "
+            f"({sum(r['duplicates_removed'] for r in succeeded)} rows removed)"
+        )
+    export_metrics()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
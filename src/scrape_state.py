@@ -0,0 +1,74 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class ScrapeStateStore:
+    """
+    Small JSON-backed store of per-(app_id, lang) scraping high-water marks.
+
+    For every app/language pair it keeps the newest review timestamp seen and
+    a bounded list of the most recent review ids, so an incremental scrape can
+    stop paging as soon as it reaches reviews it already has.
+    """
+
+    def __init__(self, path: str, max_seen_ids: int = 2000):
+        self.path = path
+        self.max_seen_ids = max_seen_ids
+        self._state: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._state = json.load(f)
+
+    @staticmethod
+    def _key(app_id: str, lang: str) -> str:
+        return f"{app_id}:{lang}"
+
+    def last_seen_at(self, app_id: str, lang: str) -> Optional[datetime]:
+        """Timestamp of the newest review recorded for this app/language."""
+        entry = self._state.get(self._key(app_id, lang))
+        if not entry or not entry.get('last_at'):
+            return None
+        return datetime.fromisoformat(entry['last_at'])
+
+    def seen_ids(self, app_id: str, lang: str) -> set:
+        """Ids of the most recently recorded reviews for this app/language."""
+        entry = self._state.get(self._key(app_id, lang), {})
+        return set(entry.get('seen_ids', []))
+
+    def record(self, reviews: List[Dict[str, Any]]) -> None:
+        """
+        Advance the high-water marks using scraped reviews.
+
+        Reviews must carry the `app_id` and `language` tags added by the scraper.
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for review in reviews:
+            grouped.setdefault(self._key(review['app_id'], review['language']), []).append(review)
+
+        for key, group in grouped.items():
+            entry = self._state.setdefault(key, {'last_at': None, 'seen_ids': []})
+            group = sorted((r for r in group if r.get('at')), key=lambda r: r['at'], reverse=True)
+            if not group:
+                continue
+            newest = group[0]['at']
+            if entry['last_at'] is None or newest > datetime.fromisoformat(entry['last_at']):
+                entry['last_at'] = newest.isoformat()
+
+            # Keep the newest ids first, dropping the oldest beyond the limit
+            new_ids = [r['reviewId'] for r in group if r.get('reviewId')]
+            known = set(new_ids)
+            merged = new_ids + [i for i in entry['seen_ids'] if i not in known]
+            entry['seen_ids'] = merged[:self.max_seen_ids]
+            entry['updated'] = datetime.now().isoformat(timespec='seconds')
+
+    def save(self) -> None:
+        """Write the state atomically to disk."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=2)
+        os.replace(tmp_path, self.path)
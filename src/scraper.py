@@ -1,13 +1,163 @@
-from google_play_scraper import app, reviews_all, Sort
+import google_play_scraper
+from google_play_scraper import Sort
 from tqdm import tqdm
+import threading
 import time
-from typing import Dict, List, Optional, Any
-from config.settings import SCRAPING_CONFIG, LANGUAGE_CONFIG
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from urllib.parse import urlparse
+from google_play_scraper.exceptions import NotFoundError
+from google_play_scraper.features import reviews as play_reviews
+from config.settings import SCRAPING_CONFIG, LANGUAGE_CONFIG, RESILIENCE_CONFIG
+from src.utils.rate_limiter import HostRateLimiter
+from src.utils.resilience import PartialResultError, get_breaker, is_retryable, retry_call
+from src.scrape_state import ScrapeStateStore
+from src.metrics import REVIEWS_SCRAPED, SCRAPE_PAGE_RETRIES
+
+PLAY_STORE_HOST = 'play.google.com'
+
+_rate_limiter: Optional[HostRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def _play_store():
+    """
+    Module providing `app`, `reviews` and `reviews_all` for the configured
+    backend: google_play_scraper, or the local fake server when
+    SCRAPING_CONFIG['backend'] is 'fake'.
+    """
+    if SCRAPING_CONFIG.get('backend') == 'fake':
+        from src import fake_play_store
+        return fake_play_store
+    return google_play_scraper
+
+
+def _endpoint() -> str:
+    """Host of the configured backend, used to key rate limits and circuit breakers."""
+    if SCRAPING_CONFIG.get('backend') == 'fake':
+        return urlparse(SCRAPING_CONFIG['fake_server']['url']).netloc
+    return PLAY_STORE_HOST
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """
+    Process-wide per-host limiter from SCRAPING_CONFIG['concurrency'], shared
+    by sequential, incremental and concurrent scraping.
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            config = SCRAPING_CONFIG['concurrency']
+            _rate_limiter = HostRateLimiter(config['requests_per_second'], config['burst'])
+        return _rate_limiter
+
+
+def google_play_review_page(
+    app_id: str,
+    lang: str = 'en',
+    country: str = 'us',
+    sort: Sort = Sort.NEWEST,
+    count: int = 100,
+    filter_score_with: Optional[int] = None,
+    filter_device_with: Optional[int] = None,
+    continuation_token: Any = None
+) -> Tuple[List[Dict[str, Any]], Any]:
+    """
+    One request's worth of `google_play_scraper.reviews` that raises on failure.
+
+    The library's `reviews` swallows request errors and returns what it has
+    with no continuation token, which looks exactly like the last page, so a
+    throttled request would silently end the scrape. This fetches a single
+    page with the library's own request and parsing code instead, so the
+    page can be retried from its continuation token.
+
+    Relies on private internals of google-play-scraper 1.2.7 (pinned in
+    requirements.txt): `_fetch_review_items`, `_ContinuationToken`,
+    `Formats` and `ElementSpecs`. Re-check this function when upgrading.
+    """
+    token = None
+    if continuation_token is not None:
+        token = continuation_token.token
+        if token is None:
+            return [], continuation_token
+        lang, country = continuation_token.lang, continuation_token.country
+        sort, count = continuation_token.sort, continuation_token.count
+        filter_score_with = continuation_token.filter_score_with
+        filter_device_with = continuation_token.filter_device_with
+    sort_value = sort.value if isinstance(sort, Sort) else sort
+
+    items, token = play_reviews._fetch_review_items(
+        play_reviews.Formats.Reviews.build(lang=lang, country=country),
+        app_id,
+        sort_value,
+        min(count, play_reviews.MAX_COUNT_EACH_FETCH),
+        filter_score_with,
+        filter_device_with,
+        token
+    )
+    if isinstance(token, list):
+        token = None
+    page = [
+        {key: spec.extract_content(item) for key, spec in play_reviews.ElementSpecs.Review.items()}
+        for item in items
+    ]
+    return page, play_reviews._ContinuationToken(
+        token, lang, country, sort_value, count, filter_score_with, filter_device_with
+    )
+
+
+def _page_size() -> int:
+    """Reviews requested per page: the largest page the configured backend serves."""
+    if SCRAPING_CONFIG.get('backend') == 'fake':
+        from src.fake_play_store import MAX_PAGE_SIZE
+        return MAX_PAGE_SIZE
+    return play_reviews.MAX_COUNT_EACH_FETCH
+
+
+def _page_fetcher() -> Callable[..., Tuple[List[Dict[str, Any]], Any]]:
+    """Single-page fetcher with the `reviews` signature for the configured backend."""
+    store = _play_store()
+    return google_play_review_page if store is google_play_scraper else store.reviews
+
+
+def _page_retryable(error: Exception) -> bool:
+    return not isinstance(error, NotFoundError) and is_retryable(error)
+
+
+def fetch_review_page(
+    fetch_page: Callable[..., Tuple[List[Dict[str, Any]], Any]],
+    app_id: str,
+    host: Optional[str] = None,
+    limiter: Optional[HostRateLimiter] = None,
+    **kwargs
+) -> Tuple[List[Dict[str, Any]], Any]:
+    """
+    Fetch one page, retrying it from the same continuation token with
+    exponential backoff. Every attempt goes through the host's circuit
+    breaker and, when given, takes a token from the host's rate limiter.
+    An open circuit is waited out (up to RESILIENCE_CONFIG['circuit_wait']
+    seconds) so a page failing for one job does not abandon the next ones.
+    """
+    host = host or _endpoint()
+
+    def fetch():
+        if limiter is not None:
+            limiter.acquire(host)
+        return fetch_page(app_id, **kwargs)
+
+    return retry_call(
+        fetch,
+        breaker=get_breaker(host),
+        retry_if=_page_retryable,
+        on_retry=lambda attempt, error, delay: SCRAPE_PAGE_RETRIES.labels(app_id).inc(),
+        circuit_wait=RESILIENCE_CONFIG['circuit_wait']
+    )
+
 
 def get_app_info(app_id: str, lang: str = 'en') -> Optional[Dict[str, Any]]:
     """Fetch basic app information from Google Play Store."""
     try:
-        app_info = app(app_id, lang=lang)
+        app_info = _play_store().app(app_id, lang=lang)
         return {
             'title': app_info.get('title', ''),
             'score': app_info.get('score', 0),
@@ -22,7 +172,8 @@ def get_app_info(app_id: str, lang: str = 'en') -> Optional[Dict[str, Any]]:
 def scrape_app_reviews(
     app_id: str,
     count: int = 100,
-    languages: Optional[List[str]] = None
+    languages: Optional[List[str]] = None,
+    limiter: Optional[HostRateLimiter] = None
 ) -> List[Dict[str, Any]]:
     """
     Scrape reviews for a specific app in multiple languages.
@@ -31,12 +182,15 @@ def scrape_app_reviews(
         app_id: The app's package name
         count: Number of reviews per language
         languages: List of language codes to scrape
+        limiter: Per-host limiter taking a token per page (default: the
+            shared one from `get_rate_limiter`)
         
     Returns:
         List of review dictionaries with language information
     """
     if languages is None:
         languages = [LANGUAGE_CONFIG['default_language']]
+    limiter = limiter or get_rate_limiter()
         
     all_reviews = []
     
@@ -44,29 +198,248 @@ def scrape_app_reviews(
         try:
             print(f"  - Scraping {lang.upper()} reviews...")
             
-            reviews = reviews_all(
-                app_id,
-                sleep_milliseconds=1000,
-                lang=lang,
-                country=SCRAPING_CONFIG['country'],
-                sort=Sort.MOST_RELEVANT,
-                count=count
-            )
+            try:
+                reviews = resumable_reviews_all(
+                    app_id,
+                    limiter=limiter,
+                    lang=lang,
+                    country=SCRAPING_CONFIG['country'],
+                    sort=Sort.MOST_RELEVANT,
+                    count=count
+                )
+            except PartialResultError as e:
+                # Keep the pages fetched before the failure
+                reviews = e.results
+                print(f"  ⚠️  {lang.upper()} scrape stopped early: {e.cause}")
             
-            # Add language and timestamp to each review
-            timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-            for review in reviews:
-                review.update({
-                    'language': lang,
-                    'scrape_timestamp': timestamp,
-                    'app_id': app_id
-                })
-                
-            all_reviews.extend(reviews)
+            all_reviews.extend(_tag_reviews(reviews, app_id, lang))
             print(f"  ✓ Found {len(reviews)} {lang.upper()} reviews")
             
         except Exception as e:
             print(f"  ✗ Error scraping {lang.upper()} reviews: {e}")
             continue
                     
-    return all_reviews
\ No newline at end of file
+    return all_reviews
+
+
+def scrape_new_reviews(
+    app_id: str,
+    state: ScrapeStateStore,
+    languages: Optional[List[str]] = None,
+    page_size: Optional[int] = None,
+    fetch_page: Optional[Callable[..., Tuple[List[Dict[str, Any]], Any]]] = None,
+    limiter: Optional[HostRateLimiter] = None
+) -> List[Dict[str, Any]]:
+    """
+    Scrape only reviews newer than the stored high-water mark.
+
+    Pages through reviews sorted newest first and stops at the first review
+    whose id was already recorded or that is older than the last seen
+    timestamp. The state store is not modified; call `state.record()` once
+    the new reviews have been saved.
+
+    Args:
+        app_id: The app's package name
+        state: Store holding the per-(app_id, lang) high-water marks
+        languages: List of language codes to scrape
+        page_size: Reviews requested per page
+        fetch_page: Function with the `reviews` signature (default: a
+            single-page fetcher for the configured backend); failed pages
+            are retried with backoff
+        limiter: Per-host limiter taking a token per page (default: the
+            shared one from `get_rate_limiter`)
+
+    Returns:
+        List of new review dictionaries with language information
+    """
+    if languages is None:
+        languages = [LANGUAGE_CONFIG['default_language']]
+    if page_size is None:
+        page_size = SCRAPING_CONFIG['incremental']['page_size']
+    if fetch_page is None:
+        fetch_page = _page_fetcher()
+    limiter = limiter or get_rate_limiter()
+
+    all_reviews = []
+
+    for lang in languages:
+        try:
+            print(f"  - Scraping new {lang.upper()} reviews...")
+            new_reviews = _new_reviews_for_lang(app_id, lang, state, fetch_page, page_size, limiter)
+            all_reviews.extend(_tag_reviews(new_reviews, app_id, lang))
+            print(f"  ✓ Found {len(new_reviews)} new {lang.upper()} reviews")
+
+        except Exception as e:
+            print(f"  ✗ Error scraping {lang.upper()} reviews: {e}")
+            continue
+
+    return all_reviews
+
+
+def _new_reviews_for_lang(
+    app_id: str,
+    lang: str,
+    state: ScrapeStateStore,
+    fetch_page: Callable[..., Tuple[List[Dict[str, Any]], Any]],
+    page_size: int,
+    limiter: HostRateLimiter
+) -> List[Dict[str, Any]]:
+    """Page newest first until a review at or below the (app_id, lang) high-water mark."""
+    last_at = state.last_seen_at(app_id, lang)
+    seen = state.seen_ids(app_id, lang)
+
+    new_reviews = []
+    token = None
+    while True:
+        # A page that still fails after its retries drops this language's
+        # new reviews: keeping only the newest ones would move the
+        # high-water mark past the ones that were never fetched
+        page, token = fetch_review_page(
+            fetch_page,
+            app_id,
+            limiter=limiter,
+            lang=lang,
+            country=SCRAPING_CONFIG['country'],
+            sort=Sort.NEWEST,
+            count=page_size,
+            continuation_token=token
+        )
+        for review in page:
+            at = review.get('at')
+            if review.get('reviewId') in seen or (last_at and at and at < last_at):
+                return new_reviews
+            new_reviews.append(review)
+        if not page or token is None or token.token is None:
+            return new_reviews
+
+
+def _tag_reviews(reviews: List[Dict[str, Any]], app_id: str, lang: str) -> List[Dict[str, Any]]:
+    """Add language, scrape timestamp and app id to each review."""
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+    REVIEWS_SCRAPED.labels(app_id, lang).inc(len(reviews))
+    for review in reviews:
+        review.update({
+            'language': lang,
+            'scrape_timestamp': timestamp,
+            'app_id': app_id
+        })
+    return reviews
+
+
+def resumable_reviews_all(
+    app_id: str,
+    limiter: Optional[HostRateLimiter] = None,
+    host: Optional[str] = None,
+    fetch_page: Optional[Callable[..., Tuple[List[Dict[str, Any]], Any]]] = None,
+    continuation_token: Any = None,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Drop-in replacement for `reviews_all` that retries failed pages.
+
+    Each page is fetched with `fetch_review_page`, so a throttled or failed
+    request is retried from its continuation token with backoff instead of
+    ending the scrape. Passing `continuation_token` resumes an earlier scrape.
+    Pages are as large as the backend serves and follow each other without a
+    fixed pause; backoff and the optional rate limiter do the pacing.
+
+    Raises:
+        PartialResultError: A page kept failing; carries the reviews fetched
+            so far and the token of the failed page
+    """
+    kwargs.pop('count', None)
+    kwargs.pop('sleep_milliseconds', None)
+    fetch_page = fetch_page or _page_fetcher()
+    page_size = _page_size()
+
+    result = []
+    token = continuation_token
+    while True:
+        try:
+            page, next_token = fetch_review_page(
+                fetch_page, app_id, host=host, limiter=limiter,
+                count=page_size, continuation_token=token, **kwargs
+            )
+        except Exception as e:
+            raise PartialResultError(result, token, e) from e
+        result.extend(page)
+        token = next_token
+        if token is None or token.token is None:
+            break
+    return result
+
+
+def rate_limited_reviews_all(
+    app_id: str,
+    limiter: HostRateLimiter,
+    host: Optional[str] = None,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Drop-in replacement for `reviews_all` that takes a token from the host's
+    bucket before every page request. Failed pages are retried like
+    `resumable_reviews_all`.
+    """
+    kwargs.pop('continuation_token', None)
+    return resumable_reviews_all(app_id, limiter=limiter, host=host, **kwargs)
+
+
+def scrape_reviews_concurrently(
+    jobs: List[Tuple[str, str]],
+    count: int = 100,
+    max_workers: Optional[int] = None,
+    limiter: Optional[HostRateLimiter] = None,
+    fetch: Optional[Callable[..., List[Dict[str, Any]]]] = None
+) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+    """
+    Scrape several (app_id, lang) jobs in parallel on a thread pool.
+
+    Args:
+        jobs: List of (app_id, language) pairs to scrape
+        count: Number of reviews per language
+        max_workers: Maximum number of jobs running at once
+        limiter: Per-host token-bucket limiter shared by all jobs (default:
+            the shared one from `get_rate_limiter`)
+        fetch: Function with the `reviews_all` signature. Defaults to a
+            rate-limited pager that takes one token per page and retries
+            failed pages; a custom fetch takes one token per job.
+
+    Returns:
+        Dict mapping each (app_id, lang) job to its tagged reviews. Failed
+        jobs map to an empty list.
+    """
+    config = SCRAPING_CONFIG['concurrency']
+    if max_workers is None:
+        max_workers = config['max_workers']
+    limiter = limiter or get_rate_limiter()
+
+    def run_job(app_id: str, lang: str) -> List[Dict[str, Any]]:
+        kwargs = {
+            'lang': lang,
+            'country': SCRAPING_CONFIG['country'],
+            'sort': Sort.MOST_RELEVANT,
+            'count': count
+        }
+        if fetch is None:
+            try:
+                found = rate_limited_reviews_all(app_id, limiter, **kwargs)
+            except PartialResultError as e:
+                print(f"  ⚠️  {lang.upper()} scrape of {app_id} stopped early: {e.cause}")
+                found = e.results
+        else:
+            limiter.acquire(_endpoint())
+            found = fetch(app_id, sleep_milliseconds=0, **kwargs)
+        return _tag_reviews(found, app_id, lang)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_job, app_id, lang): (app_id, lang) for app_id, lang in jobs}
+        for future in as_completed(futures):
+            app_id, lang = futures[future]
+            try:
+                results[(app_id, lang)] = future.result()
+                print(f"  ✓ Found {len(results[(app_id, lang)])} {lang.upper()} reviews for {app_id}")
+            except Exception as e:
+                print(f"  ✗ Error scraping {lang.upper()} reviews for {app_id}: {e}")
+                results[(app_id, lang)] = []
+    return results
\ No newline at end of file
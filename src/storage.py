@@ -0,0 +1,259 @@
+import ast
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.settings import PIPELINE_CONFIG, STORAGE_CONFIG
+
+PathLike = Union[str, Path]
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Typed Arrow columns used by the Parquet backend; other columns are inferred
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+REVIEW_SCHEMA: Dict[str, pa.DataType] = {
+    'bank': CATEGORY,
+    'language': CATEGORY,
+    'sentiment_label': CATEGORY,
+    'source': CATEGORY,
+    'date': pa.date32(),
+    'rating': pa.int8(),
+    'thumbs_up': pa.int32(),
+    'emoji_count': pa.int16(),
+    'is_translated': pa.bool_(),
+    'sentiment_score': pa.float64(),
+    'emojis': pa.list_(pa.string()),
+    'emoji_descriptions': pa.list_(pa.string()),
+}
+LIST_COLUMNS = [name for name, dtype in REVIEW_SCHEMA.items() if pa.types.is_list(dtype)]
+
+
+class CsvStorage:
+    """CSV backend; list columns are written as Python literals and parsed back on read."""
+    suffix = '.csv'
+
+    def __init__(self, encoding: str = 'utf-8'):
+        self.encoding = encoding
+
+    def read(self, path: PathLike, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if columns is not None:
+            header = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns
+            columns = [c for c in columns if c in header]
+        df = pd.read_csv(path, usecols=columns, encoding='utf-8-sig')
+        for col in LIST_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].map(_parse_list)
+        return df
+
+    def write(self, df: pd.DataFrame, path: PathLike, append: bool = False) -> None:
+        if append and os.path.exists(path):
+            # No BOM when appending, it would end up in the middle of the file
+            df.to_csv(path, mode='a', header=False, index=False, encoding='utf-8')
+        else:
+            df.to_csv(path, index=False, encoding=self.encoding)
+
+
+class ParquetStorage:
+    """
+    Parquet backend with typed columns.
+
+    Low-cardinality text columns are dictionary encoded (categorical in
+    pandas), dates are date32, ratings int8 and emoji columns list<string>.
+    Reads support column projection.
+    """
+    suffix = '.parquet'
+
+    def read(self, path: PathLike, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if columns is not None:
+            available = pq.read_schema(path).names
+            columns = [c for c in columns if c in available]
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    def write(self, df: pd.DataFrame, path: PathLike, append: bool = False) -> None:
+        table = to_arrow(df)
+        if append and os.path.exists(path):
+            # Parquet files are immutable, so appending rewrites the file
+            existing = pq.read_table(path)
+            table = pa.concat_tables([existing, table.cast(existing.schema)])
+        pq.write_table(table, path, compression=STORAGE_CONFIG['parquet_compression'])
+
+
+BACKENDS = {'.csv': CsvStorage(), '.parquet': ParquetStorage()}
+
+
+class ReviewSink:
+    """
+    Appendable output for chunked writes.
+
+    CSV sinks write the header with the first chunk only; Parquet sinks keep
+    a ParquetWriter open and add one row group per chunk. The writer's schema
+    comes from the first non-empty chunk, because an empty chunk has no values
+    to infer untyped columns from. Use as a context manager so the file is
+    closed properly.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = str(path)
+        self.rows = 0
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._empty: Optional[pa.Table] = None
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        get_storage(self.path)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.path.endswith('.parquet'):
+            table = to_arrow(df)
+            if self._writer is None and table.num_rows == 0:
+                # Untyped columns are Arrow null here; wait for rows to type them
+                if self._empty is None:
+                    self._empty = table
+            else:
+                if self._writer is None:
+                    self._writer = pq.ParquetWriter(
+                        self.path, table.schema, compression=STORAGE_CONFIG['parquet_compression']
+                    )
+                self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            # Header once, even if the first chunks were empty
+            header = not os.path.exists(self.path)
+            df.to_csv(self.path, mode='a', header=header, index=False, encoding='utf-8')
+        self.rows += len(df)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        elif self._empty is not None:
+            # No rows at all: still write the columns, untyped ones as strings
+            schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in self._empty.schema
+            ])
+            pq.write_table(self._empty.cast(schema), self.path,
+                           compression=STORAGE_CONFIG['parquet_compression'])
+        self._empty = None
+
+    def __enter__(self) -> 'ReviewSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_review_chunks(path: PathLike, chunksize: int, columns: Optional[List[str]] = None):
+    """Yield a CSV or Parquet file as DataFrames of at most `chunksize` rows."""
+    if Path(path).suffix.lower() == '.parquet':
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        if columns is not None:
+            header = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns
+            columns = [c for c in columns if c in header]
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize, encoding='utf-8-sig')
+
+
+def review_keys(df: pd.DataFrame, occurrences: Optional[Dict[str, int]] = None) -> List[str]:
+    """
+    Stable key per review: its `review_id`, or for rows without one a hash
+    of bank, date, rating and text. Identical id-less reviews are numbered
+    in order of appearance, counted in `occurrences` (pass the same dict for
+    every chunk of a file), so rebuilding from the same files gives the same
+    keys and repeated reviews stay distinct.
+    """
+    ids = df['review_id'].fillna('').astype(str).tolist() if 'review_id' in df.columns else [''] * len(df)
+    if all(ids):
+        return ids
+    content = pd.DataFrame({
+        name: df[name].fillna('').astype(str) if name in df.columns else ''
+        for name in ('bank', 'date', 'rating', 'review')
+    }, index=df.index)
+    hashes = pd.util.hash_pandas_object(content, index=False).tolist()
+    occurrences = {} if occurrences is None else occurrences
+    keys = []
+    for review_id, value in zip(ids, hashes):
+        if not review_id:
+            content_key = f"~{value:016x}"
+            count = occurrences.get(content_key, 0)
+            occurrences[content_key] = count + 1
+            review_id = f"{content_key}.{count}"
+        keys.append(review_id)
+    return keys
+
+
+def processed_files(directory: Optional[str] = None) -> List[Path]:
+    """Processed per-bank review files (CSV and Parquet)."""
+    directory = Path(directory or PROJECT_ROOT / PIPELINE_CONFIG['processed_dir'])
+    return sorted(p for p in directory.glob('cleaned_bank_reviews_*') if p.suffix in ('.csv', '.parquet'))
+
+
+def _parse_list(value) -> list:
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, str) or not value.startswith('['):
+        return []
+    try:
+        return list(ast.literal_eval(value))
+    except (ValueError, SyntaxError):
+        return []
+
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Convert a DataFrame to an Arrow table using the typed review schema."""
+    arrays = []
+    fields = []
+    for col in df.columns:
+        series = df[col]
+        dtype = REVIEW_SCHEMA.get(col)
+        if dtype is None:
+            array = pa.array(series, from_pandas=True)
+        elif pa.types.is_list(dtype):
+            array = pa.array(series.map(_parse_list), type=dtype)
+        elif pa.types.is_date32(dtype):
+            array = pa.array(pd.to_datetime(series, errors='coerce').dt.date, type=dtype, from_pandas=True)
+        elif pa.types.is_dictionary(dtype):
+            array = pa.array(series.astype('string'), type=pa.string(), from_pandas=True).dictionary_encode()
+            array = array.cast(dtype)
+        elif pa.types.is_boolean(dtype):
+            array = pa.array(series.map(lambda v: v in (True, 'True', 'true', 1)), type=dtype)
+        else:
+            array = pa.array(pd.to_numeric(series, errors='coerce'), type=dtype, from_pandas=True)
+        arrays.append(array)
+        fields.append(pa.field(col, array.type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def get_storage(path: PathLike):
+    """Pick the storage backend from the file suffix."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in BACKENDS:
+        raise ValueError(f"Unsupported storage format: {suffix or path}")
+    return BACKENDS[suffix]
+
+
+def read_reviews(path: PathLike, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read reviews from CSV or Parquet, optionally loading only `columns`."""
+    return get_storage(path).read(path, columns)
+
+
+def write_reviews(df: pd.DataFrame, path: PathLike, append: bool = False) -> None:
+    """Write reviews to CSV or Parquet depending on the file suffix."""
+    directory = os.path.dirname(str(path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    get_storage(path).write(df, path, append)
+
+
+def with_format(path: PathLike, fmt: Optional[str] = None) -> str:
+    """Swap the suffix of `path` for the configured (or given) storage format."""
+    fmt = fmt or STORAGE_CONFIG['format']
+    return str(Path(path).with_suffix(f".{fmt}"))
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+from config.settings import TRANSLATION_CONFIG
+
+
+class TranslationCache:
+    """
+    On-disk translation cache shared across runs.
+
+    Entries are keyed by a SHA-256 hash of the target language and the source
+    text, so a re-scrape only sends text to the translator that it has never
+    seen before. Hit and miss counts are tracked for the lifetime of the object.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            'key TEXT PRIMARY KEY, target_lang TEXT, translation TEXT)'
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, target_lang: str) -> str:
+        """Content hash used as the cache key."""
+        return hashlib.sha256(f"{target_lang}\x00{text}".encode('utf-8')).hexdigest()
+
+    def get(self, text: str, target_lang: str) -> Optional[str]:
+        """Return the cached translation of `text`, or None."""
+        return self.get_many([text], target_lang).get(text)
+
+    def get_many(self, texts: Iterable[str], target_lang: str) -> Dict[str, str]:
+        """Look up several texts at once. Returns only the texts that were found."""
+        keys = {self.key(t, target_lang): t for t in texts}
+        found = {}
+        with self._lock:
+            key_list = list(keys)
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, translation in rows:
+                    found[keys[key]] = translation
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, pairs: Iterable[Tuple[str, str]], target_lang: str) -> None:
+        """Store (text, translation) pairs."""
+        rows = [(self.key(text, target_lang), target_lang, translation) for text, translation in pairs]
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO translations VALUES (?, ?, ?)', rows)
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counts and the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_default_cache: Optional[TranslationCache] = None
+
+
+def get_translation_cache() -> Optional[TranslationCache]:
+    """Return the cache configured in TRANSLATION_CONFIG, or None when disabled."""
+    global _default_cache
+    if not TRANSLATION_CONFIG['cache']['enabled']:
+        return None
+    if _default_cache is None:
+        _default_cache = TranslationCache(TRANSLATION_CONFIG['cache']['path'])
+    return _default_cache
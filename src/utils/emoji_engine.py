@@ -0,0 +1,128 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+
+import emoji
+import pandas as pd
+
+
+def _char_class(chars: Iterable[str]) -> str:
+    """Build a regex character class, collapsing consecutive code points into ranges."""
+    codes = sorted(set(map(ord, chars)))
+    parts = []
+    i = 0
+    while i < len(codes):
+        j = i
+        while j + 1 < len(codes) and codes[j + 1] == codes[j] + 1:
+            j += 1
+        start, end = re.escape(chr(codes[i])), re.escape(chr(codes[j]))
+        parts.append(start if i == j else f"{start}-{end}")
+        i = j + 1
+    return '[' + ''.join(parts) + ']'
+
+
+def _trie_pattern(node: Dict[str, Any]) -> str:
+    """Turn a character trie into a regex that always takes the longest match."""
+    alternatives = []
+    leaves = []
+    for char, child in sorted(node.items()):
+        if char == '':
+            continue
+        if list(child) == ['']:
+            leaves.append(char)
+        else:
+            alternatives.append(re.escape(char) + _trie_pattern(child))
+    if leaves:
+        alternatives.append(_char_class(leaves))
+    if not alternatives:
+        return ''
+    pattern = '(?:' + '|'.join(alternatives) + ')'
+    return pattern + '?' if '' in node else pattern
+
+
+def build_emoji_pattern() -> re.Pattern:
+    """
+    Compile one regex matching every emoji in `emoji.EMOJI_DATA`.
+
+    The pattern is generated from a trie of all sequences, so multi-codepoint
+    emojis (ZWJ sequences, skin tones, flags, keycaps) match as a single unit.
+    A look-ahead on the possible first characters lets the engine skip
+    ordinary text quickly. A stray trailing variation selector (U+FE0F) is
+    absorbed into the match, as `emoji.replace_emoji` does.
+    """
+    trie: Dict[str, Any] = {}
+    for sequence in emoji.EMOJI_DATA:
+        node = trie
+        for char in sequence:
+            node = node.setdefault(char, {})
+        node[''] = True
+    first_chars = _char_class(char for char in trie)
+    return re.compile(f"(?={first_chars}){_trie_pattern(trie)}\ufe0f?")
+
+
+EMOJI_PATTERN = build_emoji_pattern()
+
+
+@lru_cache(maxsize=None)
+def describe_emoji(sequence: str) -> str:
+    """Memoized `emoji.demojize` for a single emoji."""
+    return emoji.demojize(sequence)
+
+
+def analyze_emojis(text: str) -> Dict[str, Any]:
+    """
+    Extract emojis and build the emoji-free text in a single pass.
+
+    Returns:
+        Dict with the emoji list, their count, their descriptions and
+        `clean_text` (the text with emojis removed and whitespace stripped)
+    """
+    if not isinstance(text, str):
+        return {'emojis': [], 'count': 0, 'descriptions': [], 'clean_text': ''}
+    # No emoji sequence is pure ASCII, so most English reviews stop here
+    if text.isascii():
+        return {'emojis': [], 'count': 0, 'descriptions': [], 'clean_text': text.strip()}
+
+    emojis: List[str] = []
+    pieces: List[str] = []
+    last = 0
+    for match in EMOJI_PATTERN.finditer(text):
+        emojis.append(match.group())
+        pieces.append(text[last:match.start()])
+        last = match.end()
+    pieces.append(text[last:])
+
+    return {
+        'emojis': emojis,
+        'count': len(emojis),
+        'descriptions': [describe_emoji(e) for e in emojis],
+        'clean_text': ''.join(pieces).strip()
+    }
+
+
+def analyze_emoji_series(texts: pd.Series) -> pd.DataFrame:
+    """
+    Vectorized variant of `analyze_emojis` for a whole column of reviews.
+
+    Returns:
+        DataFrame indexed like `texts` with `emojis`, `count`, `descriptions`
+        and `clean_text` columns
+    """
+    texts = texts.fillna('').astype(str)
+    result = pd.DataFrame({
+        'emojis': [[] for _ in range(len(texts))],
+        'count': 0,
+        'descriptions': [[] for _ in range(len(texts))],
+        'clean_text': texts.str.strip()
+    }, index=texts.index)
+
+    # Only rows with non-ASCII characters can contain emojis
+    candidates = texts[~texts.map(str.isascii)]
+    if candidates.empty:
+        return result
+    emojis = candidates.str.findall(EMOJI_PATTERN)
+    result.loc[candidates.index, 'emojis'] = emojis
+    result.loc[candidates.index, 'count'] = emojis.str.len().astype(int)
+    result.loc[candidates.index, 'descriptions'] = emojis.map(lambda found: [describe_emoji(e) for e in found])
+    result.loc[candidates.index, 'clean_text'] = candidates.str.replace(EMOJI_PATTERN, '', regex=True).str.strip()
+    return result
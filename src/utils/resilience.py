@@ -0,0 +1,244 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from config.settings import RESILIENCE_CONFIG
+
+T = TypeVar('T')
+
+# 4xx statuses that are worth retrying; every other 4xx is a permanent error
+RETRYABLE_CLIENT_STATUSES = {408, 429}
+
+# Shortest wait between checks of an open or half-open (trial running) circuit
+_TRIAL_POLL_INTERVAL = 0.5
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit for {endpoint} is open; retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class PartialResultError(Exception):
+    """
+    Raised when paging fails part-way through.
+
+    Carries the results fetched before the failure and the continuation
+    token of the page that failed, so the caller can keep what it has and
+    resume from that page later.
+    """
+
+    def __init__(self, results: List[Any], token: Any, cause: Exception):
+        super().__init__(f"Stopped after {len(results)} results: {cause}")
+        self.results = results
+        self.token = token
+        self.cause = cause
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one endpoint.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are rejected for `reset_timeout` seconds. Then one trial call is let
+    through (half-open): success closes the circuit, failure opens it again.
+
+    Args:
+        endpoint: Name used in errors and messages
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before a trial call
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial call through."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now (claims the trial call when half-open)."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_running = False
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"⚡ Circuit for {self.endpoint} opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_running = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """Return the process-wide breaker for `endpoint`, creating it on first use."""
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failure_threshold=RESILIENCE_CONFIG['failure_threshold'],
+                reset_timeout=RESILIENCE_CONFIG['reset_timeout']
+            )
+        return _breakers[endpoint]
+
+
+def reset_breakers() -> None:
+    """Forget every endpoint's breaker (all circuits start closed again)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float, rng: Any = random) -> float:
+    """
+    Exponential backoff with full jitter for retry number `attempt` (0-based).
+
+    The delay is drawn uniformly from [0, min(max_delay, base_delay * 2**attempt)],
+    so clients that failed together do not retry together.
+    """
+    return rng.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def _status_and_headers(exc: Exception):
+    response = getattr(exc, 'response', None)
+    status = getattr(exc, 'code', None) or getattr(response, 'status_code', None)
+    headers = getattr(exc, 'headers', None) or getattr(response, 'headers', None)
+    return (status if isinstance(status, int) else None), headers
+
+
+def retry_after(exc: Exception) -> Optional[float]:
+    """Seconds requested by a Retry-After header on an HTTP error, if any."""
+    _, headers = _status_and_headers(exc)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """False for client errors that will fail again (404, 400, ...), True otherwise."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status, _ = _status_and_headers(exc)
+    return not (status and 400 <= status < 500 and status not in RETRYABLE_CLIENT_STATUSES)
+
+
+def retry_call(
+    func: Callable[[], T],
+    attempts: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    retry_if: Callable[[Exception], bool] = is_retryable,
+    on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    sleep: Optional[Callable[[float], None]] = None,
+    circuit_wait: float = 0.0
+) -> T:
+    """
+    Call `func` until it succeeds, backing off exponentially between attempts.
+
+    A Retry-After header on the error is honoured when it asks for a longer
+    wait than the backoff. With a `breaker`, every outcome is recorded on it
+    and an open circuit raises CircuitOpenError instead of calling, unless
+    its trial call comes within `circuit_wait` seconds: then the call waits
+    for the circuit to half-open and makes the trial call.
+
+    Args:
+        func: Zero-argument callable to run
+        attempts: Maximum number of calls (default RESILIENCE_CONFIG['max_attempts'])
+        base_delay: Backoff ceiling for the first retry in seconds
+        max_delay: Largest backoff ceiling in seconds
+        breaker: Circuit breaker of the endpoint `func` calls
+        retry_if: Decides whether an error is worth retrying
+        on_retry: Called with (retry number, error, delay) before each retry
+        sleep: Sleep function (default time.sleep)
+        circuit_wait: Total seconds to wait for an open circuit (default: fail at once)
+
+    Returns:
+        The result of the first successful call; the last error is re-raised
+        when every attempt fails or the error is not retryable.
+    """
+    attempts = attempts or RESILIENCE_CONFIG['max_attempts']
+    base_delay = RESILIENCE_CONFIG['base_delay'] if base_delay is None else base_delay
+    max_delay = RESILIENCE_CONFIG['max_delay'] if max_delay is None else max_delay
+    sleep = sleep or time.sleep
+
+    waited = 0.0
+    for attempt in range(attempts):
+        while breaker is not None and not breaker.allow():
+            # retry_in() is 0 while another caller runs the trial call, and may be a
+            # float remainder too small to move the clock; poll at least this often
+            wait = max(breaker.retry_in(), _TRIAL_POLL_INTERVAL)
+            if waited + wait > circuit_wait:
+                raise CircuitOpenError(breaker.endpoint, breaker.retry_in())
+            sleep(wait)
+            waited += wait
+        try:
+            result = func()
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt == attempts - 1 or not retry_if(e):
+                raise
+            delay = max(backoff_delay(attempt, base_delay, max_delay), retry_after(e) or 0.0)
+            if on_retry is not None:
+                on_retry(attempt + 1, e, delay)
+            sleep(delay)
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
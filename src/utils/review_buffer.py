@@ -0,0 +1,111 @@
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality fields stored as codes into a per-buffer category list
+CATEGORICAL_FIELDS = ('app_id', 'language', 'scrape_timestamp')
+
+_EPOCH = datetime(1970, 1, 1)
+_NO_DATE = np.iinfo(np.int64).min
+
+
+def _microseconds(at: Any) -> int:
+    """Naive datetime (or ISO string) as microseconds since 1970, keeping its wall-clock time."""
+    if at is None or at is pd.NaT or at == '':
+        return _NO_DATE
+    if isinstance(at, str):
+        at = datetime.fromisoformat(at)
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    return (at - _EPOCH) // timedelta(microseconds=1)
+
+
+class ReviewBuffer:
+    """
+    Column-oriented, array-backed store of raw scraped reviews.
+
+    Keeps only the fields processing uses: review id and text as plain
+    lists, rating, thumbs-up count and timestamp in typed arrays, and
+    `CATEGORICAL_FIELDS` as integer codes into a small list of distinct
+    values. A review costs a few dozen bytes plus its text instead of a
+    dict with ~15 keys and its own copies of the repeated strings.
+
+    Iterating yields review dicts shaped like the scraper output, and
+    `to_frame()` builds the DataFrame `process_reviews_frame` takes, with
+    the low-cardinality fields as pandas categoricals.
+    """
+
+    __slots__ = ('_ids', '_content', '_score', '_thumbs', '_at', '_codes', '_categories', '_lookup')
+
+    def __init__(self, reviews: Optional[Iterable[Dict[str, Any]]] = None):
+        self._ids: List[str] = []
+        self._content: List[str] = []
+        self._score = array('b')
+        self._thumbs = array('q')
+        self._at = array('q')
+        self._codes = {field: array('I') for field in CATEGORICAL_FIELDS}
+        self._categories: Dict[str, List[str]] = {field: [] for field in CATEGORICAL_FIELDS}
+        self._lookup: Dict[str, Dict[str, int]] = {field: {} for field in CATEGORICAL_FIELDS}
+        if reviews is not None:
+            self.extend(reviews)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _code(self, field: str, value: Any) -> int:
+        value = '' if value is None else str(value)
+        lookup = self._lookup[field]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self._categories[field])
+            self._categories[field].append(value)
+        return code
+
+    def append(self, review: Dict[str, Any]) -> None:
+        """Add one review dict from the scraper."""
+        self._ids.append(review.get('reviewId') or '')
+        self._content.append(review.get('content') or '')
+        self._score.append(int(review.get('score') or 0))
+        self._thumbs.append(int(review.get('thumbsUpCount') or 0))
+        self._at.append(_microseconds(review.get('at')))
+        for field in CATEGORICAL_FIELDS:
+            self._codes[field].append(self._code(field, review.get(field)))
+
+    def extend(self, reviews: Iterable[Dict[str, Any]]) -> None:
+        """Add many review dicts."""
+        for review in reviews:
+            self.append(review)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield the reviews as dicts with the scraper's keys."""
+        for i in range(len(self)):
+            at = self._at[i]
+            review = {
+                'reviewId': self._ids[i],
+                'content': self._content[i],
+                'score': self._score[i],
+                'thumbsUpCount': self._thumbs[i],
+                'at': None if at == _NO_DATE else _EPOCH + timedelta(microseconds=at),
+            }
+            for field in CATEGORICAL_FIELDS:
+                review[field] = self._categories[field][self._codes[field][i]]
+            yield review
+
+    def to_frame(self) -> pd.DataFrame:
+        """Raw reviews as a DataFrame with categorical low-cardinality columns."""
+        at = np.frombuffer(self._at, dtype=np.int64) if len(self) else np.array([], dtype=np.int64)
+        frame = pd.DataFrame({
+            'reviewId': self._ids,
+            'content': self._content,
+            'score': np.array(self._score, dtype=np.int8),
+            'thumbsUpCount': np.array(self._thumbs, dtype=np.int64),
+            'at': pd.to_datetime(np.where(at == _NO_DATE, np.datetime64('NaT'), at.astype('datetime64[us]'))),
+        })
+        for field in CATEGORICAL_FIELDS:
+            frame[field] = pd.Categorical.from_codes(
+                np.array(self._codes[field], dtype=np.int64), categories=self._categories[field]
+            )
+        return frame
@@ -0,0 +1,101 @@
+import math
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Hash keys must be 16 characters long
+_PRIMARY_KEY = 'review-id-hash-1'
+
+
+def hash_ids(values) -> np.ndarray:
+    """Vectorized 64-bit hash of ids (as strings)."""
+    return pd.util.hash_array(np.asarray(values, dtype=str).astype(object), hash_key=_PRIMARY_KEY)
+
+
+class HashedIdSet:
+    """
+    Exact seen-set that stores 64-bit id hashes in sorted NumPy runs.
+
+    Uses 8 bytes per id instead of a Python string per id, which keeps
+    cross-chunk dedup of millions of review ids within a few tens of MB.
+    Each call adds its new hashes as a sorted run and merges runs of similar
+    size (LSM-style), so every hash is merged O(log n) times instead of the
+    whole set being re-sorted per chunk, and there are at most O(log n) runs
+    to search.
+    """
+
+    def __init__(self):
+        self._runs: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(run.nbytes for run in self._runs)
+
+    def _contains(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            pos = np.searchsorted(run, hashes)
+            pos[pos == len(run)] = 0
+            found |= run[pos] == hashes
+        return found
+
+    def check_and_add(self, ids) -> np.ndarray:
+        """Return a mask of ids already seen (earlier in `ids` or in past calls) and add the rest."""
+        hashes = hash_ids(ids)
+        seen = self._contains(hashes)
+        repeated = pd.Series(hashes).duplicated().to_numpy()
+        new = np.sort(hashes[~seen & ~repeated])
+        if len(new):
+            self._runs.append(new)
+            # Keep each run more than twice the size of the next one
+            while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+                last = self._runs.pop()
+                # A stable sort of two concatenated sorted runs is a linear merge
+                self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]), kind='stable')
+        return seen | repeated
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for approximate cross-chunk dedup.
+
+    Memory is fixed up front from the expected capacity and error rate. A
+    false positive drops a review that was never seen before, with
+    probability close to `error_rate` once `capacity` ids have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bits.nbytes
+
+    def _positions(self, values: np.ndarray) -> np.ndarray:
+        h1 = pd.util.hash_array(values, hash_key=_PRIMARY_KEY)
+        # Re-hashing the numeric h1 is much cheaper than hashing the strings twice
+        h2 = pd.util.hash_array(h1) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        # Double hashing: h1 + i * h2 (wrapping uint64 arithmetic)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.size)
+
+    def check_and_add(self, ids) -> np.ndarray:
+        """Return a mask of ids (probably) already seen, earlier in `ids` or in past calls, and add the rest."""
+        codes, unique = pd.factorize(np.asarray(ids, dtype=str).astype(object))
+        positions = self._positions(np.asarray(unique, dtype=object))
+        byte = (positions // np.uint64(8)).astype(np.int64)
+        bit = (positions % np.uint64(8)).astype(np.uint8)
+        seen_unique = np.all(self._bits[byte] & np.left_shift(np.uint8(1), bit), axis=1)
+        # One fancy-indexed OR per bit offset; repeated bytes get the same value
+        for offset in range(8):
+            selected = byte[bit == offset]
+            self._bits[selected] |= np.uint8(1 << offset)
+
+        repeated = pd.Series(codes).duplicated().to_numpy()
+        return seen_unique[codes] | repeated
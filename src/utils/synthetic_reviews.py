@@ -0,0 +1,133 @@
+"""
+Seeded synthetic review generator for benchmarks and the fake Play Store.
+
+Produces Play Store-shaped reviews (as returned by google-play-scraper) in
+English and Amharic, with emojis, ratings correlated with the wording,
+dates, a few duplicate ids and some rows that preprocessing rejects.
+The same seed and size always give the same data.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+
+# (phrase, sentiment) with sentiment in {-1, 0, 1}
+ENGLISH_PHRASES = [
+    ('Great app, very easy to use', 1),
+    ('Best banking app in Ethiopia', 1),
+    ('Fast and reliable transfers', 1),
+    ('I love the new update', 1),
+    ('Works perfectly', 1),
+    ('It is okay', 0),
+    ('Please add more features', 0),
+    ('I use it for airtime and bills', 0),
+    ('The app keeps crashing', -1),
+    ('Very slow and the OTP never arrives', -1),
+    ('Terrible experience, cannot login', -1),
+    ('Transaction failed but money was deducted', -1),
+]
+
+AMHARIC_PHRASES = [
+    ('በጣም ጥሩ መተግበሪያ ነው', 1),
+    ('ምርጥ ባንክ', 1),
+    ('እናመሰግናለን', 1),
+    ('ደህና ነው', 0),
+    ('እባካችሁ አሻሽሉት', 0),
+    ('አይሰራም', -1),
+    ('በጣም ቀርፋፋ ነው', -1),
+    ('መግባት አልቻልኩም', -1),
+]
+
+POSITIVE_EMOJIS = ['👍', '😍', '❤️', '🔥', '🙏', '⭐', '💯']
+NEGATIVE_EMOJIS = ['😡', '😢', '👎', '😤', '💔']
+
+APP_IDS = ['com.combanketh.mobilebanking', 'com.boa.boaMobileBanking', 'com.dashen.dashensuperapp']
+
+
+def _pick_texts(rng: np.random.Generator, phrases, n: int):
+    """Build `n` texts of one to three phrases; returns texts and their mean sentiment."""
+    texts = np.array([p for p, _ in phrases], dtype=object)
+    sentiment = np.array([s for _, s in phrases], dtype=float)
+    counts = rng.integers(1, 4, size=n)
+    picks = rng.integers(0, len(phrases), size=(n, 3))
+    mask = np.arange(3)[None, :] < counts[:, None]
+    joined = [
+        '. '.join(texts[row[keep]])
+        for row, keep in zip(picks, mask)
+    ]
+    mood = np.where(mask, sentiment[picks], 0).sum(axis=1) / counts
+    return joined, mood
+
+
+def generate_reviews(
+    n: int,
+    seed: int = 42,
+    amharic_share: float = 0.3,
+    emoji_share: float = 0.25,
+    duplicate_share: float = 0.02
+) -> List[Dict[str, Any]]:
+    """
+    Generate `n` raw reviews shaped like google-play-scraper results.
+
+    Each review has reviewId, content, score, at, thumbsUpCount, app_id,
+    language and scrape_timestamp. About `duplicate_share` of the reviews
+    repeat an earlier reviewId.
+    """
+    rng = np.random.default_rng(seed)
+    amharic = rng.random(n) < amharic_share
+    contents = np.empty(n, dtype=object)
+    mood = np.empty(n)
+
+    for is_amharic, phrases in ((False, ENGLISH_PHRASES), (True, AMHARIC_PHRASES)):
+        idx = np.flatnonzero(amharic == is_amharic)
+        texts, moods = _pick_texts(rng, phrases, len(idx))
+        contents[idx] = texts
+        mood[idx] = moods
+
+    # Emojis follow the mood of the text
+    with_emoji = np.flatnonzero(rng.random(n) < emoji_share)
+    for i in with_emoji:
+        pool = NEGATIVE_EMOJIS if mood[i] < 0 else POSITIVE_EMOJIS
+        contents[i] = f"{contents[i]} {''.join(rng.choice(pool, size=rng.integers(1, 4)))}"
+
+    # Ratings track the mood with some noise, plus a few blank reviews
+    ratings = np.clip(np.rint(3 + 2 * mood + rng.normal(0, 0.8, n)), 1, 5).astype(int)
+    contents[rng.random(n) < 0.005] = '  '
+
+    ids = np.array([f"gp:{seed}:{i:08d}" for i in range(n)], dtype=object)
+    duplicates = np.flatnonzero(rng.random(n) < duplicate_share)
+    duplicates = duplicates[duplicates > 0]
+    ids[duplicates] = ids[rng.integers(0, duplicates)]
+
+    start = datetime(2023, 1, 1)
+    minutes = rng.integers(0, 3 * 365 * 24 * 60, size=n)
+    thumbs = rng.poisson(2, size=n)
+    apps = rng.integers(0, len(APP_IDS), size=n)
+    scraped = datetime(2026, 1, 1).isoformat()
+
+    return [
+        {
+            'reviewId': ids[i],
+            'content': contents[i],
+            'score': int(ratings[i]),
+            'at': start + timedelta(minutes=int(minutes[i])),
+            'thumbsUpCount': int(thumbs[i]),
+            'app_id': APP_IDS[apps[i]],
+            'language': 'am' if amharic[i] else 'en',
+            'scrape_timestamp': scraped,
+        }
+        for i in range(n)
+    ]
+
+
+def scraped_frame(reviews: List[Dict[str, Any]]) -> pd.DataFrame:
+    """The columns preprocessing reads from a scraped bank file."""
+    return pd.DataFrame({
+        'review_id': [r['reviewId'] for r in reviews],
+        'review': [r['content'] for r in reviews],
+        'rating': [r['score'] for r in reviews],
+        'date': [r['at'].strftime('%Y-%m-%d') for r in reviews],
+    })
@@ -0,0 +1,78 @@
+import unittest
+import subprocess
+from pathlib import Path
+from unittest import mock
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.analysis.aspects import AhoCorasick, AspectTagger, add_aspect_columns
+from src.preprocessing.preprocess import preprocess_data
+
+
+KEYWORDS = {
+    'login_otp': {'en': ['login', 'otp', 'sign in'], 'am': ['ኦቲፒ']},
+    'transfer_failure': {'en': ['transfer fail*', 'not received'], 'am': ['አልደረሰም']},
+    'fees': {'en': ['fee', 'fees', 'charge*'], 'am': ['ክፍያ']},
+}
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_reports_overlapping_matches(self):
+        automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+        matches = sorted(automaton.iter_matches('ushers'))
+        self.assertEqual(matches, [(1, 4, 1), (2, 4, 0), (2, 6, 3)])
+        self.assertEqual(list(automaton.iter_matches('xyz')), [])
+
+
+class TestAspectTagger(unittest.TestCase):
+    def setUp(self):
+        self.tagger = AspectTagger(KEYWORDS)
+
+    def test_word_boundaries_prefixes_and_amharic(self):
+        tags = self.tagger.tag([
+            'Login with OTP',
+            'Feedback: the app is charging extra fees',
+            'Transfer failed twice',
+            'Transfers fail',
+            'ክፍያው ተቆርጧል ግን ገንዘቡ አልደረሰም',
+            None,
+        ])
+        self.assertEqual(tags.tolist(), [
+            [True, False, False],
+            [False, False, True],
+            [False, True, False],
+            [False, False, False],
+            [False, True, True],
+            [False, False, False],
+        ])
+
+    def test_columns_with_clause_sentiment(self):
+        df = pd.DataFrame({'review': ['Login is easy but the transfer failed!', 'Nice app']})
+        result = add_aspect_columns(df.copy(), self.tagger)
+
+        self.assertEqual(result['aspects'].tolist(), ['login_otp;transfer_failure', ''])
+        self.assertEqual(result['aspect_login_otp_label'].tolist(), ['positive', ''])
+        self.assertEqual(result['aspect_transfer_failure_label'].tolist(), ['negative', ''])
+        self.assertTrue(result['aspect_fees_score'].isna().all())
+        tags_only = add_aspect_columns(df.copy(), self.tagger, sentiment=False)
+        self.assertEqual(tags_only.filter(like='_score').columns.tolist(), [])
+
+    def test_preprocess_adds_aspect_columns_when_enabled(self):
+        raw = pd.DataFrame({'review_id': ['r1', 'r2'], 'review': ['OTP not received', 'Great'],
+                            'rating': [1, 5], 'date': ['2025-01-01'] * 2})
+        with mock.patch.dict('config.settings.ASPECTS_CONFIG', {'enabled': True, 'keywords': KEYWORDS}):
+            result = preprocess_data(raw.copy(), 'cbe', keep_review_id=True)
+        self.assertEqual(result['aspects'].tolist(), ['login_otp;transfer_failure', ''])
+        self.assertNotIn('aspects', preprocess_data(raw.copy(), 'cbe').columns)
+
+    def test_preprocessing_does_not_import_sentiment(self):
+        code = "import sys; import src.preprocessing.preprocess; print('src.analysis.sentiment' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).parent.parent,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
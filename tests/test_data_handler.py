@@ -0,0 +1,116 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.data_handler import extract_emoji_info, process_reviews, process_reviews_frame, translate_batch
+from src.translation_cache import TranslationCache
+from src.utils.emoji_engine import analyze_emoji_series, analyze_emojis
+
+
+class FakeTranslator:
+    """Translation backend that prefixes text and records every call."""
+    calls = []
+    lock = threading.Lock()
+
+    def __init__(self, target_lang):
+        self.target_lang = target_lang
+
+    def translate_batch(self, batch):
+        with self.lock:
+            self.calls.append(list(batch))
+        return [f'en: {text}' for text in batch]
+
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, 'translations.sqlite')
+        FakeTranslator.calls = []
+
+    def test_batches_and_reuses_cached_translations(self):
+        cache = TranslationCache(self.cache_path)
+        texts = ['ጥሩ ነው', 'አይሰራም', 'ጥሩ ነው', 'ok', 'በጣም ጥሩ']
+
+        result = translate_batch(texts, 'en', cache=cache, translator_factory=FakeTranslator, batch_size=2)
+
+        self.assertEqual(result, ['en: ጥሩ ነው', 'en: አይሰራም', 'en: ጥሩ ነው', 'ok', 'en: በጣም ጥሩ'])
+        # 3 unique translatable texts in batches of 2; 'ok' is below the minimum length
+        self.assertEqual(sorted(len(c) for c in FakeTranslator.calls), [1, 2])
+        self.assertEqual(cache.stats()['misses'], 3)
+        cache.close()
+
+        # A new run with the same cache file translates nothing
+        FakeTranslator.calls = []
+        cache = TranslationCache(self.cache_path)
+        translate_batch(texts, 'en', cache=cache, translator_factory=FakeTranslator, batch_size=2)
+
+        self.assertEqual(FakeTranslator.calls, [])
+        self.assertEqual(cache.stats()['hits'], 3)
+        self.assertEqual(cache.stats()['entries'], 3)
+        cache.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+
+class TestEmojiEngine(unittest.TestCase):
+    def test_multi_codepoint_sequences_match_once(self):
+        info = analyze_emojis('Family 👨\u200d👩\u200d👧 likes it 👍🏽')
+
+        self.assertEqual(info['emojis'], ['👨\u200d👩\u200d👧', '👍🏽'])
+        self.assertEqual(info['count'], 2)
+        self.assertEqual(info['descriptions'], [':family_man_woman_girl:', ':thumbs_up_medium_skin_tone:'])
+        self.assertEqual(info['clean_text'], 'Family  likes it')
+
+    def test_extract_emoji_info_keeps_its_shape(self):
+        self.assertEqual(extract_emoji_info(None), {'emojis': [], 'count': 0, 'descriptions': []})
+        self.assertEqual(extract_emoji_info('Nice ❤️')['count'], 1)
+
+    def test_series_matches_single_pass(self):
+        texts = pd.Series(['great 😀😀', 'no emoji', None, 'ሰላም 🙏'], index=[3, 4, 5, 6])
+
+        result = analyze_emoji_series(texts)
+
+        self.assertEqual(list(result.index), [3, 4, 5, 6])
+        for idx, text in texts.items():
+            expected = analyze_emojis(text if text is not None else '')
+            self.assertEqual(result.loc[idx, 'emojis'], expected['emojis'])
+            self.assertEqual(result.loc[idx, 'count'], expected['count'])
+            self.assertEqual(result.loc[idx, 'clean_text'], expected['clean_text'])
+
+
+class TestProcessReviewsFrame(unittest.TestCase):
+    def setUp(self):
+        self.raw = [
+            {'reviewId': 'a', 'content': 'Great app 👍', 'score': 5, 'at': datetime(2025, 3, 1, 9, 30),
+             'thumbsUpCount': 2, 'language': 'en', 'scrape_timestamp': '2025-03-02 10:00:00', 'app_id': 'x.app'},
+            {'reviewId': 'b', 'content': 'ok', 'score': 3, 'at': datetime(2025, 3, 1),
+             'thumbsUpCount': 0, 'language': 'en', 'scrape_timestamp': '2025-03-02 10:00:00', 'app_id': 'x.app'},
+            {'reviewId': 'c', 'content': 'በጣም ጥሩ ነው', 'score': 7, 'at': None,
+             'thumbsUpCount': 1, 'language': 'am', 'scrape_timestamp': '2025-03-02 10:00:00', 'app_id': 'x.app'},
+            {'reviewId': 'd', 'content': 'Keeps crashing 😡😡', 'score': 0, 'at': datetime(2025, 2, 28),
+             'thumbsUpCount': 9, 'language': 'en', 'scrape_timestamp': '2025-03-02 10:00:00', 'app_id': 'x.app'},
+        ]
+
+    def test_matches_row_by_row_output(self):
+        with mock.patch('src.data_handler._google_translator', FakeTranslator), \
+                mock.patch('src.data_handler.get_translation_cache', return_value=None):
+            expected = pd.DataFrame(process_reviews([dict(r) for r in self.raw], 'CBE'))
+            result = process_reviews_frame(pd.DataFrame(self.raw), 'CBE')
+
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertEqual(result.to_dict('records'), expected.to_dict('records'))
+        self.assertEqual(result['translated_review'].iloc[1], 'en: በጣም ጥሩ ነው')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.database import dispose_engines, execute, fetch_df, get_engine, stream_query
+
+
+class TestDatabase(unittest.TestCase):
+    """Exercises the shared query layer against a throwaway SQLite database."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        url = 'sqlite:///' + os.path.join(self.test_dir, 'reviews.db')
+        self.env = mock.patch.dict(os.environ, {'DATABASE_URL': url})
+        self.env.start()
+        dispose_engines()
+        execute('CREATE TABLE reviews (review_id INTEGER, review_text TEXT)')
+
+    def test_engine_is_shared(self):
+        self.assertIs(get_engine(), get_engine())
+
+    def test_parameterized_executemany_and_fetch(self):
+        rows = [{'id': i, 'text': f"review '{i}'"} for i in range(5)]
+        execute('INSERT INTO reviews VALUES (:id, :text)', rows)
+
+        df = fetch_df('SELECT * FROM reviews WHERE review_id >= :min_id ORDER BY review_id', {'min_id': 3})
+        self.assertEqual(df['review_text'].tolist(), ["review '3'", "review '4'"])
+
+    def test_stream_query_yields_bounded_chunks(self):
+        execute('INSERT INTO reviews VALUES (:id, :text)', [{'id': i, 'text': 'x'} for i in range(7)])
+
+        chunks = list(stream_query('SELECT review_id FROM reviews ORDER BY review_id', chunksize=3))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        self.assertEqual(chunks[-1]['review_id'].tolist(), [6])
+
+    def tearDown(self):
+        dispose_engines()
+        self.env.stop()
+        shutil.rmtree(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+from urllib.error import HTTPError
+import sys
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src import fake_play_store
+from src.fake_play_store import FakePlayStore, start_server
+from src.scrape_state import ScrapeStateStore
+from src.scraper import get_app_info, scrape_app_reviews, scrape_new_reviews
+from src.utils.rate_limiter import HostRateLimiter
+
+
+class TestFakePlayStore(unittest.TestCase):
+    def setUp(self):
+        self.server = start_server(reviews_per_app=450, seed=7)
+        url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        fake_server = dict(fake_play_store.SCRAPING_CONFIG['fake_server'], url=url)
+        self.config = mock.patch.dict(
+            'config.settings.SCRAPING_CONFIG', {'backend': 'fake', 'fake_server': fake_server}
+        )
+        self.config.start()
+        self.limiter = mock.patch('src.scraper.get_rate_limiter', return_value=HostRateLimiter(rate=1000, capacity=1000))
+        self.limiter.start()
+
+    def tearDown(self):
+        self.limiter.stop()
+        self.config.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_scraper_uses_fake_backend(self):
+        info = get_app_info('com.combanketh.mobilebanking')
+        self.assertIn('(fake)', info['title'])
+
+        reviews = scrape_app_reviews('com.combanketh.mobilebanking', languages=['en'])
+        self.assertEqual(len(reviews), 450)
+        self.assertEqual(len({r['reviewId'] for r in reviews}), 450)
+        self.assertTrue(all(r['language'] == 'en' for r in reviews))
+
+    def test_incremental_scrape_stops_at_seen_reviews(self):
+        state_dir = tempfile.mkdtemp()
+        try:
+            state = ScrapeStateStore(os.path.join(state_dir, 'state.json'))
+            first = scrape_new_reviews('app.one', state, languages=['en'], page_size=100)
+            self.assertEqual(len(first), 450)
+            state.record(first)
+
+            second = scrape_new_reviews('app.one', state, languages=['en'], page_size=100)
+            self.assertEqual(second, [])
+            # One page was enough to find the high-water mark
+            self.assertEqual(self.server.store.stats['requests'], 5 + 1)
+        finally:
+            shutil.rmtree(state_dir)
+
+    def test_errors_and_throttling(self):
+        store = FakePlayStore(reviews_per_app=10, error_rate=1.0)
+        self.assertEqual(store.handle('/apps/x/reviews', {})[0], 500)
+
+        store = FakePlayStore(reviews_per_app=10, requests_per_second=0.001)
+        self.assertEqual(store.handle('/apps/x/reviews', {})[0], 200)
+        self.assertEqual(store.handle('/apps/x/reviews', {})[0], 429)
+        self.assertEqual(store.stats['throttled'], 1)
+
+        self.server.store._bucket = store._bucket
+        with self.assertRaises(HTTPError) as raised:
+            fake_play_store.app('x')
+        self.assertEqual(raised.exception.code, 429)
+        self.assertEqual(raised.exception.headers['Retry-After'], '1')
+
+
+if __name__ == '__main__':
+    unittest.main()
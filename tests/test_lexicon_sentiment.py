@@ -0,0 +1,48 @@
+import unittest
+from pathlib import Path
+import sys
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.analysis.lexicon_sentiment import LexiconScorer, agreement_report
+from src.analysis.sentiment import analyze_sentiment, polarity, score_texts
+
+
+class TestLexiconScorer(unittest.TestCase):
+    def setUp(self):
+        self.scorer = LexiconScorer()
+
+    def test_rules_match_textblob(self):
+        texts = [
+            'Great app, works perfectly!',
+            'not good', 'never good', 'not a good app',
+            'very good', 'really very good', 'not very good', 'not a very good app',
+            'good app!!', 'Good. Bad!',
+            'Terrible, it keeps crashing',
+            'የሚገርም መተግበሪያ', None, '',
+        ]
+        scores = self.scorer.score(texts)
+        for text, score in zip(texts, scores):
+            self.assertAlmostEqual(score, polarity(text), places=9, msg=text)
+
+    def test_batches_share_the_vocabulary(self):
+        first = self.scorer.score(['good', 'bad'])
+        second = self.scorer.score(['bad', 'new words, good'])
+        self.assertAlmostEqual(first[0], polarity('good'))
+        self.assertAlmostEqual(second[0], first[1])
+        self.assertAlmostEqual(second[1], polarity('new words, good'))
+
+    def test_analyzer_uses_analyze_sentiment_labels(self):
+        texts = ['Great app', 'Awful, slow app', 'It opens', None]
+        labels, scores = score_texts(texts, analyzer='lexicon')
+        self.assertEqual(labels, [analyze_sentiment(t)[0] for t in texts])
+
+    def test_agreement_report(self):
+        report = agreement_report(['Great app', 'Awful app', 'It opens', 'not bad'])
+        self.assertEqual(report['rows'], 4)
+        self.assertEqual(report['label_agreement'], 1.0)
+        self.assertEqual(int(report['confusion'].to_numpy().sum()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import io
+from datetime import date
+from pathlib import Path
+import sys
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+# Add the database scripts to path
+sys.path.append(str(Path(__file__).parent.parent / 'data' / 'database'))
+from load_to_postgres import (
+    BACKFILL_REVIEW_IDS_SQL, REVIEW_LOAD_COLUMNS, copy_dataframe, latest_review_date, rows_since_watermark
+)
+from schema_manager import partition_months
+
+
+class FakeCursor:
+    """Stand-in for a psycopg2 cursor that records COPY statements."""
+    def __init__(self, log):
+        self.log = log
+
+    def copy_expert(self, sql, file):
+        self.log.append((sql, file.read()))
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Stand-in for a SQLAlchemy connection exposing its DBAPI connection."""
+    def __init__(self):
+        self.copies = []
+        self.connection = self
+
+    def cursor(self):
+        return FakeCursor(self.copies)
+
+
+class TestCopyLoader(unittest.TestCase):
+    def test_streams_csv_rows_through_copy(self):
+        df = pd.DataFrame({
+            'bank_id': [1, 1],
+            'review_text': ['Great, "fast" app', 'Crashes\non login'],
+            'rating': [5, 1],
+            'review_date': [date(2025, 1, 1), date(2025, 1, 2)],
+            'sentiment_label': ['positive', 'negative'],
+            'sentiment_score': [0.8, -0.5],
+            'source': ['Google Play Store', 'Google Play Store'],
+        })
+        conn = FakeConnection()
+
+        loaded = copy_dataframe(conn, df, 'reviews', REVIEW_LOAD_COLUMNS)
+
+        self.assertEqual(loaded, 2)
+        sql, payload = conn.copies[0]
+        self.assertEqual(
+            sql,
+            'COPY reviews (bank_id, review_text, rating, review_date, sentiment_label, sentiment_score, source) '
+            'FROM STDIN WITH (FORMAT csv)'
+        )
+        rows = pd.read_csv(io.StringIO(payload), header=None, names=REVIEW_LOAD_COLUMNS)
+        self.assertEqual(rows['review_text'].tolist(), df['review_text'].tolist())
+        self.assertEqual(rows['review_date'].tolist(), ['2025-01-01', '2025-01-02'])
+
+
+class TestIncrementalLoad(unittest.TestCase):
+    def test_stages_keyed_rows_from_watermark(self):
+        df = pd.DataFrame({
+            'play_review_id': ['a', 'b', None, 'c', 'd'],
+            'review_date': ['2025-01-01', '2025-01-05', '2025-01-06', '2025-01-04', None],
+        })
+
+        staged = rows_since_watermark(df, date(2025, 1, 4))
+
+        self.assertEqual(staged['play_review_id'].tolist(), ['b', 'c', 'd'])
+        self.assertEqual(len(rows_since_watermark(df)), 4)
+        self.assertEqual(latest_review_date(staged), date(2025, 1, 5))
+
+    def test_backfills_ids_of_rows_loaded_before_the_upgrade(self):
+        # A pre-upgrade table: play_review_id was added as NULL to loaded rows
+        engine = create_engine('sqlite://')
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE reviews (review_id INTEGER PRIMARY KEY, bank_id INTEGER, review_text TEXT, "
+                "rating INTEGER, review_date DATE, play_review_id TEXT UNIQUE)"
+            ))
+            conn.execute(text(
+                "CREATE TABLE reviews_staging (play_review_id TEXT, bank_id INTEGER, review_text TEXT, "
+                "rating INTEGER, review_date DATE)"
+            ))
+            conn.execute(text("""
+                INSERT INTO reviews (review_id, bank_id, review_text, rating, review_date, play_review_id) VALUES
+                (1, 1, 'good', 5, '2025-01-01', NULL),
+                (2, 1, 'good', 5, '2025-01-01', NULL),
+                (3, 1, 'slow', 2, NULL, NULL),
+                (4, 1, 'gone', 1, '2025-01-02', NULL),
+                (5, 2, 'good', 5, '2025-01-01', NULL),
+                (6, 1, 'new', 4, '2025-01-03', 'e')
+            """))
+            conn.execute(text("""
+                INSERT INTO reviews_staging (play_review_id, bank_id, review_text, rating, review_date) VALUES
+                ('b', 1, 'good', 5, '2025-01-01'),
+                ('a', 1, 'good', 5, '2025-01-01'),
+                ('c', 1, 'slow', 2, NULL),
+                ('d', 1, 'edited', 1, '2025-01-02'),
+                ('e', 1, 'new', 4, '2025-01-03')
+            """))
+
+            conn.execute(text(BACKFILL_REVIEW_IDS_SQL), {"bank_id": 1})
+            ids = dict(conn.execute(text("SELECT review_id, play_review_id FROM reviews")).fetchall())
+
+        self.assertEqual(ids, {1: 'a', 2: 'b', 3: 'c', 4: None, 5: None, 6: 'e'})
+
+
+class TestSchemaManager(unittest.TestCase):
+    def test_partition_months_cover_dates(self):
+        months = partition_months(['2024-12-31', '2025-01-15', None, '2025-01-02', 'x'])
+
+        self.assertEqual(months, [
+            (date(2024, 12, 1), date(2025, 1, 1)),
+            (date(2025, 1, 1), date(2025, 2, 1)),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
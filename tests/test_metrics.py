@@ -0,0 +1,78 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.metrics import REGISTRY, run_summary, timed, write_run_summary, write_textfile
+from src.preprocessing.preprocess import preprocess_data, process_all_banks
+
+
+def dropped(step, bank='METRICS'):
+    return REGISTRY.get_sample_value('preprocess_rows_dropped_total', {'bank': bank, 'step': step}) or 0
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def test_preprocess_counts_rows_dropped_per_step(self):
+        before = {step: dropped(step) for step in ('duplicate', 'empty_review', 'invalid_rating')}
+        df = pd.DataFrame({
+            'review_id': ['a', 'a', 'b', 'c', 'd'],
+            'review': ['Good', 'Good', ' ', 'Bad', 'Fine'],
+            'rating': [5, 5, 3, 9, 4],
+            'date': ['2025-01-01'] * 5,
+        })
+
+        preprocess_data(df, 'metrics')
+
+        self.assertEqual({step: dropped(step) - before[step] for step in before},
+                         {'duplicate': 1, 'empty_review': 1, 'invalid_rating': 1})
+
+    def test_worker_processes_report_their_counters(self):
+        banks = ['POOLA', 'POOLB']
+        before = {bank: dropped('invalid_rating', bank) for bank in banks}
+        for bank in banks:
+            pd.DataFrame({
+                'review_id': ['a', 'b', 'c'],
+                'review': ['Good', 'Bad', 'Fine'],
+                'rating': [5, 0, 9],
+                'date': ['2025-01-01'] * 3,
+            }).to_csv(os.path.join(self.test_dir, f'bank_reviews_{bank.lower()}.csv'), index=False)
+
+        results = process_all_banks(Path(self.test_dir), Path(self.test_dir) / 'processed', workers=2)
+
+        self.assertEqual([result['status'] for result in results], ['success', 'success'])
+        self.assertEqual({bank: dropped('invalid_rating', bank) - before[bank] for bank in banks},
+                         {'POOLA': 2, 'POOLB': 2})
+
+    def test_run_summary_and_exports(self):
+        with timed('metrics_test') as stage:
+            stage['rows'] = 10
+
+        summary = run_summary()
+        self.assertEqual(summary['stages']['metrics_test']['rows'], 10)
+        self.assertEqual(summary['stages']['metrics_test']['calls'], 1)
+
+        textfile = os.path.join(self.test_dir, 'pipeline.prom')
+        write_textfile(textfile)
+        with open(textfile, encoding='utf-8') as f:
+            self.assertIn('pipeline_stage_rows_total{stage="metrics_test"} 10.0', f.read())
+
+        summary_path = os.path.join(self.test_dir, 'summary.json')
+        write_run_summary(summary_path)
+        with open(summary_path, encoding='utf-8') as f:
+            self.assertIn('metrics_test', json.load(f)['stages'])
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
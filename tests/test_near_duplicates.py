@@ -0,0 +1,80 @@
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.preprocessing.near_duplicates import NearDuplicateIndex, lsh_bands
+from src.preprocessing.preprocess import preprocess_data, process_bank, process_bank_streaming
+from src.storage import read_reviews
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    def test_matches_templates_and_small_edits(self):
+        index = NearDuplicateIndex(threshold=0.8, num_perm=128, shingle_size=4)
+        matches = index.add([
+            'Good app',
+            'good app!!',
+            'The app keeps crashing every time I try to transfer money to another bank',
+            'Totally unrelated complaint about the service fees',
+            'The app keeps crashing every time I try to transfer money to other bank',
+            '👍',
+            '🔥',
+        ], ids=['a', 'b', 'c', 'd', 'e', 'f', 'g'])
+
+        self.assertEqual(matches, [None, 'a', None, None, 'c', None, None])
+        self.assertEqual(len(index), 3)
+
+        # State carries over to the next call
+        self.assertEqual(index.add(['GOOD APP.'], ids=['h']), ['a'])
+
+    def test_band_layout_targets_threshold(self):
+        bands, rows = lsh_bands(0.8, 128)
+        self.assertEqual(bands * rows, 128)
+        self.assertLessEqual((1 / bands) ** (1 / rows), 0.8)
+
+
+class TestPreprocessNearDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.test_dir, 'bank_reviews_test.csv')
+        pd.DataFrame({
+            'review_id': ['r1', 'r2', 'r3', 'r4', 'r5'],
+            'review': ['Nice app', 'Login fails after the update', 'nice app!', 'Nice  App', 'Slow transfers'],
+            'rating': [5, 1, 5, 4, 2],
+            'date': ['2025-01-01'] * 5,
+        }).to_csv(self.input_path, index=False)
+        self.config = {'enabled': True, 'mode': 'flag', 'column': 'review',
+                       'threshold': 0.8, 'num_perm': 64, 'shingle_size': 4}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _patched(self, **overrides):
+        return mock.patch.dict('config.settings.PREPROCESSING_CONFIG',
+                               {'near_duplicates': dict(self.config, **overrides)})
+
+    def test_flag_mode_adds_duplicate_of(self):
+        with self._patched():
+            result = preprocess_data(read_reviews(self.input_path), 'test', keep_review_id=True)
+        self.assertEqual(result['duplicate_of'].tolist(), ['', '', 'r1', 'r1', ''])
+
+    def test_collapse_mode_matches_when_streaming(self):
+        with self._patched(mode='collapse'):
+            full_path = os.path.join(self.test_dir, 'full.csv')
+            streamed_path = os.path.join(self.test_dir, 'streamed.csv')
+            full = process_bank(self.input_path, full_path)
+            streamed = process_bank_streaming(self.input_path, streamed_path, chunksize=2)
+
+        self.assertEqual(full['final_rows'], 3)
+        self.assertEqual(streamed['final_rows'], 3)
+        self.assertEqual(read_reviews(streamed_path)['review_id'].tolist(), ['r1', 'r2', 'r5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
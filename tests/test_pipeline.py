@@ -0,0 +1,117 @@
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.pipeline import run_pipeline, stage_order, stage_params
+from src.storage import read_reviews
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.raw_dir = os.path.join(self.test_dir, 'raw')
+        os.makedirs(self.raw_dir)
+        self.raw_path = os.path.join(self.raw_dir, 'bank_reviews_cbe.csv')
+        self.write_raw(['Great app', 'Terrible, keeps crashing', 'Great app', '  '])
+
+        self.patches = [
+            mock.patch.dict('src.pipeline.PIPELINE_CONFIG', {
+                'processed_dir': os.path.join(self.test_dir, 'processed'),
+                'cache_dir': os.path.join(self.test_dir, 'cache'),
+                'chunksize': 2,
+            }),
+            mock.patch.dict('src.pipeline.SCRAPING_CONFIG', {'output': {'directory': self.raw_dir}}),
+            mock.patch('src.pipeline.get_sentiment_cache', return_value=None),
+            # The configured on-disk cache must not be touched
+            mock.patch('src.analysis.sentiment.get_sentiment_cache', side_effect=AssertionError('default cache used')),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def write_raw(self, texts):
+        pd.DataFrame({
+            'review_id': ['r1', 'r2', 'r1', 'r3'][:len(texts)],
+            'review': texts,
+            'rating': [5, 1, 5, 3][:len(texts)],
+            'date': ['2025-01-01', '2025-01-02', '2025-01-01', '2025-01-03'][:len(texts)],
+        }).to_csv(self.raw_path, index=False)
+
+    def test_stages_are_ordered_by_dependencies(self):
+        self.assertEqual(stage_order(['load', 'preprocess', 'sentiment']), ['preprocess', 'sentiment', 'load'])
+        with self.assertRaises(ValueError):
+            stage_order(['translate'])
+
+    def test_aspect_sentiment_settings_change_preprocess_params(self):
+        with mock.patch.dict('src.pipeline.ASPECTS_CONFIG', {'enabled': True, 'sentiment': True}):
+            textblob = stage_params('preprocess')
+            with mock.patch.dict('src.pipeline.SENTIMENT_CONFIG', {'analyzer': 'lexicon'}):
+                lexicon = stage_params('preprocess')
+        self.assertNotEqual(textblob, lexicon)
+        self.assertEqual(lexicon['aspect_sentiment']['analyzer'], 'lexicon')
+        self.assertNotIn('aspect_sentiment', stage_params('preprocess'))
+
+    def test_streams_stages_and_skips_unchanged_inputs(self):
+        first = run_pipeline(['preprocess', 'sentiment'])
+
+        self.assertEqual([(r['stage'], r['status'], r['rows_in'], r['rows_out']) for r in first],
+                         [('preprocess', 'ran', 4, 2), ('sentiment', 'ran', 2, 2)])
+        output = read_reviews(os.path.join(self.test_dir, 'processed', 'cleaned_bank_reviews_cbe.csv'))
+        self.assertEqual(output['sentiment_label'].tolist(), ['positive', 'negative'])
+
+        second = run_pipeline(['preprocess', 'sentiment'])
+        self.assertEqual([r['status'] for r in second], ['cached', 'cached'])
+
+        self.write_raw(['Great app', 'Terrible, keeps crashing', 'Great app', 'Okay'])
+        third = run_pipeline(['preprocess', 'sentiment'])
+        self.assertEqual([(r['status'], r['rows_out']) for r in third], [('ran', 3), ('ran', 3)])
+
+    def test_parquet_output_when_first_batch_is_filtered_out(self):
+        # Blank review and invalid rating: the whole first batch is dropped
+        pd.DataFrame({
+            'review_id': ['r1', 'r2', 'r3', 'r4'],
+            'review': ['  ', 'Okay', 'Great app', 'Terrible, keeps crashing'],
+            'rating': [5, 9, 5, 1],
+            'date': ['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-04'],
+        }).to_csv(self.raw_path, index=False)
+
+        with mock.patch.dict('src.pipeline.STORAGE_CONFIG', {'format': 'parquet'}):
+            reports = run_pipeline(['preprocess', 'sentiment'])
+
+        self.assertEqual([(r['stage'], r['status'], r['rows_out']) for r in reports],
+                         [('preprocess', 'ran', 2), ('sentiment', 'ran', 2)])
+        output = read_reviews(os.path.join(self.test_dir, 'processed', 'cleaned_bank_reviews_cbe.parquet'))
+        self.assertEqual(output['review'].tolist(), ['Great app', 'Terrible, keeps crashing'])
+        self.assertEqual(output['sentiment_label'].tolist(), ['positive', 'negative'])
+
+    def test_rerun_that_drops_every_row_replaces_the_outputs(self):
+        run_pipeline(['preprocess', 'sentiment'])
+        pd.DataFrame({
+            'review_id': ['r1', 'r2', 'r3', 'r4'],
+            'review': ['Great app', 'Terrible', 'Nice', 'Slow'],
+            'rating': [9, 0, 7, 6],
+            'date': ['2025-01-01'] * 4,
+        }).to_csv(self.raw_path, index=False)
+
+        reports = run_pipeline(['preprocess', 'sentiment'])
+
+        self.assertEqual([(r['status'], r['rows_out']) for r in reports], [('ran', 0), ('ran', 0)])
+        output = read_reviews(os.path.join(self.test_dir, 'processed', 'cleaned_bank_reviews_cbe.csv'))
+        self.assertEqual(len(output), 0)
+        self.assertIn('sentiment_label', output.columns)
+        self.assertEqual([r['status'] for r in run_pipeline(['preprocess', 'sentiment'])], ['cached', 'cached'])
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        shutil.rmtree(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
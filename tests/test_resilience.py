@@ -0,0 +1,206 @@
+import unittest
+from pathlib import Path
+from unittest import mock
+from urllib.error import HTTPError
+import sys
+from google_play_scraper.features import reviews as play_reviews
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src import fake_play_store
+from src.fake_play_store import start_server
+from src.scraper import resumable_reviews_all, scrape_app_reviews
+from src.utils.rate_limiter import HostRateLimiter
+from src.utils.resilience import (
+    CircuitBreaker, CircuitOpenError, PartialResultError, reset_breakers, retry_call
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def http_error(code, retry_after=None):
+    headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+    return HTTPError('http://test', code, 'error', headers, None)
+
+
+class TestRetryCall(unittest.TestCase):
+    def test_backs_off_and_honours_retry_after(self):
+        clock = FakeClock()
+        errors = [http_error(429, retry_after=7), http_error(503)]
+        retries = []
+
+        def flaky():
+            if errors:
+                raise errors.pop(0)
+            return 'ok'
+
+        result = retry_call(flaky, attempts=3, base_delay=1, max_delay=10, sleep=clock.sleep,
+                            on_retry=lambda attempt, error, delay: retries.append(delay))
+
+        self.assertEqual(result, 'ok')
+        self.assertEqual(len(retries), 2)
+        self.assertGreaterEqual(retries[0], 7)
+        self.assertLessEqual(retries[1], 2)
+
+    def test_permanent_errors_are_not_retried(self):
+        calls = []
+
+        def missing():
+            calls.append(1)
+            raise http_error(404)
+
+        with self.assertRaises(HTTPError):
+            retry_call(missing, attempts=5, sleep=lambda s: None)
+        self.assertEqual(len(calls), 1)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_then_half_opens_after_timeout(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30, clock=clock)
+
+        def failing():
+            raise http_error(500)
+
+        with self.assertRaises(HTTPError):
+            retry_call(failing, attempts=2, breaker=breaker, sleep=clock.sleep)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            retry_call(lambda: 'ok', breaker=breaker, sleep=clock.sleep)
+
+        clock.now += 30
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(retry_call(lambda: 'ok', breaker=breaker, sleep=clock.sleep), 'ok')
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_circuit_wait_ends_when_the_remainder_does_not_move_the_clock(self):
+        breaker = mock.Mock(endpoint='test')
+        breaker.allow.return_value = False
+        breaker.retry_in.return_value = 1e-300
+
+        with self.assertRaises(CircuitOpenError):
+            retry_call(lambda: 'ok', breaker=breaker, sleep=lambda s: None, circuit_wait=5)
+        self.assertLessEqual(breaker.allow.call_count, 11)
+
+
+class TestResumablePaging(unittest.TestCase):
+    def setUp(self):
+        reset_breakers()
+        self.no_sleep = mock.patch('src.utils.resilience.time.sleep')
+        self.no_sleep.start()
+        self.limiter = mock.patch('src.scraper.get_rate_limiter', return_value=HostRateLimiter(rate=1000, capacity=1000))
+        self.limiter.start()
+
+    def tearDown(self):
+        self.limiter.stop()
+        self.no_sleep.stop()
+        reset_breakers()
+
+    def test_failed_page_is_retried_from_its_token(self):
+        tokens = []
+        failures = [http_error(429)]
+
+        def fetch_page(app_id, count=100, continuation_token=None, **kwargs):
+            offset = continuation_token.token if continuation_token else 0
+            tokens.append(offset)
+            if offset == 200 and failures:
+                raise failures.pop()
+            page = [{'reviewId': str(i)} for i in range(offset, min(offset + count, 500))]
+            next_offset = offset + count if offset + count < 500 else None
+            return page, fake_play_store.ContinuationToken(next_offset, 'en', 'et', None, count)
+
+        with mock.patch.dict('src.scraper.SCRAPING_CONFIG', {'backend': 'fake'}):
+            reviews = resumable_reviews_all('a.app', host='test', fetch_page=fetch_page)
+
+        self.assertEqual(len(reviews), 500)
+        self.assertEqual(tokens, [0, 200, 200, 400])
+
+    def test_google_pages_use_the_library_maximum(self):
+        counts = []
+
+        def fetch_page(app_id, count=100, continuation_token=None, **kwargs):
+            counts.append(count)
+            token = None if continuation_token else 'next'
+            return [{'reviewId': str(len(counts))}], fake_play_store.ContinuationToken(token, 'en', 'et', None, count)
+
+        with mock.patch.dict('src.scraper.SCRAPING_CONFIG', {'backend': 'google_play'}), \
+                mock.patch('src.scraper.time.sleep') as sleep:
+            reviews = resumable_reviews_all('a.app', host='test', fetch_page=fetch_page,
+                                            sleep_milliseconds=1000, count=100)
+
+        self.assertEqual(len(reviews), 2)
+        self.assertEqual(counts, [play_reviews.MAX_COUNT_EACH_FETCH] * 2)
+        sleep.assert_not_called()
+
+    def test_partial_results_are_kept_when_retries_run_out(self):
+        def fetch_page(app_id, count=100, continuation_token=None, **kwargs):
+            if continuation_token:
+                raise http_error(503)
+            return [{'reviewId': '1'}], fake_play_store.ContinuationToken('next', 'en', 'et', None, count)
+
+        with self.assertRaises(PartialResultError) as raised:
+            resumable_reviews_all('a.app', host='test', fetch_page=fetch_page)
+        self.assertEqual(raised.exception.results, [{'reviewId': '1'}])
+        self.assertEqual(raised.exception.token.token, 'next')
+
+    def test_sequential_scrape_takes_a_token_per_page(self):
+        def fetch_page(app_id, count=100, continuation_token=None, **kwargs):
+            token = None if continuation_token else 'next'
+            return [{'reviewId': token or 'last'}], fake_play_store.ContinuationToken(token, 'en', 'et', None, count)
+
+        limiter = mock.Mock()
+        with mock.patch('src.scraper._page_fetcher', return_value=fetch_page):
+            reviews = scrape_app_reviews('a.app', languages=['en', 'am'], limiter=limiter)
+
+        self.assertEqual(len(reviews), 4)
+        self.assertEqual(limiter.acquire.call_count, 4)
+
+    def test_failing_language_does_not_starve_the_next(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker('test', failure_threshold=5, reset_timeout=30, clock=clock)
+        calls = []
+
+        def fetch_page(app_id, lang='en', count=100, continuation_token=None, **kwargs):
+            calls.append(lang)
+            if lang == 'en':
+                raise http_error(503)
+            return [{'reviewId': '1'}, {'reviewId': '2'}], fake_play_store.ContinuationToken(None, lang, 'et', None, count)
+
+        with mock.patch('src.scraper._page_fetcher', return_value=fetch_page), \
+                mock.patch('src.scraper.get_breaker', return_value=breaker), \
+                mock.patch('src.utils.resilience.time.sleep', side_effect=clock.sleep):
+            reviews = scrape_app_reviews('a.app', languages=['en', 'am'])
+
+        # The open circuit is waited out and its trial call fetches AM
+        self.assertEqual(calls, ['en'] * 5 + ['am'])
+        self.assertEqual([r['language'] for r in reviews], ['am', 'am'])
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertGreaterEqual(clock.now, 30)
+
+    def test_scrape_survives_flaky_fake_store(self):
+        server = start_server(reviews_per_app=600, error_rate=0.3, seed=3)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        fake_server = dict(fake_play_store.SCRAPING_CONFIG['fake_server'], url=url)
+        try:
+            with mock.patch.dict('config.settings.SCRAPING_CONFIG', {'backend': 'fake', 'fake_server': fake_server}), \
+                    mock.patch('src.scraper.time.sleep'):
+                reviews = scrape_app_reviews('a.app', languages=['en'])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(len({r['reviewId'] for r in reviews}), 600)
+        self.assertGreater(server.store.stats['errors'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+import sys
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.data_handler import process_reviews_frame
+from src.utils.review_buffer import ReviewBuffer
+from src.utils.synthetic_reviews import generate_reviews
+
+
+class TestReviewBuffer(unittest.TestCase):
+    def setUp(self):
+        self.reviews = generate_reviews(500, seed=3)
+
+    def test_iteration_round_trips_reviews(self):
+        self.reviews.append({'reviewId': 'x', 'content': 'no date', 'score': None, 'at': None})
+        buffer = ReviewBuffer(self.reviews)
+
+        self.assertEqual(len(buffer), 501)
+        for original, stored in zip(self.reviews, buffer):
+            self.assertEqual(stored['reviewId'], original['reviewId'])
+            self.assertEqual(stored['at'], original['at'])
+            self.assertEqual(stored['language'], original.get('language', ''))
+        self.assertEqual(list(buffer)[-1]['score'], 0)
+
+    def test_frame_uses_categories_and_processes_like_dicts(self):
+        frame = ReviewBuffer(self.reviews).to_frame()
+        self.assertIsInstance(frame['language'].dtype, pd.CategoricalDtype)
+        self.assertEqual(set(frame['language'].cat.categories), {'en', 'am'})
+        self.assertEqual(frame['at'].iloc[0], pd.Timestamp(self.reviews[0]['at']))
+
+        with mock.patch.dict('src.data_handler.TRANSLATION_CONFIG', {'enabled': False}):
+            expected = process_reviews_frame(self.reviews, 'CBE')
+            result = process_reviews_frame(frame, 'CBE')
+        categorical = {name: object for name in ('app_id', 'language', 'scrape_timestamp')}
+        pd.testing.assert_frame_equal(result.astype(categorical), expected)
+
+    def test_empty_buffer(self):
+        buffer = ReviewBuffer()
+        self.assertFalse(buffer)
+        self.assertEqual(len(buffer.to_frame()), 0)
+        buffer.append({'reviewId': 'r1', 'content': 'ok', 'at': datetime(2025, 1, 1, 12, 30)})
+        self.assertEqual(next(iter(buffer))['at'], datetime(2025, 1, 1, 12, 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+from pathlib import Path
+import sys
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.scrape_state import ScrapeStateStore
+from src.scraper import scrape_new_reviews, scrape_reviews_concurrently
+from src.utils.rate_limiter import HostRateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_throttle(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertFalse(bucket.try_acquire())
+
+
+class TestConcurrentScraping(unittest.TestCase):
+    def setUp(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def fake_reviews_all(self, app_id, sleep_milliseconds=0, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        if app_id == 'broken.app':
+            raise RuntimeError('429 Too Many Requests')
+        return [{'reviewId': f"{app_id}-{kwargs['lang']}-{i}", 'content': 'ok'} for i in range(3)]
+
+    def test_jobs_run_in_parallel_and_are_tagged(self):
+        jobs = [('a.app', 'en'), ('a.app', 'am'), ('b.app', 'en'), ('b.app', 'am')]
+        limiter = HostRateLimiter(rate=1000, capacity=1000)
+
+        results = scrape_reviews_concurrently(jobs, max_workers=2, limiter=limiter, fetch=self.fake_reviews_all)
+
+        self.assertEqual(set(results), set(jobs))
+        self.assertEqual(self.peak, 2)
+        review = results[('b.app', 'am')][0]
+        self.assertEqual(review['app_id'], 'b.app')
+        self.assertEqual(review['language'], 'am')
+        self.assertIn('scrape_timestamp', review)
+
+    def test_failed_job_returns_empty_list(self):
+        jobs = [('broken.app', 'en'), ('a.app', 'en')]
+        limiter = HostRateLimiter(rate=1000, capacity=1000)
+
+        results = scrape_reviews_concurrently(jobs, max_workers=2, limiter=limiter, fetch=self.fake_reviews_all)
+
+        self.assertEqual(results[('broken.app', 'en')], [])
+        self.assertEqual(len(results[('a.app', 'en')]), 3)
+
+
+class FakeToken:
+    def __init__(self, token):
+        self.token = token
+
+
+class TestIncrementalScraping(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.test_dir, 'state.json')
+        start = datetime(2025, 1, 1)
+        # Newest first, as returned with Sort.NEWEST
+        self.store = [
+            {'reviewId': f'r{i}', 'content': 'review', 'at': start - timedelta(hours=i)}
+            for i in range(10)
+        ]
+        self.pages_fetched = 0
+        self.limiter = mock.patch('src.scraper.get_rate_limiter', return_value=HostRateLimiter(rate=1000, capacity=1000))
+        self.limiter.start()
+
+    def fake_reviews(self, app_id, count=100, continuation_token=None, **kwargs):
+        self.pages_fetched += 1
+        offset = continuation_token.token if continuation_token else 0
+        page = self.store[offset:offset + count]
+        next_offset = offset + count
+        return page, FakeToken(next_offset if next_offset < len(self.store) else None)
+
+    def test_stops_at_already_seen_reviews(self):
+        state = ScrapeStateStore(self.state_path)
+        first = scrape_new_reviews('a.app', state, ['en'], page_size=3, fetch_page=self.fake_reviews)
+        self.assertEqual(len(first), 10)
+        state.record(first)
+        state.save()
+
+        # Two new reviews arrive on top of the ones already recorded
+        newest = self.store[0]['at']
+        self.store = [
+            {'reviewId': 'n1', 'content': 'new', 'at': newest + timedelta(hours=2)},
+            {'reviewId': 'n2', 'content': 'new', 'at': newest + timedelta(hours=1)},
+        ] + self.store
+        self.pages_fetched = 0
+
+        reloaded = ScrapeStateStore(self.state_path)
+        second = scrape_new_reviews('a.app', reloaded, ['en'], page_size=3, fetch_page=self.fake_reviews)
+
+        self.assertEqual([r['reviewId'] for r in second], ['n1', 'n2'])
+        self.assertEqual(self.pages_fetched, 1)
+
+    def tearDown(self):
+        self.limiter.stop()
+        shutil.rmtree(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.analysis.search_index import SearchIndex, index_files, tokenize
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.reviews = pd.DataFrame({
+            'review_id': ['r1', 'r2', 'r3', 'r4', 'r5'],
+            'review': [
+                'OTP never arrives, cannot login',
+                'Transfer failed twice',
+                'Login works, the OTP arrives fast',
+                'Great app! Fast transfer',
+                'የሚገርም መተግበሪያ ነው',
+            ],
+            'rating': [1, 2, 5, 5, 4],
+            'date': ['2025-01-01', '2025-02-01', '2025-03-01', '2025-04-01', None],
+            'bank': ['CBE', 'BOA', 'CBE', 'DASHEN', 'CBE'],
+            'sentiment_label': ['negative', 'negative', 'positive', 'positive', 'neutral'],
+        })
+        self.index = SearchIndex()
+        self.index.add(self.reviews)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def ids(self, query, **filters):
+        return self.index.search(query, **filters)['review_id'].tolist()
+
+    def test_boolean_and_phrase_queries(self):
+        self.assertEqual(tokenize('Can\'t login!! ኦቲፒ'), ['can', 't', 'login', 'ኦቲፒ'])
+        self.assertEqual(sorted(self.ids('otp login')), ['r1', 'r3'])
+        self.assertEqual(self.ids('"otp never arrives"'), ['r1'])
+        self.assertEqual(self.ids('"arrives otp"'), [])
+        self.assertEqual(sorted(self.ids('otp OR transfer')), ['r1', 'r2', 'r3', 'r4'])
+        self.assertEqual(sorted(self.ids('transfer -failed')), ['r4'])
+        self.assertEqual(self.ids('መተግበሪያ'), ['r5'])
+
+    def test_filters(self):
+        self.assertEqual(self.ids('otp', bank='cbe', rating=(1, 2)), ['r1'])
+        self.assertEqual(self.ids('', since='2025-02-01', until='2025-03-31'), ['r3', 'r2'])
+        self.assertEqual(self.ids('transfer', sentiment='positive'), ['r4'])
+        self.assertEqual(self.ids('', bank=['BOA', 'DASHEN']), ['r4', 'r2'])
+
+    def test_incremental_add_and_persistence(self):
+        self.assertEqual(self.index.add(self.reviews.head(2)), 0)
+        path = os.path.join(self.test_dir, 'new.csv')
+        pd.DataFrame({'review_id': ['r1', 'r6'], 'review': ['dup', 'OTP again'], 'rating': [1, 1],
+                      'date': ['2025-05-01'] * 2, 'bank': ['CBE'] * 2}).to_csv(path, index=False)
+        self.assertEqual(index_files(self.index, [path]), 1)
+
+        saved = self.index.save(os.path.join(self.test_dir, 'index.npz'))
+        loaded = SearchIndex.load(saved)
+        self.assertEqual(len(loaded), 6)
+        pd.testing.assert_frame_equal(loaded.search('otp'), self.index.search('otp'))
+
+        # A loaded index keeps growing
+        loaded.add(pd.DataFrame({'review_id': ['r7'], 'review': ['otp otp']}))
+        self.assertIn('r7', loaded.search('otp')['review_id'].tolist())
+
+    def test_rebuild_without_review_ids_is_idempotent(self):
+        path = os.path.join(self.test_dir, 'cleaned_bank_reviews_cbe.csv')
+        pd.DataFrame({'review': ['Good', 'Good', 'Slow', 'Good', 'OTP fails'], 'rating': [5, 5, 2, 5, 1],
+                      'date': ['2025-01-01'] * 5, 'bank': ['CBE'] * 5}).to_csv(path, index=False)
+        index = SearchIndex()
+
+        self.assertEqual(index_files(index, [path], chunksize=2), 5)
+        self.assertEqual(index_files(index, [path], chunksize=2), 0)
+        self.assertEqual(len(index), 5)
+        # Identical reviews of the same bank and day are kept apart
+        self.assertEqual(len(index.search('good')), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.analysis.sentiment import analyze_sentiment, labels_for_scores, score_texts, score_texts_cached
+from src.analysis.sentiment_cache import SentimentCache
+
+
+class TestSentimentEngine(unittest.TestCase):
+    def setUp(self):
+        self.texts = ['Great app, works perfectly!', 'Terrible, it keeps crashing', 'It opens', None, '  ']
+
+    def test_labels_use_analyze_sentiment_thresholds(self):
+        self.assertEqual(labels_for_scores([0.5, -0.1, 0.0]), ['positive', 'negative', 'neutral'])
+        self.assertEqual(analyze_sentiment(None), ('neutral', 0.0))
+
+    def test_process_pool_matches_row_by_row(self):
+        expected = [analyze_sentiment(t) for t in self.texts]
+
+        with mock.patch.dict('src.analysis.sentiment.SENTIMENT_CONFIG', {'min_parallel_rows': 0}):
+            labels, scores = score_texts(self.texts, workers=2, chunk_size=2)
+
+        self.assertEqual(list(zip(labels, scores)), expected)
+
+
+class TestSentimentCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, 'sentiment.sqlite')
+
+    def test_only_new_text_is_scored(self):
+        cache = SentimentCache(self.cache_path)
+        first = score_texts_cached(['Great app', 'Awful app'], analyzer='textblob', cache=cache)
+
+        with mock.patch('src.analysis.sentiment.score_texts', wraps=score_texts) as scorer:
+            second = score_texts_cached(['Great app', 'Awful app', 'Nice update'], analyzer='textblob', cache=cache)
+
+        scorer.assert_called_once()
+        self.assertEqual(scorer.call_args[0][0], ['Nice update'])
+        self.assertEqual(second[0][:2], first[0])
+        self.assertEqual(cache.stats()['hits'], 2)
+        cache.close()
+
+    def test_threshold_changes_relabel_cached_scores(self):
+        cache = SentimentCache(self.cache_path)
+        first = score_texts_cached(['Great app', 'It is okay'], analyzer='textblob', cache=cache)
+        self.assertEqual(first[0], ['positive', 'positive'])
+
+        with mock.patch.dict('src.analysis.sentiment.SENTIMENT_CONFIG', {'positive_threshold': 0.6}):
+            second = score_texts_cached(['Great app', 'It is okay'], analyzer='textblob', cache=cache)
+
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(second, (['positive', 'neutral'], first[1]))
+        cache.close()
+
+    def test_use_cache_false_skips_the_configured_cache(self):
+        with mock.patch('src.analysis.sentiment.get_sentiment_cache', side_effect=AssertionError('cache opened')):
+            labels, _ = score_texts_cached(['Great app'], analyzer='textblob', use_cache=False)
+        self.assertEqual(labels, ['positive'])
+
+    def test_analyzers_are_cached_separately(self):
+        cache = SentimentCache(self.cache_path)
+        cache.set_many([('Great app', 'positive', 0.8)], 'textblob', '1')
+        cache.set_many([('Great app', 'positive', 0.6)], 'vader', '1')
+
+        self.assertEqual(cache.get_many(['Great app'], 'textblob', '1'), {'Great app': ('positive', 0.8)})
+        self.assertEqual(cache.get_many(['Great app'], 'vader', '1'), {'Great app': ('positive', 0.6)})
+        self.assertEqual(cache.get_many(['Great app'], 'textblob', '2'), {})
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = SentimentCache(self.cache_path, max_entries=2)
+        cache.set_many([('a', 'neutral', 0.0)], 'textblob', '1')
+        cache.set_many([('b', 'neutral', 0.0)], 'textblob', '1')
+        cache.get_many(['a'], 'textblob', '1')
+        cache.set_many([('c', 'neutral', 0.0)], 'textblob', '1')
+
+        self.assertEqual(set(cache.get_many(['a', 'b', 'c'], 'textblob', '1')), {'a', 'c'})
+        self.assertEqual(cache.stats()['evictions'], 1)
+        cache.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import sys
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.storage import ReviewSink, read_reviews, write_reviews
+
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            'review_id': ['a', 'b'],
+            'bank': ['CBE', 'CBE'],
+            'review': ['Great 👍', 'Bad'],
+            'rating': [5, 1],
+            'date': ['2025-01-01', '2025-01-02'],
+            'language': ['en', 'am'],
+            'emojis': [['👍'], []],
+            'emoji_count': [1, 0],
+        })
+
+    def test_parquet_uses_typed_columns(self):
+        path = os.path.join(self.test_dir, 'reviews.parquet')
+        write_reviews(self.df, path)
+
+        schema = pq.read_schema(path)
+        self.assertEqual(schema.field('rating').type, pa.int8())
+        self.assertEqual(schema.field('date').type, pa.date32())
+        self.assertTrue(pa.types.is_dictionary(schema.field('bank').type))
+        self.assertEqual(schema.field('emojis').type, pa.list_(pa.string()))
+
+        result = read_reviews(path, columns=['review_id', 'emojis', 'missing'])
+        self.assertEqual(list(result.columns), ['review_id', 'emojis'])
+        self.assertEqual(list(result['emojis'].iloc[0]), ['👍'])
+
+    def test_parquet_append(self):
+        path = os.path.join(self.test_dir, 'reviews.parquet')
+        write_reviews(self.df, path)
+        write_reviews(self.df.iloc[:1], path, append=True)
+
+        self.assertEqual(len(read_reviews(path)), 3)
+
+    def test_parquet_sink_skips_leading_empty_chunks(self):
+        path = os.path.join(self.test_dir, 'reviews.parquet')
+        with ReviewSink(path) as sink:
+            sink.write(self.df.iloc[:0])
+            sink.write(self.df)
+
+        self.assertEqual(pq.read_schema(path).field('review').type, pa.string())
+        self.assertEqual(read_reviews(path)['review'].tolist(), ['Great 👍', 'Bad'])
+
+    def test_parquet_sink_without_rows_writes_typed_columns(self):
+        path = os.path.join(self.test_dir, 'reviews.parquet')
+        with ReviewSink(path) as sink:
+            sink.write(self.df.iloc[:0])
+
+        schema = pq.read_schema(path)
+        self.assertEqual(schema.names, list(self.df.columns))
+        self.assertEqual(schema.field('review').type, pa.string())
+        self.assertEqual(schema.field('rating').type, pa.int8())
+        self.assertEqual(len(read_reviews(path)), 0)
+
+    def test_csv_round_trips_list_columns(self):
+        path = os.path.join(self.test_dir, 'reviews.csv')
+        write_reviews(self.df, path)
+
+        result = read_reviews(path)
+        self.assertEqual(result['emojis'].tolist(), [['👍'], []])
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
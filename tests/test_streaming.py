@@ -0,0 +1,105 @@
+import unittest
+import os
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.preprocessing.preprocess import process_bank, process_bank_streaming
+from src.utils.seen_sets import BloomFilter, HashedIdSet
+
+
+class TestSeenSets(unittest.TestCase):
+    def test_detects_repeats_within_and_across_calls(self):
+        for seen in (HashedIdSet(), BloomFilter(1000)):
+            self.assertEqual(seen.check_and_add(['a', 'b', 'a']).tolist(), [False, False, True])
+            self.assertEqual(seen.check_and_add(['c', 'b']).tolist(), [False, True])
+
+    def test_hashed_set_over_many_chunks(self):
+        seen = HashedIdSet()
+        for start in range(0, 10000, 100):
+            # Each chunk repeats the previous chunk's ids and adds 100 new ones
+            ids = [str(i) for i in range(max(0, start - 100), start + 100)]
+            mask = seen.check_and_add(ids)
+            self.assertEqual(int((~mask).sum()), 100)
+            self.assertTrue(mask[:min(start, 100)].all())
+
+        self.assertEqual(len(seen), 10000)
+        self.assertLessEqual(len(seen._runs), 14)
+        self.assertEqual(seen.nbytes, 10000 * 8)
+        self.assertTrue(seen.check_and_add([str(i) for i in range(0, 10000, 7)]).all())
+
+
+class TestStreamingPreprocess(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.test_dir, 'bank_reviews_test.csv')
+        # Duplicate ids are placed in different chunks
+        pd.DataFrame({
+            'review_id': ['r1', 'r2', 'r3', 'r1', 'r4', 'r2', 'r5'],
+            'review': ['Great!', 'Bad', '   ', 'Great!', 'Slow app', 'Bad', 'Okay'],
+            'rating': [5, 1, 3, 5, 9, 1, 3],
+            'date': ['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-01', '2025-01-04', '2025-01-02', 'x'],
+        }).to_csv(self.input_path, index=False)
+
+    def test_matches_in_memory_processing(self):
+        for suffix in ('csv', 'parquet'):
+            for dedup in ('exact', 'bloom'):
+                streamed_path = os.path.join(self.test_dir, f'streamed_{dedup}.{suffix}')
+                full_path = os.path.join(self.test_dir, f'full.{suffix}')
+
+                streamed = process_bank_streaming(self.input_path, streamed_path, chunksize=2, dedup=dedup)
+                full = process_bank(self.input_path, full_path)
+
+                self.assertEqual(streamed, full)
+                self.assertEqual(streamed['final_rows'], 3)
+
+    def test_first_chunk_dropped_entirely(self):
+        # Blank review and invalid rating: nothing survives the first chunk
+        pd.DataFrame({
+            'review_id': ['r1', 'r2', 'r3', 'r4'],
+            'review': ['   ', 'Bad', 'Great!', 'Slow app'],
+            'rating': [5, 9, 5, 2],
+            'date': ['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-04'],
+        }).to_csv(self.input_path, index=False)
+        streamed_path = os.path.join(self.test_dir, 'streamed.parquet')
+
+        streamed = process_bank_streaming(self.input_path, streamed_path, chunksize=2)
+        full = process_bank(self.input_path, os.path.join(self.test_dir, 'full.parquet'))
+
+        self.assertEqual(streamed, full)
+        self.assertEqual(streamed['final_rows'], 2)
+
+    def test_cleans_filtered_frames_without_chained_assignment(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', pd.errors.SettingWithCopyWarning)
+            streamed = process_bank_streaming(self.input_path, os.path.join(self.test_dir, 'streamed.csv'),
+                                              chunksize=2)
+            full = process_bank(self.input_path, os.path.join(self.test_dir, 'full.csv'))
+
+        self.assertEqual(streamed, full)
+
+    def test_failed_run_keeps_the_previous_output(self):
+        streamed_path = os.path.join(self.test_dir, 'streamed.csv')
+        process_bank_streaming(self.input_path, streamed_path, chunksize=2)
+        with open(streamed_path, encoding='utf-8') as f:
+            previous = f.read()
+        pd.DataFrame({'review_id': ['r1'], 'review': ['Great!']}).to_csv(self.input_path, index=False)
+
+        result = process_bank_streaming(self.input_path, streamed_path, chunksize=2)
+
+        self.assertEqual(result['reason'], 'load_error')
+        with open(streamed_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), previous)
+        self.assertEqual(os.listdir(self.test_dir), ['bank_reviews_test.csv', 'streamed.csv'])
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.analysis.themes import ThemeModel, update_from_files
+
+
+class TestThemeModel(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.reviews = pd.DataFrame({
+            'review_id': ['r1', 'r2', 'r3', 'r4', 'r5', 'r6'],
+            'review': [
+                'OTP never arrives, cannot login',
+                'Login fails and the OTP is late',
+                'Great app for transfers',
+                'Transfer failed, money deducted',
+                'Money deducted twice on transfer',
+                'Great app, fast transfer',
+            ],
+            'bank': ['CBE', 'CBE', 'CBE', 'BOA', 'BOA', 'BOA'],
+        })
+        self.model = ThemeModel(ngram_range=(1, 2), min_token_length=3, extra_stop_words=[])
+        self.model.update(self.reviews)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_counts_and_keywords(self):
+        self.assertEqual(len(self.model), 6)
+        self.assertEqual(self.model.banks, ['CBE', 'BOA'])
+
+        keywords = self.model.top_keywords('cbe', n=3, min_df=2)
+        self.assertEqual(set(keywords['term']), {'otp', 'login'})
+        self.assertEqual(keywords['reviews'].tolist(), [2, 2])
+        phrases = self.model.top_keywords('BOA', n=5, min_df=2, ngram=2)
+        self.assertEqual(phrases['term'].tolist(), ['money deducted'])
+        # Stop words and short words are dropped
+        self.assertNotIn('the', self.model.top_keywords(n=100, min_df=1)['term'].tolist())
+
+    def test_distinctive_terms(self):
+        cbe = self.model.distinctive_terms('CBE', n=2, min_df=2)
+        self.assertEqual(set(cbe['term']), {'otp', 'login'})
+        boa = self.model.distinctive_terms('BOA', 'CBE', n=3, min_df=2)
+        self.assertIn('deducted', boa['term'].tolist())
+        self.assertNotIn('app', boa['term'].tolist()[:1])
+
+    def test_incremental_updates_match_a_single_fit(self):
+        self.assertEqual(self.model.update(self.reviews.head(2)), 0)
+        path = os.path.join(self.test_dir, 'new.csv')
+        pd.DataFrame({'review_id': ['r1', 'r7'], 'review': ['dup', 'OTP again and again'],
+                      'bank': ['CBE', 'CBE']}).to_csv(path, index=False)
+        self.assertEqual(update_from_files(self.model, [path]), 1)
+
+        single = ThemeModel(ngram_range=(1, 2), min_token_length=3, extra_stop_words=[])
+        single.update(pd.concat([self.reviews, pd.read_csv(path).tail(1)]))
+        pd.testing.assert_frame_equal(self.model.top_keywords('CBE', min_df=1), single.top_keywords('CBE', min_df=1))
+
+        saved = self.model.save(os.path.join(self.test_dir, 'themes.npz'))
+        loaded = ThemeModel.load(saved)
+        pd.testing.assert_frame_equal(loaded.distinctive_terms('BOA', min_df=1),
+                                      self.model.distinctive_terms('BOA', min_df=1))
+        self.assertEqual((loaded.transform(['otp login']) != self.model.transform(['otp login'])).nnz, 0)
+
+        # A loaded model keeps growing and still skips counted reviews
+        self.assertEqual(loaded.update(pd.DataFrame({'review_id': ['r1', 'r8'], 'review': ['x', 'Slow OTP'],
+                                                     'bank': ['CBE', 'DASHEN']})), 1)
+        self.assertEqual(loaded.banks, ['CBE', 'BOA', 'DASHEN'])
+        self.assertEqual(set(loaded.top_keywords('DASHEN', n=2, min_df=1)['term']), {'slow', 'slow otp'})
+
+    def test_rerun_without_review_ids_counts_nothing(self):
+        path = os.path.join(self.test_dir, 'cleaned_bank_reviews_cbe.csv')
+        pd.DataFrame({'review': ['OTP fails', 'OTP fails', 'Slow app'], 'rating': [1, 1, 2],
+                      'date': ['2025-01-01'] * 3, 'bank': ['CBE'] * 3}).to_csv(path, index=False)
+        model = ThemeModel(ngram_range=(1, 1), min_token_length=3, extra_stop_words=[])
+
+        self.assertEqual(update_from_files(model, [path], chunksize=2), 3)
+        self.assertEqual(update_from_files(model, [path], chunksize=2), 0)
+        self.assertEqual(model.top_keywords('CBE', min_df=1).set_index('term')['count']['otp'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()